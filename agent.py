@@ -1,5 +1,25 @@
+import math
+import threading
 import time
-import numpy as np
+from collections import deque
+
+from ameacas import analisarAmeacas, contarAmeacasCriadas, getJogadasForcadas, getVencedorIminente
+from bitboard import BitBoard
+from excecoes import TempoEsgotado
+from solver import Solver
+from transposicao import TabelaTransposicao, EXATO, LIMITE_INFERIOR, LIMITE_SUPERIOR
+
+# NumPy (avaliador), livro, cache persistente, telemetria, perfiladores e o
+# pool de processos são importados só por quem os usa: o núcleo da busca
+# (BitBoard, Solver, tabela de transposição) carrega sem eles, e processos
+# auxiliares e execuções curtas não pagam o custo de importação.
+
+# pesos de avaliarAmeacas por característica (VIVAS, FAVORAVEIS, EMPILHADAS, IMEDIATAS)
+PESOS_AMEACAS = (10, 5, 10, 0)
+
+# meia-largura da janela de aspiração por nível (ver buscarComAspiracao); com modelo a janela
+# não compensou as novas buscas e fica desativada
+JANELAS_ASPIRACAO = {1: 0, 2: 100, 3: 400}
 
 class AgenteIA:
     """
@@ -8,19 +28,97 @@ class AgenteIA:
     A Maquina usa o algoritmo Minimax com variações:
         1. Iniciante  -> Minimax básico
         2. Intermediário -> Minimax com poda alfa-beta e limite de tempo
-        3. Profissional  -> Poda + heurísticas avançadas de avaliação
+        3. Profissional  -> Resolvedor exato (negamax com janela nula); se não
+           terminar a tempo, poda + heurísticas avançadas de avaliação
+
+    Nos níveis 2 e 3, com `limite_final` casas vazias ou menos a partida
+    está no fim e o resolvedor exato decide a jogada, com pontuação pela
+    distância até a vitória (ver pontuacaoSolver).
+
+    O estado da busca é mantido entre as jogadas de uma partida: a tabela de
+    transposição, a variação principal, os killer moves e o histórico e a
+    pontuação da jogada anterior (ver prepararBusca). novoJogo descarta esse estado ao começar outra partida.
     """
 
-    def __init__(self, nivel_dificuldade):
+    def __init__(self, nivel_dificuldade, tamanho_tabela_mb=16, num_processos=1, caminho_livro=None,
+                 jogador=2, caminho_cache=None, caminho_modelo=None):
         """
         Inicializa Maquina com o nível de dificuldade escolhido.
 
         Args:
             nivel_dificuldade (int): 1 = Iniciante, 2 = Intermediário, 3 = Profissional
+            tamanho_tabela_mb (float): teto de memória da tabela de transposição
+                (0 ou None desativa a tabela); cada processo auxiliar tem a sua
+            num_processos (int): processos usados na busca paralela da raiz
+                (1 mantém a busca em um único núcleo)
+            caminho_livro (str | None): livro de aberturas (ver livro.py) consultado
+                antes da busca nos níveis 2 e 3
+            jogador (int): peças controladas pela Maquina (2 por padrão; 1 para
+                jogar como primeiro jogador, por exemplo em partidas Maquina x Maquina)
+            caminho_cache (str | None): banco SQLite do cache persistente
+                (ver persistencia.py), compartilhado entre partidas e processos;
+                usado nos níveis 2 e 3 quando há tabela de transposição
+            caminho_modelo (str | None): modelo de avaliação aprendido (ver modelo.py);
+                se informado, substitui a heurística do nível em avaliarPosicao e avaliarLote
         """
         self.nivel_dificuldade = nivel_dificuldade
+        self.jogador = jogador
+        self.oponente = 3 - jogador
         self.nos_avaliados = 0
         self.tempo_maximo = 3.0
+        self.intervalo_verificacao = 256
+        self.profundidade_alcancada = 0
+        self.latencias = deque(maxlen=1000)
+        self._prazo = None
+        self.num_processos = num_processos
+        self.tamanho_tabela_mb = tamanho_tabela_mb
+        self._pool = None
+        self.solver = None
+        self.fracao_solver = 0.5
+        self.limite_final = 20
+        self.livro = None
+        if caminho_livro:
+            from livro import LivroAberturas
+            self.livro = LivroAberturas(caminho_livro)
+        self.tabela = TabelaTransposicao(tamanho_tabela_mb) if tamanho_tabela_mb else None
+        self.cache = None
+        if caminho_cache:
+            from persistencia import CachePersistente
+            self.cache = CachePersistente(caminho_cache)
+        self.profundidade_minima_cache = 4
+        self.modelo = None
+        if caminho_modelo:
+            from modelo import carregarModelo
+            self.modelo = carregarModelo(caminho_modelo)
+        self.janela_aspiracao = 0 if self.modelo is not None else JANELAS_ASPIRACAO[nivel_dificuldade]
+        self._cache_janelas = (None, None)
+        self.avaliacao_lote = True
+        self.poda_simetria = True
+        self.poda_ameacas = True
+        self.profundidade_ordenacao_ameacas = 2
+        self._pesos_lote = {}
+        self.telemetria = False
+        self.perfilar = None
+        self.estatisticas = None
+        self.ganchos = {"inicio_busca": [], "fim_iteracao": [], "fim_busca": []}
+        self._movimentos_raiz = 0
+        self.ordenacao_dinamica = True
+        self.killers = []
+        self.historico = {}
+        self.reaproveitar_busca = True
+        self.variacao_principal = []
+        self.estatisticas_reaproveitamento = {"continuacoes": 0, "variacoes_seguidas": 0,
+                                              "repeticoes_aspiracao": 0}
+        self._raiz_anterior = None
+        self._pontuacao_anterior = 0
+        self._retomada = None
+        self._variante = None
+        self.rodadas_ponderacao = 4
+        self.ponderando = False
+        self.respostas_ponderadas = {}
+        self.estatisticas_ponderacao = {"buscas": 0, "nos": 0, "acertos": 0}
+        self._ponderacao = None
+        self._cancelamento = threading.Event()
 
     # ============================================================
     # FUNÇÕES PRINCIPAIS DE DECISÃO
@@ -30,9 +128,31 @@ class AgenteIA:
         """
         Determina a melhor jogada possível para o estado atual do tabuleiro.
 
+        Nos níveis 2 e 3, posições presentes no livro de aberturas são
+        respondidas direto do livro, sem busca.
+
         A lógica varia conforme a dificuldade:
             - Nível 1: Minimax básico (profundidade fixa)
             - Nível 2: Minimax com poda alfa-beta + busca limitada por tempo
+            - Nível 3: Resolvedor exato com `fracao_solver` do tempo; se o prazo
+              expirar, o restante vai para a busca do nível 2 com a avaliação profissional
+            - Fim de partida (níveis 2 e 3, até `limite_final` casas vazias):
+              resolvedor exato, como no nível 3
+
+        A busca é feita sobre uma cópia do tabuleiro em BitBoard, que tem
+        addPeca/removePeca/getVencedor em tempo constante.
+
+        Com `telemetria` (ou `perfilar`) ativado, as estatísticas da busca
+        ficam disponíveis em getEstatisticas(); os ganchos registrados com
+        adicionarGancho são chamados em qualquer caso.
+
+        Uma ponderação em andamento (ver iniciarPonderacao) é interrompida
+        primeiro; se a posição recebida já foi buscada por ela com pelo menos
+        `tempo_maximo`, o resultado é devolvido sem nova busca.
+
+        Se a posição continua a partida da jogada anterior, a busca parte do
+        estado deixado por ela (ver prepararBusca); `nos_avaliados` e as
+        estatísticas são sempre desta jogada.
 
         Args:
             tabuleiro (Board): instância do tabuleiro atual
@@ -40,19 +160,211 @@ class AgenteIA:
         Returns:
             tuple[int, float, float]: (coluna escolhida, pontuação da jogada, tempo gasto)
         """
-        tempo_inicio = time.time()
+        tempo_inicio = time.perf_counter()
+        self.pararPonderacao()
         self.nos_avaliados = 0
+        tabuleiro = tabuleiro.toBitBoard()
+        variante = (tabuleiro.linhas, tabuleiro.colunas, tabuleiro.conectar)
+        if self.tabela is not None:
+            if variante != self._variante and self._variante is not None:
+                self.tabela.limpar()
+            self.tabela.novaBusca()
+        self._variante = variante
+
+        self.estatisticas = None
+        if self.telemetria or self.perfilar:
+            from telemetria import EstatisticasBusca
+            self.estatisticas = EstatisticasBusca()
+        self._movimentos_raiz = tabuleiro.movimentos
+        self.prepararBusca(tabuleiro)
+        self.dispararGancho("inicio_busca", self, tabuleiro)
+        ponderada = self.consultarPonderacao(tabuleiro)
+        if ponderada is not None:
+            melhor_coluna, pontuacao = ponderada
+        elif self.estatisticas is None:
+            melhor_coluna, pontuacao = self.decidirJogada(tabuleiro, tempo_inicio)
+        else:
+            melhor_coluna, pontuacao = self.decidirJogadaComTelemetria(tabuleiro, tempo_inicio)
+        self.concluirBusca(tabuleiro, melhor_coluna, pontuacao)
+
+        tempo_gasto = time.perf_counter() - tempo_inicio
+        self.latencias.append(tempo_gasto)
+        if self.estatisticas is not None:
+            self.estatisticas.tempo_total = tempo_gasto
+        self.dispararGancho("fim_busca", self, melhor_coluna, pontuacao, tempo_gasto)
+        return melhor_coluna, pontuacao, tempo_gasto
+
+    def decidirJogada(self, tabuleiro, tempo_inicio):
+        """
+        Escolhe a jogada conforme o livro de aberturas, o cache persistente e o nível de dificuldade.
+
+        Args:
+            tabuleiro (BitBoard): estado atual do tabuleiro
+            tempo_inicio (float): instante inicial, em time.perf_counter()
+
+        Returns:
+            tuple[int, float]: (melhor_coluna, pontuação)
+        """
+        jogada_livro = self.consultarLivro(tabuleiro)
+        if jogada_livro is not None:
+            return jogada_livro
+        posicoes_cache = None
+        if self.cache is not None and self.tabela is not None and self.nivel_dificuldade > 1:
+            posicoes_cache = self.getPosicoesCache(tabuleiro)
+            jogada_cache = self.carregarCache(tabuleiro, posicoes_cache)
+            if jogada_cache is not None:
+                return jogada_cache
 
         if self.nivel_dificuldade == 1:
             profundidade = 3
+            if self.estatisticas is not None:
+                self.estatisticas.buscas_raiz += 1
             melhor_coluna, pontuacao = self.minimaxBasico(tabuleiro, profundidade, True)
-        elif self.nivel_dificuldade == 2:
-            profundidade = 5
-            melhor_coluna, pontuacao = self.minimaxComPoda(tabuleiro, profundidade, -np.inf, np.inf, True)
-            melhor_coluna, pontuacao = self.buscaComLimiteTempo(tabuleiro, tempo_inicio)
+            self.profundidade_alcancada = profundidade
+            self.registrarIteracao(profundidade, time.perf_counter() - tempo_inicio,
+                                   self.nos_avaliados, melhor_coluna, pontuacao)
+        elif self.nivel_dificuldade == 3 or self.isFimDePartida(tabuleiro):
+            melhor_coluna, pontuacao = self.buscaPerfeita(tabuleiro, tempo_inicio)
+        else:
+            melhor_coluna, pontuacao = self.buscaHeuristica(tabuleiro, tempo_inicio)
+        if posicoes_cache is not None:
+            self.salvarCache(tabuleiro, posicoes_cache, melhor_coluna, pontuacao)
+        return melhor_coluna, pontuacao
 
-        tempo_gasto = time.time() - tempo_inicio
-        return melhor_coluna, pontuacao, tempo_gasto
+    def decidirJogadaComTelemetria(self, tabuleiro, tempo_inicio):
+        """
+        Executa decidirJogada coletando estatísticas e, se pedido, o perfil de execução.
+
+        `perfilar` aceita "cprofile" (determinístico, mais caro) ou
+        "amostragem" (AmostradorPerfil, custo quase constante).
+
+        Args:
+            tabuleiro (BitBoard): estado atual do tabuleiro
+            tempo_inicio (float): instante inicial, em time.perf_counter()
+
+        Returns:
+            tuple[int, float]: (melhor_coluna, pontuação)
+        """
+        estatisticas = self.estatisticas
+        tabela_antes = self.tabela.getEstatisticas() if self.tabela is not None else {}
+        perfilador = None
+        if self.perfilar == "cprofile":
+            import cProfile
+            perfilador = cProfile.Profile()
+            perfilador.enable()
+        elif self.perfilar == "amostragem":
+            from telemetria import AmostradorPerfil
+            perfilador = AmostradorPerfil()
+            perfilador.iniciar()
+
+        try:
+            melhor_coluna, pontuacao = self.decidirJogada(tabuleiro, tempo_inicio)
+        finally:
+            if self.perfilar == "cprofile":
+                import io
+                import pstats
+                perfilador.disable()
+                saida = io.StringIO()
+                pstats.Stats(perfilador, stream=saida).sort_stats("cumulative").print_stats(20)
+                estatisticas.perfil = saida.getvalue()
+            elif perfilador is not None:
+                perfilador.parar()
+                estatisticas.perfil = perfilador.getRelatorio()
+
+        if self.tabela is not None:
+            tabela_depois = self.tabela.getEstatisticas()
+            estatisticas.tabela = {campo: tabela_depois[campo] - tabela_antes[campo]
+                                   for campo in ("consultas", "acertos", "cortes", "gravacoes",
+                                                 "substituicoes", "descartes")}
+        estatisticas.variacao_principal = self.extrairVariacaoPrincipal(tabuleiro, melhor_coluna)
+        return melhor_coluna, pontuacao
+
+    def getEstatisticas(self):
+        """
+        Retorna as estatísticas da última chamada a getMelhorJogada.
+
+        Returns:
+            EstatisticasBusca | None: None se a telemetria estava desativada
+        """
+        return self.estatisticas
+
+    def adicionarGancho(self, evento, funcao):
+        """
+        Registra uma função chamada em um evento da busca.
+
+        Eventos e argumentos:
+            - "inicio_busca": funcao(agente, tabuleiro)
+            - "fim_iteracao": funcao(agente, iteracao), com iteracao = dict de
+              profundidade, tempo, nos, coluna e pontuacao
+            - "fim_busca": funcao(agente, coluna, pontuacao, tempo_gasto)
+
+        Args:
+            evento (str): nome do evento
+            funcao (callable): função a ser chamada
+        """
+        self.ganchos[evento].append(funcao)
+
+    def dispararGancho(self, evento, *args):
+        """Chama as funções registradas para o evento, se houver alguma."""
+        for funcao in self.ganchos[evento]:
+            funcao(*args)
+
+    def registrarIteracao(self, profundidade, tempo, nos, coluna, pontuacao):
+        """
+        Repassa uma iteração completa do aprofundamento iterativo às estatísticas e aos ganchos.
+        """
+        if self.estatisticas is not None:
+            self.estatisticas.registrarIteracao(profundidade, tempo, nos, coluna, pontuacao)
+        if self.ganchos["fim_iteracao"] and not self.ponderando:
+            self.dispararGancho("fim_iteracao", self, {"profundidade": profundidade, "tempo": tempo,
+                                                       "nos": nos, "coluna": coluna,
+                                                       "pontuacao": pontuacao})
+
+    def extrairVariacaoPrincipal(self, tabuleiro, coluna, limite=None):
+        """
+        Reconstrói a variação principal seguindo as melhores colunas da tabela de transposição.
+
+        Args:
+            tabuleiro (BitBoard): posição da raiz
+            coluna (int): jogada escolhida na raiz
+            limite (int | None): tamanho máximo (padrão: profundidade alcançada)
+
+        Returns:
+            list[int]: colunas da variação principal, começando pela jogada da raiz
+        """
+        limite = limite or max(self.profundidade_alcancada, 1)
+        variacao = [coluna]
+        if self.tabela is None:
+            return variacao
+        posicao = tabuleiro.copia()
+        jogador = self.jogador
+        while True:
+            posicao.addPeca(coluna, jogador)
+            jogador = 3 - jogador
+            if len(variacao) >= limite or posicao.getVencedor() != 0 or posicao.isTabuleiroCompleto():
+                break
+            entrada = self.consultarTabela(posicao)
+            if entrada is None or not posicao.isMovimentoValido(entrada[3]):
+                break
+            coluna = entrada[3]
+            variacao.append(coluna)
+        return variacao
+
+    def getPercentisLatencia(self, percentis=(50, 90, 99)):
+        """
+        Calcula percentis do tempo gasto pelas últimas jogadas (até 1000).
+
+        Args:
+            percentis (tuple[float]): percentis desejados
+
+        Returns:
+            dict[float, float]: percentil -> tempo em segundos (vazio se ainda não houve jogadas)
+        """
+        if not self.latencias:
+            return {}
+        import numpy as np
+        valores = np.percentile(np.fromiter(self.latencias, dtype=float), percentis)
+        return dict(zip(percentis, valores.tolist()))
 
     # ============================================================
     # MINIMAX E PODA
@@ -62,6 +374,9 @@ class AgenteIA:
         """
         Implementação básica do algoritmo Minimax sem otimizações.
 
+        A única redução é a da simetria: em posições iguais ao próprio
+        espelho só metade das colunas é buscada (ver getColunasDistintas).
+
         Args:
             tabuleiro (Board): estado atual do tabuleiro
             profundidade (int): limite de recursão
@@ -71,19 +386,24 @@ class AgenteIA:
             tuple[int, float]: (melhor_coluna, pontuação estimada)
         """
         self.nos_avaliados += 1
+        estatisticas = self.estatisticas
+        if estatisticas is not None:
+            estatisticas.registrarNo(tabuleiro.movimentos - self._movimentos_raiz)
 
         vencedor = tabuleiro.getVencedor()
         if vencedor != 0 or profundidade == 0 or tabuleiro.isTabuleiroCompleto():
             return -1, self.avaliarPosicao(tabuleiro)
 
-        movimentos_validos = tabuleiro.getMovimentosValidos()
+        movimentos_validos = self.getColunasDistintas(tabuleiro, tabuleiro.getMovimentosValidos())
+        if estatisticas is not None:
+            estatisticas.nos_expandidos += 1
 
         if maximizando:
-            melhor_pontuacao = -np.inf
+            melhor_pontuacao = -math.inf
             melhor_coluna = movimentos_validos[0]
 
             for coluna in movimentos_validos:
-                tabuleiro.addPeca(coluna, 2)
+                tabuleiro.addPeca(coluna, self.jogador)
                 _, pontuacao = self.minimaxBasico(tabuleiro, profundidade - 1, False)
                 tabuleiro.removePeca(coluna)
 
@@ -93,11 +413,11 @@ class AgenteIA:
 
             return melhor_coluna, melhor_pontuacao
         else:
-            melhor_pontuacao = np.inf
+            melhor_pontuacao = math.inf
             melhor_coluna = movimentos_validos[0]
 
             for coluna in movimentos_validos:
-                tabuleiro.addPeca(coluna, 1)
+                tabuleiro.addPeca(coluna, self.oponente)
                 _, pontuacao = self.minimaxBasico(tabuleiro, profundidade - 1, True)
                 tabuleiro.removePeca(coluna)
 
@@ -111,8 +431,32 @@ class AgenteIA:
         """
         Implementa o algoritmo Minimax com poda alfa-beta.
 
+        Se houver um prazo ativo (ver buscaComLimiteTempo), o relógio é
+        consultado a cada `intervalo_verificacao` nós e TempoEsgotado é
+        lançada quando ele expira ou quando a ponderação é cancelada.
+
+        Quando há tabela de transposição, a posição é consultada pela chave de
+        Zobrist antes de expandir os filhos: entradas com profundidade
+        suficiente devolvem o valor exato ou estreitam a janela (alfa, beta),
+        e o resultado do nó é gravado com o tipo de limite correspondente.
+        A chave é a canônica (ver consultarTabela), então uma posição e seu
+        espelho compartilham a entrada; em posições simétricas só metade das
+        colunas é buscada (ver getColunasDistintas).
+
+        Com `poda_ameacas`, as jogadas passam por ameacas.getJogadasForcadas:
+        vitória imediata ou bloqueio obrigatório são buscados sozinhos, e as
+        jogadas que entregam uma vitória ao oponente são descartadas.
+
+        Com `ordenacao_dinamica` (padrão, em todos os níveis), os filhos são
+        ordenados por ordenarJogadas; cada corte beta alimenta os killer moves
+        do ply e a tabela de histórico. Sem ela, só o nível 3 ordena, pelo centro.
+
+        Com `avaliacao_lote`, os nós de fronteira (profundidade 1) avaliam
+        todos os filhos de uma vez com avaliarFilhos em vez de descer em
+        cada um; o resultado e a contagem de nós são os mesmos.
+
         Args:
-            tabuleiro (Board): estado atual do jogo
+            tabuleiro (BitBoard): estado atual do jogo
             profundidade (int): limite de profundidade da recursão
             alfa (float): melhor valor mínimo encontrado até agora
             beta (float): melhor valor máximo encontrado até agora
@@ -120,26 +464,73 @@ class AgenteIA:
 
         Returns:
             tuple[int, float]: (melhor_coluna, pontuação estimada)
+
+        Raises:
+            TempoEsgotado: se o prazo ativo expirar durante a busca
         """
         self.nos_avaliados += 1
+        if (self._prazo is not None and self.nos_avaliados % self.intervalo_verificacao == 0
+                and (time.perf_counter() > self._prazo or self._cancelamento.is_set())):
+            raise TempoEsgotado()
+        estatisticas = self.estatisticas
+        if estatisticas is not None:
+            estatisticas.registrarNo(tabuleiro.movimentos - self._movimentos_raiz)
 
         vencedor = tabuleiro.getVencedor()
         if vencedor != 0 or profundidade == 0 or tabuleiro.isTabuleiroCompleto():
             return -1, self.avaliarPosicao(tabuleiro)
 
-        movimentos_validos = tabuleiro.getMovimentosValidos()
-
-        if self.nivel_dificuldade == 3:
+        tabela = self.tabela
+        coluna_tabela = -1
+        if tabela is not None:
+            entrada = self.consultarTabela(tabuleiro)
+            if entrada is not None:
+                coluna_tabela = entrada[3]
+            if entrada is not None and entrada[0] >= profundidade:
+                _, pontuacao, tipo, coluna = entrada
+                if tipo == EXATO:
+                    tabela.cortes += 1
+                    return coluna, pontuacao
+                if tipo == LIMITE_INFERIOR:
+                    alfa = max(alfa, pontuacao)
+                else:
+                    beta = min(beta, pontuacao)
+                if beta <= alfa:
+                    tabela.cortes += 1
+                    return coluna, pontuacao
+            alfa_busca, beta_busca = alfa, beta
+
+        jogador = self.jogador if maximizando else self.oponente
+        ply = tabuleiro.movimentos - self._movimentos_raiz
+        movimentos_validos = self.getColunasDistintas(tabuleiro, tabuleiro.getMovimentosValidos())
+        if coluna_tabela >= 0 and coluna_tabela not in movimentos_validos:
+            coluna_tabela = tabuleiro.colunas - 1 - coluna_tabela
+        if self.poda_ameacas:
+            movimentos_validos = getJogadasForcadas(tabuleiro, jogador, movimentos_validos)
+
+        if self.ordenacao_dinamica:
+            movimentos_validos = self.ordenarJogadas(tabuleiro, movimentos_validos, jogador, ply, coluna_tabela,
+                                                     profundidade >= self.profundidade_ordenacao_ameacas)
+        elif self.nivel_dificuldade == 3:
             movimentos_validos = self.ordenarMovimentos(tabuleiro, movimentos_validos)
+        if estatisticas is not None:
+            estatisticas.nos_expandidos += 1
+
+        folhas = None
+        if profundidade == 1 and self.avaliacao_lote and self.isLoteSuportado(tabuleiro):
+            folhas = self.avaliarFilhos(tabuleiro, movimentos_validos, jogador)
 
         if maximizando:
-            melhor_pontuacao = -np.inf
+            melhor_pontuacao = -math.inf
             melhor_coluna = movimentos_validos[0]
 
-            for coluna in movimentos_validos:
-                tabuleiro.addPeca(coluna, 2)
-                _, pontuacao = self.minimaxComPoda(tabuleiro, profundidade - 1, alfa, beta, False)
-                tabuleiro.removePeca(coluna)
+            for indice, coluna in enumerate(movimentos_validos):
+                if folhas is not None:
+                    pontuacao = self.registrarFolha(folhas[indice], ply + 1)
+                else:
+                    tabuleiro.addPeca(coluna, self.jogador)
+                    _, pontuacao = self.minimaxComPoda(tabuleiro, profundidade - 1, alfa, beta, False)
+                    tabuleiro.removePeca(coluna)
 
                 if pontuacao > melhor_pontuacao:
                     melhor_pontuacao = pontuacao
@@ -147,17 +538,26 @@ class AgenteIA:
 
                 alfa = max(alfa, pontuacao)
                 if beta <= alfa:
+                    if estatisticas is not None:
+                        estatisticas.registrarCorte(indice)
+                    self.registrarCorteOrdenacao(tabuleiro, coluna, jogador, ply, profundidade)
                     break
 
+            if tabela is not None:
+                self.gravarTabela(tabuleiro, profundidade, melhor_pontuacao, melhor_coluna,
+                                  alfa_busca, beta_busca)
             return melhor_coluna, melhor_pontuacao
         else:
-            melhor_pontuacao = np.inf
+            melhor_pontuacao = math.inf
             melhor_coluna = movimentos_validos[0]
 
-            for coluna in movimentos_validos:
-                tabuleiro.addPeca(coluna, 1)
-                _, pontuacao = self.minimaxComPoda(tabuleiro, profundidade - 1, alfa, beta, True)
-                tabuleiro.removePeca(coluna)
+            for indice, coluna in enumerate(movimentos_validos):
+                if folhas is not None:
+                    pontuacao = self.registrarFolha(folhas[indice], ply + 1)
+                else:
+                    tabuleiro.addPeca(coluna, self.oponente)
+                    _, pontuacao = self.minimaxComPoda(tabuleiro, profundidade - 1, alfa, beta, True)
+                    tabuleiro.removePeca(coluna)
 
                 if pontuacao < melhor_pontuacao:
                     melhor_pontuacao = pontuacao
@@ -165,41 +565,923 @@ class AgenteIA:
 
                 beta = min(beta, pontuacao)
                 if beta <= alfa:
+                    if estatisticas is not None:
+                        estatisticas.registrarCorte(indice)
+                    self.registrarCorteOrdenacao(tabuleiro, coluna, jogador, ply, profundidade)
                     break
 
+            if tabela is not None:
+                self.gravarTabela(tabuleiro, profundidade, melhor_pontuacao, melhor_coluna,
+                                  alfa_busca, beta_busca)
             return melhor_coluna, melhor_pontuacao
 
+    def getColunasDistintas(self, tabuleiro, movimentos):
+        """
+        Descarta as colunas equivalentes por espelhamento em posições simétricas.
+
+        Se a posição é igual ao próprio espelho, jogar na coluna c ou em
+        colunas - 1 - c leva a posições espelhadas, de mesmo valor; basta
+        buscar a metade esquerda (e a coluna central). No início da partida
+        isso corta quase metade dos nós.
+
+        Args:
+            tabuleiro (Board | BitBoard): posição atual
+            movimentos (list[int]): colunas válidas
+
+        Returns:
+            list[int]: `movimentos`, sem as colunas espelhadas se a posição for simétrica
+        """
+        if not self.poda_simetria or not tabuleiro.isSimetrico():
+            return movimentos
+        ultima = tabuleiro.colunas - 1
+        return [coluna for coluna in movimentos if coluna <= ultima - coluna]
+
+    def consultarTabela(self, tabuleiro):
+        """
+        Consulta a tabela de transposição pela chave canônica da posição.
+
+        As entradas são gravadas com a chave que dobra a posição com seu
+        espelho (tabuleiro.getChaveCanonica); a coluna vem refletida de volta
+        quando a chave canônica é a do espelho.
+
+        Args:
+            tabuleiro (Board | BitBoard): posição a consultar
+
+        Returns:
+            tuple[int, float, int, int] | None: (profundidade, pontuação, tipo, coluna)
+            na orientação de `tabuleiro`, ou None
+        """
+        chave, espelhada = tabuleiro.getChaveCanonica()
+        entrada = self.tabela.consultar(chave)
+        if entrada is not None and espelhada and entrada[3] >= 0:
+            profundidade, pontuacao, tipo, coluna = entrada
+            entrada = (profundidade, pontuacao, tipo, tabuleiro.colunas - 1 - coluna)
+        return entrada
+
+    def registrarFolha(self, pontuacao, ply):
+        """
+        Contabiliza um filho avaliado em lote como se a recursão tivesse chegado a ele.
+
+        Args:
+            pontuacao (float): avaliação já calculada do filho
+            ply (int): distância do filho até a raiz
+
+        Returns:
+            float: a própria pontuação
+
+        Raises:
+            TempoEsgotado: se o prazo ativo expirar
+        """
+        self.nos_avaliados += 1
+        if (self._prazo is not None and self.nos_avaliados % self.intervalo_verificacao == 0
+                and (time.perf_counter() > self._prazo or self._cancelamento.is_set())):
+            raise TempoEsgotado()
+        if self.estatisticas is not None:
+            self.estatisticas.registrarNo(ply)
+        return pontuacao
+
+    def gravarTabela(self, tabuleiro, profundidade, pontuacao, coluna, alfa, beta):
+        """
+        Grava o resultado de um nó na tabela de transposição.
+
+        O tipo de limite é deduzido da janela (alfa, beta) com que o nó foi buscado:
+        abaixo de alfa é limite superior, acima de beta é limite inferior.
+        A gravação usa a chave canônica, com a coluna na orientação dela
+        (ver consultarTabela).
+
+        Args:
+            tabuleiro (BitBoard): posição buscada
+            profundidade (int): profundidade restante da busca
+            pontuacao (float): melhor pontuação encontrada
+            coluna (int): melhor coluna encontrada
+            alfa (float): alfa no início da expansão do nó
+            beta (float): beta no início da expansão do nó
+        """
+        if pontuacao <= alfa:
+            tipo = LIMITE_SUPERIOR
+        elif pontuacao >= beta:
+            tipo = LIMITE_INFERIOR
+        else:
+            tipo = EXATO
+        chave, espelhada = tabuleiro.getChaveCanonica()
+        if espelhada and coluna >= 0:
+            coluna = tabuleiro.colunas - 1 - coluna
+        self.tabela.gravar(chave, profundidade, pontuacao, tipo, coluna)
+
+    def consultarLivro(self, tabuleiro):
+        """
+        Procura a posição no livro de aberturas.
+
+        Args:
+            tabuleiro (BitBoard): estado atual do tabuleiro
+
+        Returns:
+            tuple[int, float] | None: (coluna, pontuação) se a posição estiver no livro
+        """
+        if self.livro is None or self.nivel_dificuldade < 2:
+            return None
+        jogada = self.livro.consultar(tabuleiro)
+        if jogada is None or not tabuleiro.isMovimentoValido(jogada[0]):
+            return None
+        coluna, valor = jogada
+        return coluna, self.pontuacaoSolver(valor)
+
+    def isFimDePartida(self, tabuleiro):
+        """
+        Verifica se restam no máximo `limite_final` casas vazias.
+
+        Nesse ponto o resolvedor exato termina em milissegundos, e a busca
+        heurística só desperdiçaria o tempo com avaliações aproximadas.
+
+        Args:
+            tabuleiro (BitBoard): estado atual do tabuleiro
+
+        Returns:
+            bool: True se a partida está no fim
+        """
+        return tabuleiro.linhas * tabuleiro.colunas - tabuleiro.movimentos <= self.limite_final
+
+    def buscaHeuristica(self, tabuleiro, tempo_inicio):
+        """
+        Busca iterativa limitada por tempo, paralela quando há mais de um processo.
+
+        Args:
+            tabuleiro (BitBoard): estado atual do tabuleiro
+            tempo_inicio (float): instante inicial, em time.perf_counter()
+
+        Returns:
+            tuple[int, float]: (melhor_coluna, pontuação)
+        """
+        if self.num_processos > 1 and not self.ponderando:
+            return self.buscaParalela(tabuleiro, tempo_inicio)
+        return self.buscaComLimiteTempo(tabuleiro, tempo_inicio)
+
+    def buscaPerfeita(self, tabuleiro, tempo_inicio):
+        """
+        Tenta resolver a posição de forma exata e recorre à busca heurística se não houver tempo.
+
+        O resolvedor recebe `fracao_solver` do tempo máximo. Se terminar, a
+        jogada é ótima, a pontuação vem de pontuacaoSolver e a profundidade
+        alcançada é a de todas as casas vazias; se o prazo expirar, o restante
+        do tempo é usado por buscaHeuristica.
+
+        Args:
+            tabuleiro (BitBoard): estado atual do tabuleiro
+            tempo_inicio (float): instante inicial, em time.perf_counter()
+
+        Returns:
+            tuple[int, float]: (melhor_coluna, pontuação)
+        """
+        solver = self.getSolver(tabuleiro)
+        solver.nos_avaliados = 0
+        prazo = tempo_inicio + self.tempo_maximo * self.fracao_solver
+        try:
+            coluna, valor = solver.getMelhorJogada(tabuleiro, self.jogador, prazo)
+        except TempoEsgotado:
+            self.nos_avaliados += solver.nos_avaliados
+            return self.buscaHeuristica(tabuleiro, tempo_inicio)
+        self.nos_avaliados += solver.nos_avaliados
+        self.profundidade_alcancada = tabuleiro.linhas * tabuleiro.colunas - tabuleiro.movimentos
+        return coluna, self.pontuacaoSolver(valor)
+
+    def getSolver(self, tabuleiro):
+        """
+        Retorna o resolvedor exato para o formato do tabuleiro, criando-o se necessário.
+
+        As colunas são exploradas na ordem de ordenarMovimentos (centro primeiro),
+        e a tabela de transposição do resolvedor é mantida entre as jogadas.
+
+        Args:
+            tabuleiro (BitBoard): estado atual do tabuleiro
+
+        Returns:
+            Solver: resolvedor do formato do tabuleiro
+        """
+        solver = self.solver
+        formato = (tabuleiro.linhas, tabuleiro.colunas, tabuleiro.conectar)
+        if solver is None or (solver.linhas, solver.colunas, solver.conectar) != formato:
+            ordem = self.ordenarMovimentos(tabuleiro, list(range(tabuleiro.colunas)))
+            solver = self.solver = Solver(tabuleiro.linhas, tabuleiro.colunas, ordem,
+                                          self.tamanho_tabela_mb or 16, tabuleiro.conectar)
+            solver.cancelamento = self._cancelamento
+        return solver
+
+    def pontuacaoSolver(self, valor):
+        """
+        Converte a pontuação exata do resolvedor para a escala de avaliacaoProfissional.
+
+        Vitórias ficam acima de 100000 (quanto mais rápida, maior), derrotas
+        abaixo de -100000 e o empate vale 0.
+
+        Args:
+            valor (int): pontuação do Solver do ponto de vista da Maquina
+
+        Returns:
+            float: pontuação na escala do agente
+        """
+        if valor > 0:
+            return 100000.0 + valor
+        if valor < 0:
+            return -100000.0 + valor
+        return 0.0
+
     def buscaComLimiteTempo(self, tabuleiro, tempo_inicio):
         """
         Executa uma busca iterativa com profundidade crescente até o tempo limite.
 
+        O prazo (tempo_inicio + tempo_maximo) é verificado dentro da recursão,
+        então uma iteração que ultrapassaria o tempo é interrompida e
+        descartada; o resultado da última profundidade completa é mantido.
+        A profundidade só é limitada pelas casas vazias: a iteração que
+        alcança o fim da partida já é exata.
+        A busca é feita em uma cópia, pois a interrupção deixa peças no tabuleiro.
+
+        Cada iteração usa uma janela de aspiração (ver buscarComAspiracao) em
+        torno da pontuação de duas profundidades antes: as pontuações alternam
+        entre profundidades pares e ímpares, e a da iteração imediatamente
+        anterior cairia fora da janela com frequência. Se a posição está
+        na variação principal da jogada anterior (ver prepararBusca), o
+        aprofundamento começa na profundidade que ela já cobria, com a
+        pontuação dela como estimativa e a jogada prevista como resposta caso
+        nem essa iteração termine.
+
         Args:
-            tabuleiro (Board): estado atual do tabuleiro
-            tempo_inicio (float): timestamp inicial
+            tabuleiro (Board | BitBoard): estado atual do tabuleiro
+            tempo_inicio (float): instante inicial, em time.perf_counter()
 
         Returns:
             tuple[int, float]: (melhor_coluna, pontuação)
         """
         melhor_coluna = tabuleiro.getMovimentosValidos()[0]
         melhor_pontuacao = 0
+        profundidade_inicial, pontuacoes = 1, {}
+        if self._retomada is not None:
+            profundidade_inicial, coluna_prevista, estimativa = self._retomada
+            pontuacoes[profundidade_inicial] = estimativa
+            if tabuleiro.isMovimentoValido(coluna_prevista):
+                melhor_coluna, melhor_pontuacao = coluna_prevista, estimativa
+        self.profundidade_alcancada = 0
+        busca = tabuleiro.copia()
+        self._prazo = tempo_inicio + self.tempo_maximo
+        vazias = tabuleiro.linhas * tabuleiro.colunas - tabuleiro.movimentos
+
+        try:
+            for profundidade in range(min(profundidade_inicial, vazias), vazias + 1):
+                inicio_iteracao = time.perf_counter()
+                if inicio_iteracao > self._prazo:
+                    break
+                nos_antes = self.nos_avaliados
+                estimativa = pontuacoes.get(profundidade, pontuacoes.get(profundidade - 2))
+                coluna, pontuacao = self.buscarComAspiracao(busca, profundidade, estimativa)
+                melhor_coluna = coluna
+                melhor_pontuacao = pontuacoes[profundidade] = pontuacao
+                self.profundidade_alcancada = profundidade
+                self.registrarIteracao(profundidade, time.perf_counter() - inicio_iteracao,
+                                       self.nos_avaliados - nos_antes, coluna, pontuacao)
+        except TempoEsgotado:
+            pass
+        finally:
+            self._prazo = None
 
-        for profundidade in range(1, 15):
-            if time.time() - tempo_inicio > self.tempo_maximo:
-                break
+        return melhor_coluna, melhor_pontuacao
 
-            try:
-                coluna, pontuacao = self.minimaxComPoda(tabuleiro, profundidade, -np.inf, np.inf, True)
-                melhor_coluna = coluna
-                melhor_pontuacao = pontuacao
-            except:
+    def buscarComAspiracao(self, tabuleiro, profundidade, estimativa):
+        """
+        Busca a raiz com uma janela de aspiração em torno da pontuação esperada.
+
+        A janela é estimativa ± `janela_aspiracao`, mais estreita que
+        (-inf, inf), então a poda corta mais. Se a pontuação cai fora dela
+        (falha baixa ou alta), o lado que falhou é aberto até o infinito e a
+        raiz é buscada de novo; a tabela de transposição grava cada nó com o
+        tipo de limite da janela usada, então a nova busca aproveita a
+        anterior. Sem estimativa, com janela 0 ou com a partida decidida na
+        estimativa (vitórias e ameaças imediatas), a janela é a completa.
+
+        Args:
+            tabuleiro (BitBoard): posição da raiz, com a Maquina na vez
+            profundidade (int): profundidade da iteração
+            estimativa (float | None): pontuação esperada (ver buscaComLimiteTempo)
+
+        Returns:
+            tuple[int, float]: (melhor_coluna, pontuação exata dentro da janela final)
+
+        Raises:
+            TempoEsgotado: se o prazo ativo expirar durante a busca
+        """
+        alfa, beta = -math.inf, math.inf
+        janela = self.janela_aspiracao
+        decidida = 5000 if self.nivel_dificuldade == 2 else 50000
+        if estimativa is not None and janela > 0 and abs(estimativa) < decidida:
+            alfa, beta = estimativa - janela, estimativa + janela
+        while True:
+            if self.estatisticas is not None:
+                self.estatisticas.buscas_raiz += 1
+            coluna, pontuacao = self.minimaxComPoda(tabuleiro, profundidade, alfa, beta, True)
+            if pontuacao <= alfa:
+                alfa = -math.inf
+            elif pontuacao >= beta:
+                beta = math.inf
+            else:
+                return coluna, pontuacao
+            self.estatisticas_reaproveitamento["repeticoes_aspiracao"] += 1
+
+    def buscaParalela(self, tabuleiro, tempo_inicio):
+        """
+        Busca iterativa com as colunas da raiz divididas entre processos.
+
+        A cada profundidade, cada coluna válida vira uma tarefa independente
+        no pool de processos (cada processo mantém seu próprio AgenteIA e sua
+        tabela de transposição entre as tarefas). Uma profundidade só é
+        aceita quando todas as colunas terminam dentro do prazo; os nós
+        avaliados pelos processos são somados em `nos_avaliados`.
+
+        Args:
+            tabuleiro (BitBoard): estado atual do tabuleiro
+            tempo_inicio (float): instante inicial, em time.perf_counter()
+
+        Returns:
+            tuple[int, float]: (melhor_coluna, pontuação)
+        """
+        movimentos = self.getColunasDistintas(tabuleiro, tabuleiro.getMovimentosValidos())
+        melhor_coluna = movimentos[0]
+        melhor_pontuacao = 0
+        self.profundidade_alcancada = 0
+        mascaras = tabuleiro.getMascaras() + (tabuleiro.conectar,)
+        prazo = tempo_inicio + self.tempo_maximo
+        pool = self.getPool()
+        vazias = tabuleiro.linhas * tabuleiro.colunas - tabuleiro.movimentos
+
+        for profundidade in range(1, vazias + 1):
+            inicio_iteracao = time.perf_counter()
+            restante = prazo - inicio_iteracao
+            if restante <= 0:
+                break
+            prazo_absoluto = time.time() + restante
+            futuros = [pool.submit(_buscarColunaRaiz, mascaras, coluna, profundidade, prazo_absoluto)
+                       for coluna in movimentos]
+            resultados = [futuro.result() for futuro in futuros]
+            nos_iteracao = sum(nos for _, nos in resultados)
+            self.nos_avaliados += nos_iteracao
+            if any(pontuacao is None for pontuacao, _ in resultados):
                 break
 
+            pontuacoes = [pontuacao for pontuacao, _ in resultados]
+            indice = max(range(len(pontuacoes)), key=pontuacoes.__getitem__)
+            melhor_coluna = movimentos[indice]
+            melhor_pontuacao = pontuacoes[indice]
+            self.profundidade_alcancada = profundidade
+            self.registrarIteracao(profundidade, time.perf_counter() - inicio_iteracao,
+                                   nos_iteracao, melhor_coluna, melhor_pontuacao)
+
         return melhor_coluna, melhor_pontuacao
 
+    def getPool(self):
+        """
+        Retorna o pool de processos da busca paralela, criando-o na primeira chamada.
+
+        Returns:
+            concurrent.futures.ProcessPoolExecutor: pool com `num_processos` processos
+        """
+        if self._pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            from processos import getContexto
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.num_processos, mp_context=getContexto(),
+                initializer=_inicializarProcesso,
+                initargs=(self.nivel_dificuldade, self.tamanho_tabela_mb, self.jogador, self.modelo))
+        return self._pool
+
+    def fechar(self):
+        """
+        Interrompe a ponderação, encerra o pool de processos da busca paralela e fecha o livro e o cache.
+        """
+        self.pararPonderacao()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        if self.livro is not None:
+            self.livro.fechar()
+            self.livro = None
+        if self.cache is not None:
+            self.cache.fechar()
+            self.cache = None
+
+    # ============================================================
+    # CACHE PERSISTENTE
+    # ============================================================
+
+    def getPerfilCache(self, tabuleiro):
+        """
+        Identifica os registros do cache persistente compatíveis com este agente.
+
+        As pontuações dependem do formato do tabuleiro, da função de
+        avaliação (nível ou modelo) e do lado da Maquina.
+
+        Returns:
+            str: por exemplo "6x7c4n3j2", ou "6x7c4n3j2m<identificador>" com modelo
+        """
+        perfil = (f"{tabuleiro.linhas}x{tabuleiro.colunas}c{tabuleiro.conectar}"
+                  f"n{self.nivel_dificuldade}j{self.jogador}")
+        if self.modelo is not None:
+            perfil += f"m{self.modelo.getIdentificador()}"
+        return perfil
+
+    def getPosicoesCache(self, tabuleiro):
+        """
+        Lista as posições trocadas com o cache persistente: a raiz e as duas jogadas seguintes.
+
+        As posições a duas jogadas da raiz são as próximas raízes, então
+        cada busca gravada aquece a jogada seguinte da mesma linha de jogo.
+
+        Args:
+            tabuleiro (BitBoard): posição da raiz, com a Maquina na vez
+
+        Returns:
+            list[tuple[int, bool, int, bool]]: (chave da tabela de transposição, espelhada na
+            tabela, chave canônica do cache, espelhada no cache) por posição
+        """
+        from livro import getChaveLivro
+        posicoes = []
+        busca = tabuleiro.copia()
+
+        def coletar(jogador, restantes):
+            posicoes.append(busca.getChaveCanonica() + getChaveLivro(busca))
+            if restantes == 0:
+                return
+            for coluna in busca.getMovimentosValidos():
+                busca.addPeca(coluna, jogador)
+                if busca.getVencedor() == 0 and not busca.isTabuleiroCompleto():
+                    coletar(3 - jogador, restantes - 1)
+                busca.removePeca(coluna)
+
+        coletar(self.jogador, 2)
+        return posicoes
+
+    def carregarCache(self, tabuleiro, posicoes):
+        """
+        Copia para a tabela de transposição os registros do cache persistente.
+
+        Com a raiz carregada, o aprofundamento iterativo passa direto pelas
+        profundidades já buscadas e continua a partir da seguinte.
+
+        Args:
+            tabuleiro (BitBoard): posição da raiz
+            posicoes (list): saída de getPosicoesCache
+
+        Returns:
+            tuple[int, float] | None: (coluna, pontuação) se a raiz já estiver
+            resolvida até o fim da partida; None caso contrário
+        """
+        encontradas = self.cache.consultar(self.getPerfilCache(tabuleiro),
+                                           [chave for _, _, chave, _ in posicoes])
+        if not encontradas:
+            return None
+        for chave_tabela, espelhada_tabela, chave, espelhada in posicoes:
+            registro = encontradas.get(chave)
+            if registro is None:
+                continue
+            profundidade, pontuacao, tipo, coluna = registro
+            if espelhada != espelhada_tabela:
+                coluna = tabuleiro.colunas - 1 - coluna
+            self.tabela.gravar(chave_tabela, min(profundidade, 127), pontuacao, tipo, coluna)
+
+        raiz = encontradas.get(posicoes[0][2])
+        vazias = tabuleiro.linhas * tabuleiro.colunas - tabuleiro.movimentos
+        if raiz is None or raiz[0] < vazias or raiz[2] != EXATO:
+            return None
+        coluna = raiz[3]
+        if posicoes[0][3]:
+            coluna = tabuleiro.colunas - 1 - coluna
+        if not tabuleiro.isMovimentoValido(coluna):
+            return None
+        self.profundidade_alcancada = raiz[0]
+        return coluna, raiz[1]
+
+    def salvarCache(self, tabuleiro, posicoes, coluna, pontuacao):
+        """
+        Grava no cache persistente as entradas da tabela de transposição
+        com pelo menos `profundidade_minima_cache`.
+
+        Uma raiz resolvida até o fim da partida (pelo Solver, que não passa
+        pela tabela do agente) é gravada como exata com a profundidade de
+        todas as casas vazias.
+
+        Args:
+            tabuleiro (BitBoard): posição da raiz
+            posicoes (list): saída de getPosicoesCache
+            coluna (int): jogada escolhida
+            pontuacao (float): pontuação da jogada escolhida
+        """
+        registros = []
+        vazias = tabuleiro.linhas * tabuleiro.colunas - tabuleiro.movimentos
+        for indice, (chave_tabela, espelhada_tabela, chave, espelhada) in enumerate(posicoes):
+            if indice == 0 and self.profundidade_alcancada >= vazias:
+                entrada = (vazias, pontuacao, EXATO, coluna)
+                espelhada_tabela = False
+            else:
+                entrada = self.tabela.consultar(chave_tabela)
+            if entrada is None or entrada[0] < self.profundidade_minima_cache or entrada[3] < 0:
+                continue
+            profundidade, valor, tipo, coluna_entrada = entrada
+            if espelhada != espelhada_tabela:
+                coluna_entrada = tabuleiro.colunas - 1 - coluna_entrada
+            registros.append((chave, int(profundidade), float(valor), int(tipo), int(coluna_entrada)))
+        if registros:
+            self.cache.gravar(self.getPerfilCache(tabuleiro), registros)
+
+    # ============================================================
+    # REAPROVEITAMENTO ENTRE JOGADAS
+    # ============================================================
+
+    def novoJogo(self, limpar_tabela=True):
+        """
+        Descarta o estado de busca da partida anterior.
+
+        Interrompe a ponderação e esquece as respostas ponderadas, a variação
+        principal, killer moves, histórico e a raiz e a pontuação da última
+        jogada. Agentes reaproveitados entre partidas (como no torneio) devem
+        chamá-lo a cada partida nova; sem isso, como no servidor, em que as
+        partidas se alternam no mesmo agente, uma raiz que não continua a
+        anterior também é detectada (ver getAvancoPartida).
+
+        Args:
+            limpar_tabela (bool): esvazia também as tabelas de transposição
+                (a da busca e a do resolvedor); com False elas são mantidas,
+                pois as entradas continuam válidas em qualquer partida
+        """
+        self.pararPonderacao()
+        self.respostas_ponderadas = {}
+        self.reiniciarOrdenacao()
+        self.variacao_principal = []
+        self._raiz_anterior = None
+        self._pontuacao_anterior = 0
+        self._retomada = None
+        self._cache_janelas = (None, None)
+        if limpar_tabela:
+            if self.tabela is not None:
+                self.tabela.limpar()
+            if self.solver is not None:
+                self.solver.tabela.limpar()
+
+    def prepararBusca(self, tabuleiro):
+        """
+        Prepara a ordenação e o início do aprofundamento iterativo para uma nova raiz.
+
+        Se a posição continua a partida da última jogada (ver
+        getAvancoPartida), killer moves e histórico são envelhecidos em vez de
+        descartados. Se, além disso, as jogadas feitas desde então são as da
+        variação principal anterior, o restante dela é semeado na tabela de
+        transposição (ver semearVariacao) e buscaComLimiteTempo retoma a
+        partir da profundidade que esse restante cobre, com a pontuação
+        anterior como estimativa. Nos demais casos a busca começa do zero,
+        com a tabela de transposição ainda aproveitável.
+
+        Args:
+            tabuleiro (BitBoard): posição da raiz, com a Maquina na vez
+        """
+        self._retomada = None
+        avanco = self.getAvancoPartida(tabuleiro) if self.reaproveitar_busca else None
+        if avanco is None:
+            self.reiniciarOrdenacao()
+            return
+        self.envelhecerOrdenacao(avanco)
+        self.estatisticas_reaproveitamento["continuacoes"] += 1
+        restante = self.getVariacaoRestante(tabuleiro, avanco)
+        if restante is None:
+            return
+        self.estatisticas_reaproveitamento["variacoes_seguidas"] += 1
+        if self.tabela is not None:
+            self.semearVariacao(tabuleiro, restante)
+        if restante:
+            self._retomada = (len(restante), restante[0], self._pontuacao_anterior)
+
+    def getAvancoPartida(self, tabuleiro):
+        """
+        Verifica se a posição continua a partida da raiz da última jogada.
+
+        Continua quando tem o mesmo formato e todas as peças da raiz anterior,
+        dos mesmos jogadores.
+
+        Args:
+            tabuleiro (BitBoard): posição da nova raiz
+
+        Returns:
+            int | None: jogadas feitas desde a raiz anterior, ou None se a posição não a continua
+        """
+        anterior = self._raiz_anterior
+        if (anterior is None or tabuleiro.movimentos < anterior.movimentos
+                or (anterior.linhas, anterior.colunas, anterior.conectar)
+                != (tabuleiro.linhas, tabuleiro.colunas, tabuleiro.conectar)):
+            return None
+        if anterior.posicoes[1] & ~tabuleiro.posicoes[1] or anterior.posicoes[2] & ~tabuleiro.posicoes[2]:
+            return None
+        return tabuleiro.movimentos - anterior.movimentos
+
+    def getVariacaoRestante(self, tabuleiro, avanco):
+        """
+        Verifica se as jogadas desde a raiz anterior seguiram a variação principal dela.
+
+        Args:
+            tabuleiro (BitBoard): posição da nova raiz
+            avanco (int): jogadas feitas desde a raiz anterior (ver getAvancoPartida)
+
+        Returns:
+            list[int] | None: o restante da variação principal a partir da nova raiz,
+            ou None se as jogadas saíram dela (ou se a vez não é da Maquina)
+        """
+        variacao = self.variacao_principal
+        if avanco % 2 or avanco > len(variacao):
+            return None
+        posicao = self._raiz_anterior.copia()
+        jogador = self.jogador
+        for coluna in variacao[:avanco]:
+            posicao.addPeca(coluna, jogador)
+            jogador = 3 - jogador
+        if posicao.posicoes[1] != tabuleiro.posicoes[1] or posicao.posicoes[2] != tabuleiro.posicoes[2]:
+            return None
+        return variacao[avanco:]
+
+    def semearVariacao(self, tabuleiro, variacao):
+        """
+        Grava na tabela de transposição as jogadas da variação que ela já não tem.
+
+        As entradas semeadas têm profundidade 0: nunca encerram um nó, só
+        fazem minimaxComPoda buscar a jogada prevista primeiro.
+
+        Args:
+            tabuleiro (BitBoard): posição da raiz; não é alterada
+            variacao (list[int]): colunas a partir da raiz
+        """
+        posicao = tabuleiro.copia()
+        jogador = self.jogador
+        for coluna in variacao:
+            if not posicao.isMovimentoValido(coluna):
+                break
+            if self.consultarTabela(posicao) is None:
+                self.gravarTabela(posicao, 0, 0, coluna, -math.inf, math.inf)
+            posicao.addPeca(coluna, jogador)
+            jogador = 3 - jogador
+            if posicao.getVencedor() != 0:
+                break
+
+    def concluirBusca(self, tabuleiro, coluna, pontuacao):
+        """
+        Guarda o que a próxima jogada da partida reaproveita (ver prepararBusca).
+
+        Args:
+            tabuleiro (BitBoard): posição da raiz
+            coluna (int): jogada escolhida
+            pontuacao (float): pontuação da jogada
+        """
+        self._raiz_anterior = tabuleiro.copia()
+        self.variacao_principal = self.extrairVariacaoPrincipal(tabuleiro, coluna)
+        self._pontuacao_anterior = pontuacao
+
+    # ============================================================
+    # PONDERAÇÃO (BUSCA NO TEMPO DO OPONENTE)
+    # ============================================================
+
+    def iniciarPonderacao(self, tabuleiro):
+        """
+        Começa a pensar, em uma thread, nas respostas do oponente à posição atual.
+
+        Deve ser chamado depois da jogada da Maquina, com o oponente na vez.
+        Cada resposta (a prevista pela tabela de transposição primeiro, depois
+        as demais na ordem de ordenarJogadas) é buscada como se fosse a
+        próxima jogada da Maquina, com orçamento de `tempo_maximo` que dobra a
+        cada rodada, por até `rodadas_ponderacao` rodadas. As buscas enchem a
+        tabela de transposição (e a do resolvedor, no nível 3), e cada
+        resultado completo fica em `respostas_ponderadas`.
+
+        Enquanto a ponderação roda o agente pertence à thread auxiliar:
+        getMelhorJogada e fechar a interrompem antes de usá-lo. A espera por
+        input() libera o GIL, então a thread usa o processador ocioso sem
+        atrasar a interface. No nível 1 (profundidade fixa) nada é feito.
+
+        Args:
+            tabuleiro (Board): posição atual, com o oponente na vez
+        """
+        self.pararPonderacao()
+        self.respostas_ponderadas = {}
+        if self.nivel_dificuldade == 1:
+            return
+        tabuleiro = tabuleiro.toBitBoard()
+        if tabuleiro.getVencedor() != 0 or tabuleiro.isTabuleiroCompleto():
+            return
+        self.ponderando = True
+        self._ponderacao = threading.Thread(target=self.ponderar, args=(tabuleiro,), daemon=True)
+        self._ponderacao.start()
+
+    def pararPonderacao(self):
+        """
+        Cancela a ponderação em andamento e espera a thread terminar.
+
+        A busca interrompida descarta apenas a resposta que estava sendo
+        analisada; as já concluídas e a tabela de transposição são mantidas.
+        """
+        if self._ponderacao is None:
+            return
+        self._cancelamento.set()
+        self._ponderacao.join()
+        self._ponderacao = None
+        self._cancelamento.clear()
+        self.ponderando = False
+
+    def ponderar(self, tabuleiro):
+        """
+        Laço da thread de ponderação (ver iniciarPonderacao).
+
+        Args:
+            tabuleiro (BitBoard): posição com o oponente na vez; não é alterada
+        """
+        validos = tabuleiro.getMovimentosValidos()
+        coluna_tabela = -1
+        if self.tabela is not None:
+            entrada = self.consultarTabela(tabuleiro)
+            if entrada is not None:
+                coluna_tabela = entrada[3]
+        provaveis = self.ordenarJogadas(tabuleiro, validos, self.oponente, 0, coluna_tabela)
+        respostas = provaveis + [coluna for coluna in validos if coluna not in provaveis]
+
+        orcamento = self.tempo_maximo
+        for _ in range(self.rodadas_ponderacao):
+            for resposta in respostas:
+                if self._cancelamento.is_set():
+                    return
+                posicao = tabuleiro.copia()
+                posicao.addPeca(resposta, self.oponente)
+                if posicao.getVencedor() != 0 or posicao.isTabuleiroCompleto():
+                    continue
+                resultado = self.buscarPonderacao(posicao, orcamento)
+                if resultado is None:
+                    return
+                self.respostas_ponderadas[posicao.toPosicao()] = resultado + (self.profundidade_alcancada,
+                                                                             orcamento)
+            orcamento *= 2
+
+    def buscarPonderacao(self, tabuleiro, orcamento):
+        """
+        Busca uma posição hipotética com o orçamento dado, como faria getMelhorJogada.
+
+        Estatísticas, latências e ganchos da última jogada real não são
+        alterados; a busca paralela não é usada (ver buscaHeuristica). A
+        busca parte do estado da última jogada real, como faria a próxima
+        (ver prepararBusca), e os killer moves e o histórico dela são
+        restaurados no fim: só a tabela de transposição guarda o que foi visto.
+
+        Args:
+            tabuleiro (BitBoard): posição com a Maquina na vez
+            orcamento (float): tempo da busca, em segundos
+
+        Returns:
+            tuple[int, float] | None: (coluna, pontuação), ou None se a ponderação foi cancelada
+        """
+        tempo_maximo, estatisticas = self.tempo_maximo, self.estatisticas
+        killers, historico = self.killers, self.historico
+        self.tempo_maximo, self.estatisticas = orcamento, None
+        self.nos_avaliados = 0
+        self._movimentos_raiz = tabuleiro.movimentos
+        self.prepararBusca(tabuleiro)
+        try:
+            resultado = self.decidirJogada(tabuleiro, time.perf_counter())
+        finally:
+            self.tempo_maximo, self.estatisticas = tempo_maximo, estatisticas
+            self.killers, self.historico = killers, historico
+        self.estatisticas_ponderacao["buscas"] += 1
+        self.estatisticas_ponderacao["nos"] += self.nos_avaliados
+        if self._cancelamento.is_set():
+            return None
+        return resultado
+
+    def consultarPonderacao(self, tabuleiro):
+        """
+        Procura a posição entre as respostas já analisadas pela ponderação.
+
+        Só vale o resultado buscado com pelo menos o `tempo_maximo` atual;
+        nos demais casos a busca normal aproveita a tabela de transposição.
+
+        Args:
+            tabuleiro (BitBoard): posição com a Maquina na vez
+
+        Returns:
+            tuple[int, float] | None: (coluna, pontuação) ou None se não houver resultado aproveitável
+        """
+        resultado = self.respostas_ponderadas.get(tabuleiro.toPosicao())
+        if resultado is None:
+            return None
+        coluna, pontuacao, profundidade, orcamento = resultado
+        if orcamento < self.tempo_maximo or not tabuleiro.isMovimentoValido(coluna):
+            return None
+        self.profundidade_alcancada = profundidade
+        self.estatisticas_ponderacao["acertos"] += 1
+        return coluna, pontuacao
+
     # ============================================================
     # HEURÍSTICAS E AVALIAÇÃO
     # ============================================================
 
+    def reiniciarOrdenacao(self):
+        """
+        Limpa os killer moves e a tabela de histórico.
+
+        Chamado por prepararBusca quando a raiz não continua a partida
+        anterior e por novoJogo; as duas estruturas persistem entre as
+        iterações do aprofundamento iterativo.
+        """
+        self.killers = []
+        self.historico = {}
+
+    def envelhecerOrdenacao(self, avanco):
+        """
+        Adapta killer moves e histórico de uma busca anterior da mesma partida à nova raiz.
+
+        Os killer moves são indexados pela distância até a raiz: com a raiz
+        `avanco` jogadas adiante, os do ply p passam a ser os do ply p - avanco.
+        O histórico é indexado pela casa, que não muda, e só tem os valores
+        divididos por 2, para que os cortes da nova busca pesem mais. As
+        estruturas são recriadas, não alteradas (ver buscarPonderacao).
+
+        Args:
+            avanco (int): jogadas feitas desde a raiz anterior
+        """
+        self.killers = [list(do_ply) for do_ply in self.killers[avanco:]]
+        self.historico = {celula: valor // 2 for celula, valor in self.historico.items() if valor > 1}
+
+    def ordenarJogadas(self, tabuleiro, movimentos, jogador, ply, coluna_tabela=-1, por_ameacas=True):
+        """
+        Ordena dinamicamente as jogadas de um nó da busca alfa-beta.
+
+        Ordem:
+            1. vitória imediata: é a única jogada considerada;
+            2. bloqueio obrigatório (o adversário vence na coluna): idem;
+            3. melhor coluna guardada na tabela de transposição;
+            4. killer moves do ply (jogadas que causaram corte em nós irmãos);
+            5. demais colunas pelas ameaças que criam (ameacas.contarAmeacasCriadas,
+               só com `por_ameacas`), depois pela tabela de histórico, desempatando pelo centro.
+
+        A minimaxComPoda só conta ameaças a partir de `profundidade_ordenacao_ameacas`:
+        perto das folhas a ordem importa pouco e a contagem custaria mais que os cortes.
+
+        Args:
+            tabuleiro (BitBoard): estado atual
+            movimentos (list[int]): colunas válidas
+            jogador (int): jogador da vez no nó
+            ply (int): distância do nó até a raiz
+            coluna_tabela (int): melhor coluna da tabela de transposição (-1 se não houver)
+            por_ameacas (bool): ordenar pelas ameaças criadas antes do histórico
+
+        Returns:
+            list[int]: colunas na ordem em que devem ser buscadas
+        """
+        vitorias = tabuleiro.getColunasVencedoras(jogador)
+        if vitorias:
+            return vitorias[:1]
+        bloqueios = tabuleiro.getColunasVencedoras(3 - jogador)
+        if bloqueios:
+            return bloqueios[:1]
+
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+        historico = self.historico
+        alturas = tabuleiro.alturas
+        altura_bits = tabuleiro.altura_bits
+        centro = tabuleiro.colunas // 2
+
+        def prioridade(coluna):
+            if coluna == coluna_tabela:
+                return 0, 0, 0
+            if coluna in killers:
+                return 1, killers.index(coluna), 0
+            celula = (coluna * altura_bits + alturas[coluna]) * 2 + jogador - 1
+            criadas = contarAmeacasCriadas(tabuleiro, coluna, jogador) if por_ameacas else 0
+            return 2, -criadas, -historico.get(celula, 0), abs(coluna - centro)
+
+        return sorted(movimentos, key=prioridade)
+
+    def registrarCorteOrdenacao(self, tabuleiro, coluna, jogador, ply, profundidade):
+        """
+        Atualiza killer moves e histórico com a jogada que causou um corte beta.
+
+        O histórico é indexado pela casa jogada (coluna e altura) e por
+        jogador, com bônus profundidade², de modo que cortes perto da raiz
+        pesam mais.
+
+        Args:
+            tabuleiro (BitBoard): posição do nó, já sem a jogada
+            coluna (int): coluna que causou o corte
+            jogador (int): jogador que fez a jogada
+            ply (int): distância do nó até a raiz
+            profundidade (int): profundidade restante no nó
+        """
+        killers = self.killers
+        while len(killers) <= ply:
+            killers.append([])
+        do_ply = killers[ply]
+        if coluna not in do_ply:
+            do_ply.insert(0, coluna)
+            del do_ply[2:]
+        celula = (coluna * tabuleiro.altura_bits + tabuleiro.alturas[coluna]) * 2 + jogador - 1
+        self.historico[celula] = self.historico.get(celula, 0) + profundidade * profundidade
+
     def ordenarMovimentos(self, tabuleiro, movimentos):
         """
         Ordena os movimentos, priorizando as colunas mais próximas do centro.
@@ -227,11 +1509,15 @@ class AgenteIA:
 
     def avaliarPosicao(self, tabuleiro):
         """
-        Chama a função de avaliação adequada conforme o nível de dificuldade.
+        Chama a função de avaliação adequada conforme o nível de dificuldade (ou o modelo, se houver).
 
         Returns:
             float: pontuação heurística da posição
         """
+        if self.estatisticas is not None:
+            self.estatisticas.avaliacoes += 1
+        if self.modelo is not None:
+            return self.avaliacaoModelo(tabuleiro)
         if self.nivel_dificuldade == 1:
             return self.avaliacaoIniciante(tabuleiro)
         elif self.nivel_dificuldade == 2:
@@ -239,60 +1525,245 @@ class AgenteIA:
         else:
             return self.avaliacaoProfissional(tabuleiro)
 
+    def isLoteSuportado(self, tabuleiro):
+        """Verifica se as máscaras do tabuleiro cabem no lote uint64 de avaliarFilhos."""
+        return isinstance(tabuleiro, BitBoard) and tabuleiro.colunas * tabuleiro.altura_bits <= 64
+
+    def avaliarFilhos(self, tabuleiro, movimentos, jogador):
+        """
+        Avalia de uma vez as posições resultantes de cada jogada.
+
+        As máscaras dos filhos são montadas direto dos bits do BitBoard, sem
+        addPeca/removePeca, e avaliadas juntas por avaliarLote.
+
+        Args:
+            tabuleiro (BitBoard): posição atual (colunas * (linhas + 1) <= 64)
+            movimentos (list[int]): colunas válidas, na ordem desejada
+            jogador (int): quem faz a jogada
+
+        Returns:
+            list[float]: pontuação de cada filho, na ordem de `movimentos`
+        """
+        import numpy as np
+        mascaras = np.empty((len(movimentos), 2), dtype=np.uint64)
+        mascara_jogador, mascara_maquina = tabuleiro.posicoes[1], tabuleiro.posicoes[2]
+        for indice, coluna in enumerate(movimentos):
+            bit = 1 << (coluna * tabuleiro.altura_bits + tabuleiro.alturas[coluna])
+            if jogador == 1:
+                mascaras[indice] = (mascara_jogador | bit, mascara_maquina)
+            else:
+                mascaras[indice] = (mascara_jogador, mascara_maquina | bit)
+        return self.avaliarLote(mascaras, tabuleiro.linhas, tabuleiro.colunas, tabuleiro.conectar).tolist()
+
+    def avaliarLote(self, posicoes, linhas=6, colunas=7, conectar=4):
+        """
+        Avalia N posições de uma vez, com a heurística do nível de dificuldade.
+
+        Cada pontuação é igual à de avaliarPosicao na posição correspondente:
+        as características de todas as posições saem de uma única chamada a
+        avaliador.getCaracteristicasLote e são combinadas por um único produto
+        com os pesos de getPesosLote.
+
+        Args:
+            posicoes (numpy.ndarray): (N, linhas, colunas) no formato de Board.grid ou
+                (N, 2) uint64 com as máscaras dos jogadores 1 e 2 (ver avaliador.contarPecasJanelasLote)
+            linhas (int): número de linhas do tabuleiro
+            colunas (int): número de colunas do tabuleiro
+            conectar (int): peças em linha necessárias para vencer
+
+        Returns:
+            numpy.ndarray: (N,) pontuações
+
+        Raises:
+            ValueError: se o formato do lote não for reconhecido
+        """
+        if self.modelo is not None:
+            pontuacao = self.avaliarLoteModelo(posicoes, linhas, colunas, conectar)
+            if self.estatisticas is not None:
+                self.estatisticas.avaliacoes += len(pontuacao)
+            return pontuacao
+        import numpy as np
+        from ameacas import analisarAmeacasLote
+        from avaliador import getCaracteristicasLote, getMascarasLote
+        histogramas, centro, vencedores = getCaracteristicasLote(posicoes, linhas, colunas, conectar)
+        if self.estatisticas is not None:
+            self.estatisticas.avaliacoes += len(vencedores)
+        pesos, vitoria = self.getPesosLote(conectar)
+        pontuacao = histogramas.reshape(len(histogramas), -1) @ pesos[0] + centro @ pesos[1]
+        if self.nivel_dificuldade == 3:
+            mascaras = getMascarasLote(posicoes, linhas, colunas)
+            ameacas, iminentes = analisarAmeacasLote(mascaras, linhas, colunas, conectar)
+            pesos_ameacas = np.array(PESOS_AMEACAS)
+            pontuacao += (ameacas[:, self.jogador] @ pesos_ameacas * 1000
+                          - ameacas[:, self.oponente] @ pesos_ameacas * 1200)
+            pontuacao[iminentes == self.jogador] = 50000
+            pontuacao[iminentes == self.oponente] = -50000
+        pontuacao[vencedores == self.jogador] = vitoria
+        pontuacao[vencedores == self.oponente] = -vitoria
+        return pontuacao
+
+    def getPesosLote(self, conectar):
+        """
+        Escreve a heurística do nível como pesos lineares sobre as características do lote.
+
+        Os pesos reproduzem avaliacaoIniciante, avaliacaoIntermediaria e
+        avaliacaoProfissional termo a termo e ficam em cache por `conectar`;
+        os termos de ameaças da profissional são somados à parte, em avaliarLote.
+
+        Args:
+            conectar (int): peças em linha necessárias para vencer
+
+        Returns:
+            tuple[tuple[numpy.ndarray, numpy.ndarray], int]: (pesos do histograma achatado
+            (3 * (conectar + 1),), pesos do centro (3,)) e a pontuação de vitória
+        """
+        pesos = self._pesos_lote.get(conectar)
+        if pesos is not None:
+            return pesos
+        import numpy as np
+        eu, oponente = self.jogador, self.oponente
+        n = conectar
+        janelas = np.zeros((3, n + 1), dtype=np.int64)
+        centro = np.zeros(3, dtype=np.int64)
+
+        if self.nivel_dificuldade == 1:
+            vitoria = 1000
+            termos = [(eu, n - 1, 5), (eu, n - 2, 2), (oponente, n - 1, -5), (oponente, n - 2, -2)]
+        elif self.nivel_dificuldade == 2:
+            vitoria = 10000
+            termos = [(eu, n - 1, 50), (eu, n - 2, 10), (eu, n - 3, 1),
+                      (oponente, n - 1, -80), (oponente, n - 2, -15), (oponente, n - 3, -2)]
+            centro[eu] = 6
+        else:
+            vitoria = 100000
+            termos = [(eu, n - 1, 5 * 100), (eu, n - 2, 2 * 100),
+                      (oponente, n - 1, -5 * 120), (oponente, n - 2, -2 * 120)]
+            centro[eu] = 3 * 10
+            centro[oponente] = -3 * 12
+        for jogador, tamanho, peso in termos:
+            janelas[jogador][tamanho] += peso
+
+        pesos = self._pesos_lote[conectar] = ((janelas.ravel(), centro), vitoria)
+        return pesos
+
+    def avaliarLoteModelo(self, posicoes, linhas=6, colunas=7, conectar=4):
+        """
+        Avalia N posições com o modelo aprendido.
+
+        A previsão do modelo (entre -1 e 1, do ponto de vista da Maquina)
+        vale até ±modelo.ESCALA_MODELO; como na avaliação profissional,
+        partidas decididas no lance seguinte valem ±50000 e vitórias ±100000,
+        em qualquer nível.
+
+        Args:
+            posicoes (numpy.ndarray): lote no formato de avaliarLote
+            linhas (int): número de linhas do tabuleiro
+            colunas (int): número de colunas do tabuleiro
+            conectar (int): peças em linha necessárias para vencer
+
+        Returns:
+            numpy.ndarray: (N,) pontuações
+        """
+        from modelo import ESCALA_MODELO, extrairCaracteristicas
+        caracteristicas, vencedores, iminentes = extrairCaracteristicas(posicoes, self.jogador, linhas, colunas,
+                                                                       conectar)
+        pontuacao = self.modelo.prever(caracteristicas) * ESCALA_MODELO
+        pontuacao[iminentes == self.jogador] = 50000
+        pontuacao[iminentes == self.oponente] = -50000
+        pontuacao[vencedores == self.jogador] = 100000
+        pontuacao[vencedores == self.oponente] = -100000
+        return pontuacao
+
     # ---- Avaliações específicas ----
 
+    def avaliacaoModelo(self, tabuleiro):
+        """
+        Pontua uma posição com o modelo aprendido, na escala de avaliarLoteModelo.
+
+        As características saem de modelo.getCaracteristicas, que evita o
+        custo fixo das operações em lote para uma única posição.
+        """
+        from modelo import ESCALA_MODELO, getCaracteristicas
+        eu, oponente = self.jogador, self.oponente
+        vencedor = tabuleiro.getVencedor()
+        if vencedor == eu:
+            return 100000
+        elif vencedor == oponente:
+            return -100000
+        if not isinstance(tabuleiro, BitBoard):
+            tabuleiro = tabuleiro.toBitBoard()
+        iminente = getVencedorIminente(tabuleiro)
+        if iminente:
+            return 50000 if iminente == eu else -50000
+        caracteristicas = getCaracteristicas(tabuleiro, eu, self.getHistogramaJanelas(tabuleiro))
+        return float(self.modelo.prever(caracteristicas)[0]) * ESCALA_MODELO
+
     def avaliacaoIniciante(self, tabuleiro):
-        """Heurística simples baseada em contagem de pares e trios."""
+        """Heurística simples baseada em contagem de pares e trios (N-2 e N-1 peças em connect-N)."""
+        eu, oponente = self.jogador, self.oponente
+        n = tabuleiro.conectar
         vencedor = tabuleiro.getVencedor()
-        if vencedor == 2:
+        if vencedor == eu:
             return 1000
-        elif vencedor == 1:
+        elif vencedor == oponente:
             return -1000
 
         pontuacao = 0
-        pontuacao += self.contarJanelas(tabuleiro, 2, 3) * 5
-        pontuacao += self.contarJanelas(tabuleiro, 2, 2) * 2
-        pontuacao -= self.contarJanelas(tabuleiro, 1, 3) * 5
-        pontuacao -= self.contarJanelas(tabuleiro, 1, 2) * 2
+        pontuacao += self.contarJanelas(tabuleiro, eu, n - 1) * 5
+        pontuacao += self.contarJanelas(tabuleiro, eu, n - 2) * 2
+        pontuacao -= self.contarJanelas(tabuleiro, oponente, n - 1) * 5
+        pontuacao -= self.contarJanelas(tabuleiro, oponente, n - 2) * 2
         return pontuacao
 
     def avaliacaoIntermediaria(self, tabuleiro):
         """Heurística intermediária com peso maior para trios e controle central."""
+        eu, oponente = self.jogador, self.oponente
+        n = tabuleiro.conectar
         vencedor = tabuleiro.getVencedor()
-        if vencedor == 2:
+        if vencedor == eu:
             return 10000
-        elif vencedor == 1:
+        elif vencedor == oponente:
             return -10000
 
         pontuacao = 0
-        pontuacao += self.contarJanelas(tabuleiro, 2, 3) * 50
-        pontuacao += self.contarJanelas(tabuleiro, 2, 2) * 10
-        pontuacao += self.contarJanelas(tabuleiro, 2, 1) * 1
-        pontuacao -= self.contarJanelas(tabuleiro, 1, 3) * 80
-        pontuacao -= self.contarJanelas(tabuleiro, 1, 2) * 15
-        pontuacao -= self.contarJanelas(tabuleiro, 1, 1) * 2
-
-        coluna_central = tabuleiro.colunas // 2
-        contador_central = sum(1 for linha in range(tabuleiro.linhas)
-                               if tabuleiro.grid[linha][coluna_central] == 2)
+        pontuacao += self.contarJanelas(tabuleiro, eu, n - 1) * 50
+        pontuacao += self.contarJanelas(tabuleiro, eu, n - 2) * 10
+        pontuacao += self.contarJanelas(tabuleiro, eu, n - 3) * 1
+        pontuacao -= self.contarJanelas(tabuleiro, oponente, n - 1) * 80
+        pontuacao -= self.contarJanelas(tabuleiro, oponente, n - 2) * 15
+        pontuacao -= self.contarJanelas(tabuleiro, oponente, n - 3) * 2
+
+        contador_central = tabuleiro.contarPecasColuna(tabuleiro.colunas // 2, eu)
         pontuacao += contador_central * 6
         return pontuacao
 
     def avaliacaoProfissional(self, tabuleiro):
-        """Heurística avançada considerando padrões e futuro."""
+        """
+        Heurística avançada considerando padrões e futuro.
+
+        Partidas decididas no lance seguinte (ameacas.getVencedorIminente)
+        valem ±50000; nas demais, as ameaças entram classificadas por
+        avaliarAmeacas.
+        """
+        eu, oponente = self.jogador, self.oponente
         vencedor = tabuleiro.getVencedor()
-        if vencedor == 2:
+        if vencedor == eu:
             return 100000
-        elif vencedor == 1:
+        elif vencedor == oponente:
             return -100000
+        if not isinstance(tabuleiro, BitBoard):
+            tabuleiro = tabuleiro.toBitBoard()
+        iminente = getVencedorIminente(tabuleiro)
+        if iminente:
+            return 50000 if iminente == eu else -50000
 
         pontuacao = 0
-        pontuacao += self.avaliarSequenciasAvancadas(tabuleiro, 2) * 100
-        pontuacao -= self.avaliarSequenciasAvancadas(tabuleiro, 1) * 120
-        pontuacao += self.avaliarForcaPosicao(tabuleiro, 2) * 10
-        pontuacao -= self.avaliarForcaPosicao(tabuleiro, 1) * 12
-        pontuacao += self.avaliarAmeacas(tabuleiro, 2) * 1000
-        pontuacao -= self.avaliarAmeacas(tabuleiro, 1) * 1200
+        pontuacao += self.avaliarSequenciasAvancadas(tabuleiro, eu) * 100
+        pontuacao -= self.avaliarSequenciasAvancadas(tabuleiro, oponente) * 120
+        pontuacao += self.avaliarForcaPosicao(tabuleiro, eu) * 10
+        pontuacao -= self.avaliarForcaPosicao(tabuleiro, oponente) * 12
+        pontuacao += self.avaliarAmeacas(tabuleiro, eu) * 1000
+        pontuacao -= self.avaliarAmeacas(tabuleiro, oponente) * 1200
         return pontuacao
 
     # ============================================================
@@ -301,70 +1772,130 @@ class AgenteIA:
 
     def contarJanelas(self, tabuleiro, jogador, tamanho):
         """
-        Conta quantas "janelas" (grupos de 4) têm a quantidade alvo de peças do jogador.
+        Conta quantas "janelas" (grupos de `conectar` células) têm a quantidade alvo de peças do jogador.
+
+        Todas as janelas dos dois jogadores são contadas de uma vez pelo
+        avaliador vetorizado; o histograma resultante fica em cache para a
+        posição atual, então as várias chamadas feitas por uma mesma
+        avaliação custam apenas uma passada.
 
         Args:
             tabuleiro (Board): estado atual
             jogador (int): 1 (Jogador) ou 2 (Maquina)
-            tamanho (int): tamanho da sequência (2, 3 ou 4)
+            tamanho (int): tamanho da sequência (0 a `conectar`)
 
         Returns:
             int: número de janelas que atendem ao critério
         """
-        contador = 0
-        grid = tabuleiro.grid
+        return int(self.getHistogramaJanelas(tabuleiro)[jogador][tamanho])
 
-        for linha in range(tabuleiro.linhas):
-            for coluna in range(tabuleiro.colunas - 3):
-                janela = grid[linha, coluna:coluna+4]
-                if self.avaliarJanela(janela, jogador, tamanho):
-                    contador += 1
-
-        for linha in range(tabuleiro.linhas - 3):
-            for coluna in range(tabuleiro.colunas):
-                janela = grid[linha:linha+4, coluna]
-                if self.avaliarJanela(janela, jogador, tamanho):
-                    contador += 1
-
-        for linha in range(tabuleiro.linhas - 3):
-            for coluna in range(tabuleiro.colunas - 3):
-                janela = [grid[linha+i, coluna+i] for i in range(4)]
-                if self.avaliarJanela(janela, jogador, tamanho):
-                    contador += 1
+    def getHistogramaJanelas(self, tabuleiro):
+        """
+        Retorna o histograma de janelas da posição, reaproveitando o último cálculo.
 
-                janela = [grid[linha+3-i, coluna+i] for i in range(4)]
-                if self.avaliarJanela(janela, jogador, tamanho):
-                    contador += 1
+        Args:
+            tabuleiro (Board | BitBoard): estado atual
 
-        return contador
+        Returns:
+            numpy.ndarray: histograma[jogador][tamanho] (ver avaliador.getHistogramaJanelas)
+        """
+        chave = (tabuleiro.chave, tabuleiro.linhas, tabuleiro.colunas, tabuleiro.conectar)
+        chave_cache, histograma = self._cache_janelas
+        if chave_cache != chave:
+            from avaliador import getHistogramaJanelas
+            histograma = getHistogramaJanelas(tabuleiro)
+            self._cache_janelas = (chave, histograma)
+            if self.estatisticas is not None:
+                self.estatisticas.calculos_janelas += 1
+        elif self.estatisticas is not None:
+            self.estatisticas.acertos_cache_janelas += 1
+        return histograma
 
     def avaliarJanela(self, janela, jogador, tamanho_alvo):
         """Verifica se uma janela contém exatamente a quantidade alvo de peças do jogador."""
-        janela = np.array(janela)
-        contador_jogador = np.sum(janela == jogador)
-        contador_vazio = np.sum(janela == 0)
+        janela = list(janela)
+        contador_jogador = janela.count(jogador)
+        contador_vazio = janela.count(0)
         oponente = 1 if jogador == 2 else 2
-        contador_oponente = np.sum(janela == oponente)
+        contador_oponente = janela.count(oponente)
 
         return (contador_jogador == tamanho_alvo and
-                contador_vazio == 4 - tamanho_alvo and
+                contador_vazio == len(janela) - tamanho_alvo and
                 contador_oponente == 0)
 
     def avaliarSequenciasAvancadas(self, tabuleiro, jogador):
-        """Avalia sequências parciais (2 e 3 em linha) com pesos proporcionais."""
-        return (self.contarJanelas(tabuleiro, jogador, 3) * 5 +
-                self.contarJanelas(tabuleiro, jogador, 2) * 2)
+        """Avalia sequências parciais (2 e 3 em linha no connect-4) com pesos proporcionais."""
+        n = tabuleiro.conectar
+        return (self.contarJanelas(tabuleiro, jogador, n - 1) * 5 +
+                self.contarJanelas(tabuleiro, jogador, n - 2) * 2)
 
     def avaliarForcaPosicao(self, tabuleiro, jogador):
         """Dá pontuação adicional para peças próximas ao centro do tabuleiro."""
-        pontuacao = 0
-        coluna_central = tabuleiro.colunas // 2
-
-        for linha in range(tabuleiro.linhas):
-            if tabuleiro.grid[linha][coluna_central] == jogador:
-                pontuacao += 3
-        return pontuacao
+        return tabuleiro.contarPecasColuna(tabuleiro.colunas // 2, jogador) * 3
 
     def avaliarAmeacas(self, tabuleiro, jogador):
-        """Calcula possíveis trincas que podem se tornar vitória no próximo turno."""
-        return self.contarJanelas(tabuleiro, jogador, 3) * 10
+        """
+        Pontua as ameaças do jogador classificadas por ameacas.analisarAmeacas.
+
+        Cada ameaça viva vale 10, mais 5 se estiver em linha de paridade
+        favorável e 10 por par empilhado; ameaças mortas (logo acima de uma
+        do oponente) não contam.
+        """
+        caracteristicas = analisarAmeacas(tabuleiro, jogador)
+        return sum(quantidade * peso for quantidade, peso in zip(caracteristicas, PESOS_AMEACAS))
+
+
+# ============================================================
+# PROCESSOS DA BUSCA PARALELA
+# ============================================================
+
+_agente_processo = None
+
+
+def _inicializarProcesso(nivel_dificuldade, tamanho_tabela_mb, jogador, modelo=None):
+    """Cria o AgenteIA de um processo auxiliar da busca paralela, com o modelo do agente principal."""
+    global _agente_processo
+    _agente_processo = AgenteIA(nivel_dificuldade, tamanho_tabela_mb, jogador=jogador)
+    _agente_processo.modelo = modelo
+
+
+def _buscarColunaRaiz(mascaras, coluna, profundidade, prazo_absoluto):
+    """
+    Avalia uma coluna da raiz em um processo auxiliar.
+
+    O agente do processo atende colunas e jogadas em sequência. Quando a raiz
+    muda, ele se prepara como getMelhorJogada: nova geração da tabela de
+    transposição, plies contados a partir da raiz e killer moves e histórico
+    envelhecidos ou reiniciados (ver prepararBusca). As colunas da mesma
+    raiz compartilham a ordenação, como as subárvores da busca serial.
+
+    Args:
+        mascaras (tuple): posição no formato de BitBoard.getMascaras(), seguida de `conectar`
+        coluna (int): coluna jogada pela Maquina na raiz
+        profundidade (int): profundidade total da iteração (contando a jogada da raiz)
+        prazo_absoluto (float): prazo da jogada em time.time(), comum a todos os processos
+
+    Returns:
+        tuple[float | None, int]: (pontuação, nós avaliados); a pontuação é None
+        se o prazo expirou antes do fim da busca
+    """
+    agente = _agente_processo
+    agente.nos_avaliados = 0
+    raiz = BitBoard.fromMascaras(*mascaras)
+    anterior = agente._raiz_anterior
+    if anterior is None or anterior.getMascaras() + (anterior.conectar,) != tuple(mascaras):
+        if agente.tabela is not None:
+            agente.tabela.novaBusca()
+        agente._movimentos_raiz = raiz.movimentos
+        agente.prepararBusca(raiz)
+        agente._raiz_anterior = raiz.copia()
+    tabuleiro = raiz.copia()
+    tabuleiro.addPeca(coluna, agente.jogador)
+    agente._prazo = time.perf_counter() + (prazo_absoluto - time.time())
+    try:
+        _, pontuacao = agente.minimaxComPoda(tabuleiro, profundidade - 1, -math.inf, math.inf, False)
+    except TempoEsgotado:
+        pontuacao = None
+    finally:
+        agente._prazo = None
+    return pontuacao, agente.nos_avaliados + 1
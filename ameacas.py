@@ -0,0 +1,240 @@
+"""
+Análise de ameaças (casas que completariam uma linha).
+
+Uma ameaça de um jogador é uma casa vazia que, ocupada por ele, completa
+`conectar` peças em linha. O BitBoard mantém as ameaças dos dois jogadores
+a cada jogada (BitBoard.ameacas); este módulo as classifica:
+
+    - imediatas: a casa é jogável agora (vitória no próximo lance de quem a tem);
+    - de paridade favorável: no fim da partida quem começa (jogador 1)
+      tende a ocupar as casas das linhas ímpares (1a, 3a, ... a partir da
+      base) e o segundo jogador as das pares, então só essas costumam decidir;
+    - empilhadas: duas ameaças do mesmo jogador uma sobre a outra, que o
+      oponente não consegue bloquear ao mesmo tempo;
+    - mortas: ameaças logo acima de uma ameaça do oponente, que nunca
+      podem ser jogadas com segurança (quem preenche a casa de baixo
+      entrega a de cima).
+
+A avaliação profissional, a ordenação de jogadas e a poda de jogadas
+forçadas do AgenteIA usam essas classificações. analisarAmeacasLote faz a
+mesma análise para N posições de uma vez, sobre arrays de máscaras; só ela
+usa NumPy, importado na primeira chamada.
+"""
+
+from bitboard import BitBoard, getCasasAlinhadas
+
+# índices das características devolvidas por analisarAmeacas / analisarAmeacasLote
+VIVAS, FAVORAVEIS, EMPILHADAS, IMEDIATAS = range(4)
+
+_mascaras = {}
+_bits_por_byte = None
+
+
+def getMascarasFormato(linhas, colunas):
+    """
+    Retorna as máscaras fixas de um formato, criando-as apenas na primeira chamada.
+
+    Args:
+        linhas (int): número de linhas do tabuleiro
+        colunas (int): número de colunas do tabuleiro
+
+    Returns:
+        tuple[int, int, int, int]: (base, casas, linhas ímpares, linhas pares) no layout do BitBoard
+    """
+    formato = (linhas, colunas)
+    mascaras = _mascaras.get(formato)
+    if mascaras is None:
+        altura_bits = linhas + 1
+        base = sum(1 << (c * altura_bits) for c in range(colunas))
+        casas = base * ((1 << linhas) - 1)
+        impares = base * sum(1 << altura for altura in range(0, linhas, 2))
+        mascaras = _mascaras[formato] = (base, casas, impares, casas ^ impares)
+    return mascaras
+
+
+def getLinhasFavoraveis(linhas, colunas, jogador):
+    """Retorna a máscara das linhas de paridade favorável ao jogador (ímpares para quem começa)."""
+    _, _, impares, pares = getMascarasFormato(linhas, colunas)
+    return impares if jogador == 1 else pares
+
+
+def getJogaveis(tabuleiro):
+    """Retorna a máscara das casas jogáveis agora (a mais baixa livre de cada coluna)."""
+    base, casas, _, _ = getMascarasFormato(tabuleiro.linhas, tabuleiro.colunas)
+    return ((tabuleiro.posicoes[1] | tabuleiro.posicoes[2]) + base) & casas
+
+
+def analisarAmeacas(tabuleiro, jogador):
+    """
+    Classifica as ameaças de um jogador.
+
+    Args:
+        tabuleiro (BitBoard | Board): posição analisada (Board é convertido)
+        jogador (int): 1 ou 2
+
+    Returns:
+        tuple[int, int, int, int]: quantidades de ameaças vivas (não mortas),
+        vivas de paridade favorável, empilhadas e imediatas (ver índices VIVAS, ...)
+    """
+    if not isinstance(tabuleiro, BitBoard):
+        tabuleiro = tabuleiro.toBitBoard()
+    ameacas = tabuleiro.ameacas[jogador]
+    vivas = ameacas & ~(tabuleiro.ameacas[3 - jogador] << 1)
+    favoraveis = vivas & getLinhasFavoraveis(tabuleiro.linhas, tabuleiro.colunas, jogador)
+    return (vivas.bit_count(), favoraveis.bit_count(), (ameacas & (ameacas >> 1)).bit_count(),
+            (ameacas & getJogaveis(tabuleiro)).bit_count())
+
+
+def getVencedorIminente(tabuleiro):
+    """
+    Identifica partidas decididas no lance seguinte pelas ameaças imediatas.
+
+    Quem joga vence se tem uma ameaça imediata; senão perde se o oponente
+    tem duas, ou uma com outra ameaça dele logo acima (bloquear a primeira
+    entrega a segunda). O jogador 1 começa.
+
+    Args:
+        tabuleiro (BitBoard | Board): posição sem vencedor (Board é convertido)
+
+    Returns:
+        int: jogador que vence em no máximo dois lances, ou 0
+    """
+    if not isinstance(tabuleiro, BitBoard):
+        tabuleiro = tabuleiro.toBitBoard()
+    vez = 1 + tabuleiro.movimentos % 2
+    jogaveis = getJogaveis(tabuleiro)
+    if tabuleiro.ameacas[vez] & jogaveis:
+        return vez
+    dele = tabuleiro.ameacas[3 - vez]
+    imediatas = dele & jogaveis
+    if imediatas & (imediatas - 1) or imediatas & (dele >> 1):
+        return 3 - vez
+    return 0
+
+
+def getJogadasForcadas(tabuleiro, jogador, movimentos):
+    """
+    Reduz as jogadas às que precisam ser buscadas.
+
+    Com uma vitória imediata, só ela; se o oponente ameaça vencer no
+    próximo lance, só o bloqueio (com duas ameaças imediatas a partida está
+    perdida e um bloqueio qualquer basta); caso contrário, descarta as
+    jogadas logo abaixo de uma ameaça do oponente, que lhe entregam a
+    vitória, a menos que todas sejam assim.
+
+    Args:
+        tabuleiro (BitBoard): posição atual
+        jogador (int): quem joga
+        movimentos (list[int]): colunas candidatas
+
+    Returns:
+        list[int]: subconjunto de `movimentos`, na mesma ordem
+    """
+    altura_bits = tabuleiro.altura_bits
+    alturas = tabuleiro.alturas
+    minhas = tabuleiro.ameacas[jogador]
+    dele = tabuleiro.ameacas[3 - jogador]
+    bloqueio = -1
+    seguras = []
+    for coluna in movimentos:
+        casa = coluna * altura_bits + alturas[coluna]
+        if (minhas >> casa) & 1:
+            return [coluna]
+        if (dele >> casa) & 1:
+            bloqueio = coluna
+        elif not (dele >> (casa + 1)) & 1:
+            seguras.append(coluna)
+    if bloqueio >= 0:
+        return [bloqueio]
+    return seguras or movimentos
+
+
+def contarAmeacasCriadas(tabuleiro, coluna, jogador):
+    """
+    Conta as ameaças novas que uma jogada cria, em dobro as de paridade favorável.
+
+    Args:
+        tabuleiro (BitBoard): posição atual
+        coluna (int): coluna válida
+        jogador (int): quem joga
+
+    Returns:
+        int: ameaças criadas pela jogada, mais as de paridade favorável
+    """
+    bit = 1 << (coluna * tabuleiro.altura_bits + tabuleiro.alturas[coluna])
+    posicoes = tabuleiro.posicoes
+    livres = tabuleiro.mascara_casas ^ (posicoes[1] | posicoes[2] | bit)
+    novas = (getCasasAlinhadas(posicoes[jogador] | bit, tabuleiro.altura_bits, tabuleiro.conectar)
+             & livres & ~tabuleiro.ameacas[jogador])
+    return novas.bit_count() + (novas & getLinhasFavoraveis(tabuleiro.linhas, tabuleiro.colunas,
+                                                            jogador)).bit_count()
+
+
+def contarBitsLote(mascaras):
+    """
+    Conta os bits de cada máscara de um array uint64 ou object (inteiros Python).
+
+    Usa numpy.bitwise_count (NumPy 2.0 ou mais novo); no NumPy 1.x, soma os
+    bits de cada byte por uma tabela de 256 entradas.
+    """
+    global _bits_por_byte
+    import numpy as np
+    if mascaras.dtype == object:
+        return np.frompyfunc(int.bit_count, 1, 1)(mascaras).astype(np.int64)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(mascaras).astype(np.int64)
+    if _bits_por_byte is None:
+        _bits_por_byte = np.array([byte.bit_count() for byte in range(256)], dtype=np.int64)
+    bytes_mascaras = np.ascontiguousarray(mascaras, dtype=np.uint64).view(np.uint8)
+    return _bits_por_byte[bytes_mascaras].reshape(*np.shape(mascaras), 8).sum(axis=-1)
+
+
+def analisarAmeacasLote(mascaras, linhas=6, colunas=7, conectar=4):
+    """
+    Faz analisarAmeacas e getVencedorIminente para N posições de uma vez.
+
+    Args:
+        mascaras (numpy.ndarray): (N, 2) máscaras dos jogadores 1 e 2, uint64 ou
+            object (tabuleiros com mais de 64 bits); ver avaliador.getMascarasLote
+        linhas (int): número de linhas do tabuleiro
+        colunas (int): número de colunas do tabuleiro
+        conectar (int): peças em linha necessárias para vencer
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]: características (N, 3, 4), na ordem
+        VIVAS, FAVORAVEIS, EMPILHADAS, IMEDIATAS (a linha 0 não é usada), e o vencedor iminente (N,)
+    """
+    import numpy as np
+    base, casas, impares, pares = getMascarasFormato(linhas, colunas)
+    if mascaras.dtype != object:
+        base, casas, impares, pares = (np.uint64(mascara) for mascara in (base, casas, impares, pares))
+    jogador_1, jogador_2 = mascaras[:, 0], mascaras[:, 1]
+    ocupadas = jogador_1 | jogador_2
+    livres = casas ^ ocupadas
+    jogaveis = (ocupadas + base) & casas
+    ameacas = (getCasasAlinhadas(jogador_1, linhas + 1, conectar) & livres,
+               getCasasAlinhadas(jogador_2, linhas + 1, conectar) & livres)
+
+    caracteristicas = np.zeros((len(mascaras), 3, 4), dtype=np.int64)
+    entregues = [None, None, None]
+    for jogador, favoraveis in ((1, impares), (2, pares)):
+        minhas, dele = ameacas[jogador - 1], ameacas[2 - jogador]
+        vivas = minhas & ~(dele << 1)
+        caracteristicas[:, jogador, VIVAS] = contarBitsLote(vivas)
+        caracteristicas[:, jogador, FAVORAVEIS] = contarBitsLote(vivas & favoraveis)
+        caracteristicas[:, jogador, EMPILHADAS] = contarBitsLote(minhas & (minhas >> 1))
+        caracteristicas[:, jogador, IMEDIATAS] = contarBitsLote(minhas & jogaveis)
+        entregues[jogador] = contarBitsLote(minhas & jogaveis & (minhas >> 1)) > 0
+
+    vez = 1 + contarBitsLote(ocupadas) % 2
+    indices = np.arange(len(mascaras))
+    outro = 3 - vez
+    perde = ((caracteristicas[indices, outro, IMEDIATAS] >= 2)
+             | np.where(outro == 1, entregues[1], entregues[2]))
+    iminentes = np.where(caracteristicas[indices, vez, IMEDIATAS] > 0, vez, np.where(perde, outro, 0))
+    return caracteristicas, iminentes
+
+
+# o formato padrão (6x7) é montado na importação: processos criados por um
+# servidor de fork (ver processos.py) já recebem as máscaras prontas
+getMascarasFormato(6, 7)
@@ -0,0 +1,154 @@
+"""
+Avaliação vetorizada das janelas de N células.
+
+Em vez de percorrer as janelas em laços Python, as posições das células de
+cada janela são pré-calculadas uma única vez por formato de tabuleiro
+(ver janelas.py) e todas as janelas são contadas, para os dois jogadores,
+em uma única passada NumPy.
+
+As funções "Lote" fazem o mesmo para N posições de uma vez, recebidas como
+matriz (N, linhas, colunas) no formato de Board.grid ou como máscaras
+(N, 2) uint64 dos jogadores 1 e 2 no layout do BitBoard.
+"""
+
+import numpy as np
+
+from ameacas import contarBitsLote
+from bitboard import BitBoard
+from janelas import getTabelaJanelas
+
+
+def contarPecasJanelas(tabuleiro):
+    """
+    Conta as peças de cada jogador em todas as janelas do tabuleiro.
+
+    Args:
+        tabuleiro (Board | BitBoard): posição a avaliar
+
+    Returns:
+        numpy.ndarray: matriz (2, janelas) com as peças do jogador 1 e do jogador 2 por janela
+    """
+    tabela = getTabelaJanelas(tabuleiro.linhas, tabuleiro.colunas, tabuleiro.conectar)
+    if isinstance(tabuleiro, BitBoard):
+        dados = (tabuleiro.posicoes[1].to_bytes(tabela.num_bytes, "little") +
+                 tabuleiro.posicoes[2].to_bytes(tabela.num_bytes, "little"))
+        bits = np.unpackbits(np.frombuffer(dados, dtype=np.uint8), bitorder="little").reshape(2, -1)
+        return bits[:, tabela.indices_bits].sum(axis=2)
+    celulas = tabuleiro.grid.ravel()[tabela.indices_grid]
+    return np.stack(((celulas == 1).sum(axis=1), (celulas == 2).sum(axis=1)))
+
+
+def getHistogramaJanelas(tabuleiro):
+    """
+    Calcula, de uma só vez, quantas janelas cada jogador tem com 0 a N peças e nenhuma do oponente.
+
+    histograma[jogador][tamanho] é exatamente o valor de
+    AgenteIA.contarJanelas(tabuleiro, jogador, tamanho) na implementação em laços.
+
+    Args:
+        tabuleiro (Board | BitBoard): posição a avaliar
+
+    Returns:
+        numpy.ndarray: matriz (3, conectar + 1); a linha 0 não é usada
+    """
+    contagens = contarPecasJanelas(tabuleiro)
+    tamanhos = tabuleiro.conectar + 1
+    histograma = np.zeros((3, tamanhos), dtype=int)
+    histograma[1] = np.bincount(contagens[0][contagens[1] == 0], minlength=tamanhos)
+    histograma[2] = np.bincount(contagens[1][contagens[0] == 0], minlength=tamanhos)
+    return histograma
+
+
+def contarPecasJanelasLote(posicoes, linhas=6, colunas=7, conectar=4):
+    """
+    Conta as peças de cada jogador em todas as janelas de N posições.
+
+    Máscaras são contadas por popcount de (máscara & janela), sem desempacotar
+    os bits; grids são contados por indexação, como em contarPecasJanelas.
+
+    Args:
+        posicoes (numpy.ndarray): (N, linhas, colunas) com 0, 1 ou 2 (formato de Board.grid),
+            ou (N, 2) uint64 com as máscaras dos jogadores 1 e 2 (layout do BitBoard)
+        linhas (int): número de linhas do tabuleiro
+        colunas (int): número de colunas do tabuleiro
+        conectar (int): peças em linha necessárias para vencer
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]: contagens (N, 2, janelas) e peças na coluna central (N, 2)
+
+    Raises:
+        ValueError: se o formato do lote não for reconhecido ou as máscaras não couberem em 64 bits
+    """
+    tabela = getTabelaJanelas(linhas, colunas, conectar)
+    posicoes = np.asarray(posicoes)
+    if posicoes.ndim == 3 and posicoes.shape[1:] == (linhas, colunas):
+        celulas = posicoes.reshape(len(posicoes), 1, linhas * colunas) == np.array([1, 2]).reshape(1, 2, 1)
+        return (celulas[:, :, tabela.indices_grid].sum(axis=3),
+                celulas[:, :, colunas // 2::colunas].sum(axis=2))
+    if posicoes.ndim == 2 and posicoes.shape[1] == 2:
+        if tabela.mascaras_bits is None:
+            raise ValueError("máscaras em lote exigem colunas * (linhas + 1) <= 64")
+        mascaras = posicoes.astype(np.uint64, copy=False)
+        return (contarBitsLote(mascaras[:, :, None] & tabela.mascaras_bits),
+                contarBitsLote(mascaras & np.uint64(tabela.mascara_centro)))
+    raise ValueError(f"lote de posições com formato inesperado: {posicoes.shape}")
+
+
+def getMascarasLote(posicoes, linhas=6, colunas=7):
+    """
+    Converte um lote de posições nas máscaras dos dois jogadores.
+
+    Args:
+        posicoes (numpy.ndarray): lote no formato de contarPecasJanelasLote
+        linhas (int): número de linhas do tabuleiro
+        colunas (int): número de colunas do tabuleiro
+
+    Returns:
+        numpy.ndarray: (N, 2) máscaras dos jogadores 1 e 2 no layout do BitBoard; uint64,
+        ou object (inteiros Python) se o tabuleiro não couber em 64 bits
+    """
+    posicoes = np.asarray(posicoes)
+    if posicoes.ndim == 2 and posicoes.shape[1] == 2:
+        return posicoes
+    if posicoes.ndim != 3 or posicoes.shape[1:] != (linhas, colunas):
+        raise ValueError(f"lote de posições com formato inesperado: {posicoes.shape}")
+    tipo = np.uint64 if colunas * (linhas + 1) <= 64 else object
+    bits = np.array([1 << (c * (linhas + 1) + linhas - 1 - l) for l in range(linhas) for c in range(colunas)],
+                    dtype=tipo)
+    celulas = posicoes.reshape(len(posicoes), 1, linhas * colunas) == np.array([1, 2]).reshape(1, 2, 1)
+    return (celulas.astype(tipo) * bits).sum(axis=2, dtype=tipo)
+
+
+def getCaracteristicasLote(posicoes, linhas=6, colunas=7, conectar=4):
+    """
+    Calcula de uma vez, para N posições, tudo o que as avaliações do AgenteIA usam.
+
+    histogramas[i] é getHistogramaJanelas da posição i; centro[i][jogador]
+    é contarPecasColuna(colunas // 2, jogador); vencedores[i] é getVencedor().
+
+    Args:
+        posicoes (numpy.ndarray): lote no formato de contarPecasJanelasLote
+        linhas (int): número de linhas do tabuleiro
+        colunas (int): número de colunas do tabuleiro
+        conectar (int): peças em linha necessárias para vencer
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: histogramas (N, 3, conectar + 1),
+        centro (N, 3) e vencedores (N,); a linha/coluna 0 dos dois primeiros não é usada
+    """
+    contagens, pecas_centro = contarPecasJanelasLote(posicoes, linhas, colunas, conectar)
+    contagens = contagens.astype(np.intp, copy=False)
+    total, tamanhos = len(contagens), conectar + 1
+    base = (np.arange(total) * tamanhos)[:, None]
+
+    histogramas = np.zeros((total, 3, tamanhos), dtype=np.int64)
+    histogramas[:, 1] = np.bincount((base + contagens[:, 0])[contagens[:, 1] == 0],
+                                    minlength=total * tamanhos).reshape(total, tamanhos)
+    histogramas[:, 2] = np.bincount((base + contagens[:, 1])[contagens[:, 0] == 0],
+                                    minlength=total * tamanhos).reshape(total, tamanhos)
+
+    centro = np.zeros((total, 3), dtype=np.int64)
+    centro[:, 1:] = pecas_centro
+
+    vencedores = np.where(histogramas[:, 1, conectar] > 0, 1, np.where(histogramas[:, 2, conectar] > 0, 2, 0))
+    return histogramas, centro, vencedores
@@ -0,0 +1,410 @@
+"""
+Benchmarks reproduzíveis do tabuleiro, das avaliações e da busca.
+
+Um corpus fixo de posições (abertura, meio de jogo e final) é usado para
+medir:
+    - Board/BitBoard: addPeca + removePeca e getVencedor
+    - cada avaliacao* do AgenteIA e a avaliação em lote (avaliarLote)
+    - inferência do modelo aprendido (modelo.ModeloMLP), por posição e em lote
+    - minimaxBasico e minimaxComPoda em profundidades fixas (tempo e nós/s)
+    - buscaComLimiteTempo: tempo até cada profundidade e profundidade alcançada
+    - reaproveitamento entre jogadas: nós até PROFUNDIDADE_PARTIDA ao longo
+      de uma partida fixa, com e sem o estado da jogada anterior
+    - importação de MODULOS_IMPORTACAO em um interpretador novo e criação
+      do pool de processos da busca paralela (custos de inicialização)
+
+O resultado pode ser gravado como baseline (JSON) e comparado depois; a
+comparação aponta as métricas que pioraram além da tolerância e termina
+com código de saída 1 se houver regressões.
+
+Uso:
+    python benchmark.py --saida baseline.json
+    python benchmark.py --comparar baseline.json --tolerancia 0.15
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from agent import AgenteIA
+from board import Board
+from excecoes import TempoEsgotado
+from modelo import ModeloMLP, getNomesCaracteristicas
+
+CORPUS = {
+    "abertura_vazia": "",
+    "abertura": "4453",
+    "meio_jogo_1": "6476735267",
+    "meio_jogo_2": "64345652356351",
+    "final_1": "75764513765722432234576234",
+    "final_2": "76234526336572715245332654632651",
+}
+
+# variantes maiores: (linhas, colunas, conectar, movimentos)
+VARIANTES = {
+    "7x9_conectar5": (7, 9, 5, "55645466373"),
+    "8x10_conectar4": (8, 10, 4, "45546372"),
+}
+
+TAMANHO_LOTE = 1024
+PROFUNDIDADES_PODA = (2, 4)
+TEMPO_BUSCA = 1.0
+PROFUNDIDADE_PARTIDA = 8
+# módulos cujo tempo de importação é medido (pontos de entrada e núcleo do motor)
+MODULOS_IMPORTACAO = ("agent", "solver", "registro", "torneio", "main")
+
+
+def carregarPosicao(movimentos, linhas=6, colunas=7, conectar=4):
+    """
+    Monta um tabuleiro a partir de uma sequência de colunas (1 a 9), começando pelo jogador 1.
+
+    Args:
+        movimentos (str): jogadas, por exemplo "4453"
+        linhas (int): número de linhas do tabuleiro
+        colunas (int): número de colunas do tabuleiro
+        conectar (int): peças em linha necessárias para vencer
+
+    Returns:
+        tuple[Board, int]: (tabuleiro, jogador da vez)
+    """
+    tabuleiro = Board(linhas, colunas, conectar)
+    for i, caractere in enumerate(movimentos):
+        tabuleiro.addPeca(int(caractere) - 1, 1 + i % 2)
+    return tabuleiro, 1 + len(movimentos) % 2
+
+
+def medir(funcao, repeticoes=5, minimo_segundos=0.05):
+    """
+    Mede o tempo por chamada de uma função, com o menor valor entre as repetições.
+
+    O número de chamadas por repetição é calibrado para durar pelo menos
+    `minimo_segundos`, reduzindo o ruído do relógio em funções muito rápidas.
+
+    Returns:
+        float: segundos por chamada
+    """
+    numero = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(numero):
+            funcao()
+        decorrido = time.perf_counter() - inicio
+        if decorrido >= minimo_segundos:
+            break
+        numero *= 2
+
+    melhor = decorrido / numero
+    for _ in range(repeticoes - 1):
+        inicio = time.perf_counter()
+        for _ in range(numero):
+            funcao()
+        melhor = min(melhor, (time.perf_counter() - inicio) / numero)
+    return melhor
+
+
+def metrica(valor, unidade, maior_melhor=False):
+    """Empacota uma medição no formato do arquivo de baseline."""
+    return {"valor": valor, "unidade": unidade, "maior_melhor": maior_melhor}
+
+
+def benchmarkTabuleiro(metricas, repeticoes):
+    """Mede as operações básicas de Board e BitBoard em cada posição do corpus."""
+    for nome, movimentos in CORPUS.items():
+        tabuleiro, jogador = carregarPosicao(movimentos)
+        coluna = tabuleiro.getMovimentosValidos()[0]
+        for representacao, posicao in (("board", tabuleiro), ("bitboard", tabuleiro.toBitBoard())):
+            def jogarDesfazer():
+                posicao.addPeca(coluna, jogador)
+                posicao.removePeca(coluna)
+            metricas[f"{representacao}.add_remove.{nome}"] = metrica(medir(jogarDesfazer, repeticoes), "s")
+            metricas[f"{representacao}.getVencedor.{nome}"] = metrica(medir(posicao.getVencedor, repeticoes), "s")
+        metricas[f"board.calcularVencedor.{nome}"] = metrica(medir(tabuleiro.calcularVencedor, repeticoes), "s")
+
+
+def benchmarkAvaliacao(metricas, repeticoes):
+    """Mede cada função de avaliação sem o cache de janelas entre chamadas, incluindo as VARIANTES."""
+    agente = AgenteIA(3, tamanho_tabela_mb=0)
+    funcoes = {
+        "avaliacaoIniciante": agente.avaliacaoIniciante,
+        "avaliacaoIntermediaria": agente.avaliacaoIntermediaria,
+        "avaliacaoProfissional": agente.avaliacaoProfissional,
+    }
+    posicoes = {nome: carregarPosicao(movimentos)[0] for nome, movimentos in CORPUS.items()}
+    for nome, (linhas, colunas, conectar, movimentos) in VARIANTES.items():
+        posicoes[nome] = carregarPosicao(movimentos, linhas, colunas, conectar)[0]
+    for nome, tabuleiro in posicoes.items():
+        posicao = tabuleiro.toBitBoard()
+        for nome_funcao, funcao in funcoes.items():
+            def avaliar():
+                agente._cache_janelas = (None, None)
+                funcao(posicao)
+            metricas[f"{nome_funcao}.{nome}"] = metrica(medir(avaliar, repeticoes), "s")
+
+
+def benchmarkAvaliacaoLote(metricas, repeticoes):
+    """Mede avaliarLote sobre TAMANHO_LOTE posições do corpus, como grids e como máscaras (tempo por posição)."""
+    lotes = getLotesCorpus()
+    for nivel in (2, 3):
+        agente = AgenteIA(nivel, tamanho_tabela_mb=0)
+        for formato, lote in lotes.items():
+            tempo = medir(lambda: agente.avaliarLote(lote), repeticoes)
+            metricas[f"avaliarLote.n{nivel}.{formato}.por_posicao"] = metrica(tempo / TAMANHO_LOTE, "s")
+
+
+def getLotesCorpus():
+    """Monta TAMANHO_LOTE posições do corpus como grids e como máscaras."""
+    tabuleiros = [carregarPosicao(movimentos)[0] for movimentos in CORPUS.values()]
+    indices = np.arange(TAMANHO_LOTE) % len(tabuleiros)
+    return {
+        "grids": np.array([tabuleiro.grid for tabuleiro in tabuleiros])[indices],
+        "mascaras": np.array([tabuleiro.toBitBoard().posicoes[1:] for tabuleiro in tabuleiros],
+                             dtype=np.uint64)[indices],
+    }
+
+
+def benchmarkModelo(metricas, repeticoes):
+    """Mede a avaliação com um ModeloMLP (pesos aleatórios, 32 neurônios) por posição e em lote."""
+    caracteristicas = len(getNomesCaracteristicas())
+    agente = AgenteIA(3, tamanho_tabela_mb=0)
+    agente.modelo = ModeloMLP(np.zeros(caracteristicas), np.ones(caracteristicas))
+    for nome, movimentos in CORPUS.items():
+        posicao = carregarPosicao(movimentos)[0].toBitBoard()
+
+        def avaliar():
+            agente._cache_janelas = (None, None)
+            agente.avaliacaoModelo(posicao)
+        metricas[f"avaliacaoModelo.{nome}"] = metrica(medir(avaliar, repeticoes), "s")
+    for formato, lote in getLotesCorpus().items():
+        tempo = medir(lambda: agente.avaliarLote(lote), repeticoes)
+        metricas[f"avaliarLote.modelo.{formato}.por_posicao"] = metrica(tempo / TAMANHO_LOTE, "s")
+
+
+def medirBusca(metricas, prefixo, nivel, executar):
+    """Executa uma busca uma vez com agente novo e registra tempo, nós e nós/s."""
+    agente = AgenteIA(nivel)
+    inicio = time.perf_counter()
+    executar(agente)
+    decorrido = time.perf_counter() - inicio
+    metricas[f"{prefixo}.tempo"] = metrica(decorrido, "s")
+    metricas[f"{prefixo}.nos"] = metrica(agente.nos_avaliados, "nos")
+    metricas[f"{prefixo}.nos_por_segundo"] = metrica(agente.nos_avaliados / decorrido, "nos/s", True)
+
+
+def benchmarkBusca(metricas):
+    """Mede minimaxBasico e minimaxComPoda em profundidades fixas."""
+    for nome, movimentos in CORPUS.items():
+        posicao = carregarPosicao(movimentos)[0].toBitBoard()
+        medirBusca(metricas, f"minimaxBasico.p3.{nome}", 1,
+                   lambda agente: agente.minimaxBasico(posicao, 3, True))
+        for nivel in (2, 3):
+            for profundidade in PROFUNDIDADES_PODA:
+                medirBusca(metricas, f"minimaxComPoda.n{nivel}.p{profundidade}.{nome}", nivel,
+                           lambda agente: agente.minimaxComPoda(posicao, profundidade, -np.inf, np.inf, True))
+
+
+def benchmarkAprofundamento(metricas, tempo):
+    """
+    Mede o aprofundamento iterativo: tempo acumulado até cada profundidade e profundidade alcançada.
+    """
+    for nome, movimentos in CORPUS.items():
+        posicao = carregarPosicao(movimentos)[0].toBitBoard()
+
+        agente = AgenteIA(2)
+        inicio = time.perf_counter()
+        for profundidade in range(1, 15):
+            agente.minimaxComPoda(posicao, profundidade, -np.inf, np.inf, True)
+            decorrido = time.perf_counter() - inicio
+            metricas[f"tempo_ate_profundidade.p{profundidade}.{nome}"] = metrica(decorrido, "s")
+            if decorrido > tempo:
+                break
+
+        agente = AgenteIA(2)
+        agente.tempo_maximo = tempo
+        agente.buscaComLimiteTempo(posicao, time.perf_counter())
+        metricas[f"buscaComLimiteTempo.profundidade.{nome}"] = metrica(
+            agente.profundidade_alcancada, "profundidade", True)
+        metricas[f"buscaComLimiteTempo.nos.{nome}"] = metrica(agente.nos_avaliados, "nos", True)
+
+
+def benchmarkPartida(metricas):
+    """
+    Mede o reaproveitamento da busca entre as jogadas de uma partida.
+
+    As jogadas de final_2 do corpus são refeitas e, em cada vez da Maquina
+    (jogador 2), o aprofundamento iterativo é interrompido ao completar
+    PROFUNDIDADE_PARTIDA. "fria" é a busca sem o estado da jogada anterior
+    nem janela de aspiração (só a tabela de transposição é mantida), "quente" a padrão.
+    """
+    movimentos = CORPUS["final_2"]
+
+    def parar(agente, iteracao):
+        if iteracao["profundidade"] >= PROFUNDIDADE_PARTIDA:
+            raise TempoEsgotado()
+
+    for nome, reaproveitar in (("fria", False), ("quente", True)):
+        agente = AgenteIA(2)
+        agente.tempo_maximo = 60.0
+        agente.limite_final = 0
+        agente.reaproveitar_busca = reaproveitar
+        if not reaproveitar:
+            agente.janela_aspiracao = 0
+        agente.adicionarGancho("fim_iteracao", parar)
+        nos = 0
+        inicio = time.perf_counter()
+        for i in range(1, len(movimentos) - PROFUNDIDADE_PARTIDA, 2):
+            agente.getMelhorJogada(carregarPosicao(movimentos[:i])[0])
+            nos += agente.nos_avaliados
+        metricas[f"partida.p{PROFUNDIDADE_PARTIDA}.{nome}.tempo"] = metrica(time.perf_counter() - inicio, "s")
+        metricas[f"partida.p{PROFUNDIDADE_PARTIDA}.{nome}.nos"] = metrica(nos, "nos")
+
+
+def medirImportacao(modulo, repeticoes):
+    """
+    Mede o tempo de um interpretador novo que só importa o módulo (menor valor entre as repetições).
+
+    Args:
+        modulo (str | None): módulo importado; None mede só a inicialização do interpretador
+        repeticoes (int): processos executados
+
+    Returns:
+        float: segundos
+    """
+    comando = [sys.executable, "-c", f"import {modulo}" if modulo else "pass"]
+    diretorio = os.path.dirname(os.path.abspath(__file__))
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run(comando, cwd=diretorio, check=True)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def benchmarkInicializacao(metricas, repeticoes):
+    """
+    Mede os custos de inicialização: importação de cada módulo e criação do pool da busca paralela.
+
+    O tempo de importação desconta o do interpretador vazio. O pool é medido
+    da criação até os dois processos responderem, com o servidor de fork já
+    em execução (ver processos.py); a primeira criação, que o inicia, fica
+    em `pool.inicializacao.primeira`.
+    """
+    interpretador = medirImportacao(None, repeticoes)
+    metricas["importacao.interpretador"] = metrica(interpretador, "s")
+    for modulo in MODULOS_IMPORTACAO:
+        metricas[f"importacao.{modulo}"] = metrica(
+            max(medirImportacao(modulo, repeticoes) - interpretador, 0.0), "s")
+
+    def criarPool():
+        agente = AgenteIA(2, num_processos=2)
+        try:
+            pool = agente.getPool()
+            for futuro in [pool.submit(time.sleep, 0) for _ in range(2)]:
+                futuro.result()
+        finally:
+            agente.fechar()
+
+    inicio = time.perf_counter()
+    criarPool()
+    metricas["pool.inicializacao.primeira"] = metrica(time.perf_counter() - inicio, "s")
+    metricas["pool.inicializacao"] = metrica(medir(criarPool, repeticoes, minimo_segundos=0), "s")
+
+
+def executarBenchmarks(repeticoes=5, tempo_busca=TEMPO_BUSCA):
+    """
+    Executa todos os benchmarks.
+
+    Args:
+        repeticoes (int): repetições das microbenchmarks (vale o menor tempo)
+        tempo_busca (float): orçamento de tempo do aprofundamento iterativo
+
+    Returns:
+        dict: {"ambiente": {...}, "metricas": {nome: {"valor", "unidade", "maior_melhor"}}}
+    """
+    metricas = {}
+    benchmarkInicializacao(metricas, repeticoes)
+    benchmarkTabuleiro(metricas, repeticoes)
+    benchmarkAvaliacao(metricas, repeticoes)
+    benchmarkAvaliacaoLote(metricas, repeticoes)
+    benchmarkModelo(metricas, repeticoes)
+    benchmarkBusca(metricas)
+    benchmarkAprofundamento(metricas, tempo_busca)
+    benchmarkPartida(metricas)
+    return {
+        "ambiente": {
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "plataforma": platform.platform(),
+            "processador": platform.processor(),
+        },
+        "metricas": metricas,
+    }
+
+
+def compararComBaseline(atual, baseline, tolerancia=0.15):
+    """
+    Compara duas execuções e lista as métricas que pioraram além da tolerância.
+
+    Args:
+        atual (dict): resultado de executarBenchmarks
+        baseline (dict): resultado anterior carregado do JSON
+        tolerancia (float): variação relativa aceita (0.15 = 15%)
+
+    Returns:
+        list[tuple[str, float, float, float]]: (métrica, baseline, atual, variação relativa)
+    """
+    regressoes = []
+    for nome, base in baseline["metricas"].items():
+        medida = atual["metricas"].get(nome)
+        if medida is None or base["valor"] == 0:
+            continue
+        variacao = (medida["valor"] - base["valor"]) / abs(base["valor"])
+        if base["maior_melhor"]:
+            variacao = -variacao
+        if variacao > tolerancia:
+            regressoes.append((nome, base["valor"], medida["valor"], variacao))
+    return sorted(regressoes, key=lambda regressao: -regressao[3])
+
+
+def imprimirMetricas(resultado):
+    """Exibe as métricas em formato de tabela."""
+    for nome, medida in sorted(resultado["metricas"].items()):
+        valor = medida["valor"]
+        if medida["unidade"] == "s":
+            texto = f"{valor * 1e6:12.2f} us" if valor < 1e-2 else f"{valor:12.4f} s"
+        else:
+            texto = f"{valor:12.1f} {medida['unidade']}"
+        print(f"{nome:<60} {texto}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks do tabuleiro, das avaliações e da busca.")
+    parser.add_argument("--saida", default=None, help="grava o resultado como baseline JSON")
+    parser.add_argument("--comparar", default=None, help="baseline JSON para detectar regressões")
+    parser.add_argument("--tolerancia", type=float, default=0.15)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--tempo", type=float, default=TEMPO_BUSCA, help="orçamento do aprofundamento iterativo")
+    args = parser.parse_args()
+
+    resultado = executarBenchmarks(args.repeticoes, args.tempo)
+    imprimirMetricas(resultado)
+
+    if args.saida:
+        with open(args.saida, "w") as arquivo:
+            json.dump(resultado, arquivo, indent=2, sort_keys=True)
+
+    if args.comparar:
+        with open(args.comparar) as arquivo:
+            baseline = json.load(arquivo)
+        regressoes = compararComBaseline(resultado, baseline, args.tolerancia)
+        if regressoes:
+            print(f"\n{len(regressoes)} regressões (tolerância {args.tolerancia:.0%}):")
+            for nome, base, valor, variacao in regressoes:
+                print(f"  {nome}: {base:.6g} -> {valor:.6g} ({variacao:+.1%})")
+            sys.exit(1)
+        print("\nNenhuma regressão encontrada.")
@@ -0,0 +1,435 @@
+from posicao import Posicao
+from zobrist import getChavesZobrist, getChavesZobristEspelhadas
+
+
+def getCasasAlinhadas(atual, altura_bits, conectar=4):
+    """
+    Calcula as casas que completariam `conectar` peças em linha para a máscara `atual`.
+
+    Para cada direção d e cada divisão da linha em `antes` peças de um lado
+    e `conectar - 1 - antes` do outro, a casa é marcada se as duas partes
+    estão completas. Para conectar == 4 as expressões ficam desenroladas,
+    como no resolvedor original.
+
+    Só usa deslocamentos e operações bit a bit, então também aceita um
+    array NumPy de máscaras (uint64, ou object com inteiros Python) e
+    calcula as casas de todas de uma vez.
+
+    Args:
+        atual (int | numpy.ndarray): máscara de um jogador no layout do BitBoard
+        altura_bits (int): bits por coluna (linhas + 1)
+        conectar (int): peças em linha necessárias para vencer
+
+    Returns:
+        int: máscara das casas (inclui casas ocupadas e fora do tabuleiro;
+        quem chama filtra pelas casas vazias ou jogáveis)
+    """
+    if conectar == 4:
+        r = (atual << 1) & (atual << 2) & (atual << 3)
+        for direcao in (altura_bits, altura_bits - 1, altura_bits + 1):
+            p = (atual << direcao) & (atual << (2 * direcao))
+            r |= p & (atual << (3 * direcao))
+            r |= p & (atual >> direcao)
+            p = (atual >> direcao) & (atual >> (2 * direcao))
+            r |= p & (atual << direcao)
+            r |= p & (atual >> (3 * direcao))
+        return r
+
+    r = 0
+    todos = atual | ~atual  # todos os bits ligados, no tipo de `atual`
+    for direcao in (1, altura_bits, altura_bits - 1, altura_bits + 1):
+        abaixo = [todos]
+        acima = [todos]
+        for passo in range(1, conectar):
+            abaixo.append(abaixo[-1] & (atual << (passo * direcao)))
+            acima.append(acima[-1] & (atual >> (passo * direcao)))
+        # na vertical não há peças acima da casa livre
+        divisoes = (conectar - 1,) if direcao == 1 else range(conectar)
+        for antes in divisoes:
+            r |= abaixo[antes] & acima[conectar - 1 - antes]
+    return r
+
+
+def temSequencia(mascara, altura_bits, conectar=4):
+    """
+    Verifica se uma máscara contém `conectar` bits alinhados.
+
+    Para cada direção d (vertical, horizontal e as duas diagonais),
+    m = mascara & (mascara >> d) marca pares consecutivos; cada passo
+    m & (m >> k*d) dobra o comprimento das sequências marcadas, e o
+    último passo completa o comprimento exato. Para quatro em linha
+    são só dois passos por direção.
+
+    Args:
+        mascara (int): máscara de bits no layout do BitBoard
+        altura_bits (int): bits por coluna (linhas + 1)
+        conectar (int): comprimento da sequência procurada
+
+    Returns:
+        bool: True se há `conectar` bits consecutivos em alguma direção
+    """
+    for direcao in (1, altura_bits, altura_bits - 1, altura_bits + 1):
+        m = mascara
+        comprimento = 1
+        while 2 * comprimento < conectar:
+            m &= m >> (comprimento * direcao)
+            comprimento *= 2
+        if m & (m >> ((conectar - comprimento) * direcao)):
+            return True
+    return False
+
+
+class BitBoard:
+    """
+    Representação compacta do tabuleiro usada no caminho quente da busca.
+
+    Cada jogador é guardado como um inteiro (máscara de bits) e cada coluna
+    tem sua altura atual. A coluna c ocupa os bits c*(linhas+1) até
+    c*(linhas+1)+linhas-1, da base para o topo; o bit extra no topo de cada
+    coluna fica sempre vazio e funciona como sentinela, impedindo que os
+    deslocamentos "vazem" de uma coluna para a outra.
+
+    A interface espelha a de Board (addPeca, removePeca, getVencedor, ...),
+    então o AgenteIA pode buscar em qualquer uma das duas representações.
+    O atributo `chave` guarda o hash de Zobrist da posição, `chave_espelho`
+    o da posição refletida (ver getChaveCanonica) e `conectar` o número de
+    peças em linha que vence a partida.
+
+    `ameacas[jogador]` é a máscara das casas vazias que completariam uma
+    linha do jogador (ver ameacas.py), mantida a cada addPeca/removePeca:
+    só as ameaças de quem jogou são recalculadas, as do outro perdem a casa
+    ocupada. Vencer é jogar em uma das próprias ameaças.
+    """
+
+    __slots__ = ("linhas", "colunas", "conectar", "altura_bits", "posicoes", "alturas",
+                 "movimentos", "vencedor", "_vencedores", "chave", "chave_espelho", "_zobrist",
+                 "_zobrist_espelho", "_grid_cache", "ameacas", "_ameacas_anteriores", "mascara_casas")
+
+    def __init__(self, linhas=6, colunas=7, conectar=4):
+        """
+        Inicializa um bitboard vazio.
+
+        Args:
+            linhas (int): número de linhas do tabuleiro (padrão: 6)
+            colunas (int): número de colunas do tabuleiro (padrão: 7)
+            conectar (int): peças em linha necessárias para vencer (padrão: 4)
+        """
+        self.linhas = linhas
+        self.colunas = colunas
+        self.conectar = conectar
+        self.altura_bits = linhas + 1
+        self.posicoes = [0, 0, 0]
+        self.alturas = [0] * colunas
+        self.movimentos = 0
+        self.vencedor = 0
+        self._vencedores = []
+        self.chave = 0
+        self.chave_espelho = 0
+        self._zobrist = getChavesZobrist(linhas, colunas)
+        self._zobrist_espelho = getChavesZobristEspelhadas(linhas, colunas)
+        self._grid_cache = None
+        self.ameacas = [0, 0, 0]
+        self._ameacas_anteriores = []
+        self.mascara_casas = sum(((1 << linhas) - 1) << (c * self.altura_bits) for c in range(colunas))
+
+    @classmethod
+    def fromMascaras(cls, linhas, colunas, mascara_jogador, mascara_maquina, conectar=4):
+        """
+        Reconstrói um bitboard a partir das máscaras dos dois jogadores.
+
+        Útil para enviar posições entre processos ou gravá-las em disco
+        como dois inteiros.
+
+        Args:
+            linhas (int): número de linhas do tabuleiro
+            colunas (int): número de colunas do tabuleiro
+            mascara_jogador (int): máscara do jogador 1
+            mascara_maquina (int): máscara do jogador 2
+            conectar (int): peças em linha necessárias para vencer
+
+        Returns:
+            BitBoard: posição equivalente
+        """
+        bitboard = cls(linhas, colunas, conectar)
+        for coluna in range(colunas):
+            base = coluna * bitboard.altura_bits
+            for altura in range(linhas):
+                bit = 1 << (base + altura)
+                if mascara_jogador & bit:
+                    bitboard.addPeca(coluna, 1)
+                elif mascara_maquina & bit:
+                    bitboard.addPeca(coluna, 2)
+                else:
+                    break
+        return bitboard
+
+    def getMascaras(self):
+        """
+        Retorna a posição como tupla simples, no formato aceito por fromMascaras.
+
+        Returns:
+            tuple[int, int, int, int]: (linhas, colunas, máscara do jogador 1, máscara do jogador 2)
+        """
+        return self.linhas, self.colunas, self.posicoes[1], self.posicoes[2]
+
+    @classmethod
+    def fromPosicao(cls, posicao):
+        """
+        Cria um bitboard a partir de uma Posicao compacta.
+
+        Args:
+            posicao (Posicao): posição imutável
+
+        Returns:
+            BitBoard: posição equivalente
+        """
+        return cls.fromMascaras(*posicao.getMascaras(), conectar=posicao.conectar)
+
+    def toPosicao(self):
+        """
+        Converte o bitboard para a Posicao compacta.
+
+        Returns:
+            Posicao: posição equivalente ao estado atual
+        """
+        return Posicao.fromMascaras(*self.getMascaras(), conectar=self.conectar)
+
+    def copia(self):
+        """
+        Retorna uma cópia independente do bitboard.
+
+        Returns:
+            BitBoard: nova instância com o mesmo estado
+        """
+        nova = BitBoard.__new__(BitBoard)
+        nova.linhas = self.linhas
+        nova.colunas = self.colunas
+        nova.conectar = self.conectar
+        nova.altura_bits = self.altura_bits
+        nova.posicoes = self.posicoes[:]
+        nova.alturas = self.alturas[:]
+        nova.movimentos = self.movimentos
+        nova.vencedor = self.vencedor
+        nova._vencedores = self._vencedores[:]
+        nova.chave = self.chave
+        nova.chave_espelho = self.chave_espelho
+        nova._zobrist = self._zobrist
+        nova._zobrist_espelho = self._zobrist_espelho
+        nova._grid_cache = None
+        nova.ameacas = self.ameacas[:]
+        nova._ameacas_anteriores = self._ameacas_anteriores[:]
+        nova.mascara_casas = self.mascara_casas
+        return nova
+
+    def isMovimentoValido(self, coluna):
+        """
+        Verifica se uma jogada em uma coluna é válida.
+
+        Args:
+            coluna (int): índice da coluna a verificar
+
+        Returns:
+            bool: True se a coluna existe e não está cheia
+        """
+        return 0 <= coluna < self.colunas and self.alturas[coluna] < self.linhas
+
+    def addPeca(self, coluna, jogador):
+        """
+        Adiciona uma peça em O(1) usando a altura da coluna.
+
+        A jogada vence se a casa era uma ameaça de quem jogou; o resultado
+        fica guardado em `vencedor` até a jogada ser desfeita.
+
+        Args:
+            coluna (int): índice da coluna
+            jogador (int): identificador do jogador (1 = Jogador, 2 = Maquina)
+
+        Returns:
+            bool: True se a peça foi colocada, False se o movimento for inválido
+        """
+        if not self.isMovimentoValido(coluna):
+            return False
+        indice = coluna * self.altura_bits + self.alturas[coluna]
+        bit = 1 << indice
+        self.posicoes[jogador] |= bit
+        self.chave ^= self._zobrist[jogador][indice]
+        self.chave_espelho ^= self._zobrist_espelho[jogador][indice]
+        self.alturas[coluna] += 1
+        self.movimentos += 1
+        self._vencedores.append(self.vencedor)
+        ameacas = self.ameacas
+        if self.vencedor != 1 and ameacas[jogador] & bit:
+            self.vencedor = min(jogador, self.vencedor or jogador)
+        self._ameacas_anteriores.append((ameacas[1], ameacas[2]))
+        ameacas[jogador] = (getCasasAlinhadas(self.posicoes[jogador], self.altura_bits, self.conectar)
+                            & (self.mascara_casas ^ (self.posicoes[1] | self.posicoes[2])))
+        ameacas[3 - jogador] &= ~bit
+        self._grid_cache = None
+        return True
+
+    def removePeca(self, coluna):
+        """
+        Remove em O(1) a peça do topo da coluna especificada.
+
+        Deve desfazer a última jogada feita (ordem de pilha, como na busca),
+        pois o vencedor anterior é restaurado do histórico.
+
+        Args:
+            coluna (int): índice da coluna
+        """
+        if self.alturas[coluna] == 0:
+            return
+        self.alturas[coluna] -= 1
+        indice = coluna * self.altura_bits + self.alturas[coluna]
+        bit = 1 << indice
+        jogador = 1 if self.posicoes[1] & bit else 2
+        self.posicoes[jogador] ^= bit
+        self.chave ^= self._zobrist[jogador][indice]
+        self.chave_espelho ^= self._zobrist_espelho[jogador][indice]
+        self.movimentos -= 1
+        self.vencedor = self._vencedores.pop()
+        self.ameacas[1], self.ameacas[2] = self._ameacas_anteriores.pop()
+        self._grid_cache = None
+
+    def getMovimentosValidos(self):
+        """
+        Retorna uma lista com todas as colunas válidas para jogada.
+
+        Returns:
+            list[int]: índices das colunas válidas
+        """
+        linhas = self.linhas
+        return [c for c, altura in enumerate(self.alturas) if altura < linhas]
+
+    def isTabuleiroCompleto(self):
+        """
+        Verifica se o tabuleiro está completamente cheio.
+
+        Returns:
+            bool: True se não há mais movimentos válidos
+        """
+        return self.movimentos == self.linhas * self.colunas
+
+    def getChaveCanonica(self):
+        """
+        Dobra a posição com seu espelho: o menor dos dois hashes de Zobrist.
+
+        Returns:
+            tuple[int, bool]: (chave canônica, True se a chave é a do espelho,
+            caso em que as colunas gravadas com ela estão refletidas)
+        """
+        if self.chave_espelho < self.chave:
+            return self.chave_espelho, True
+        return self.chave, False
+
+    def isSimetrico(self):
+        """
+        Verifica se a posição é igual ao próprio espelho (como o tabuleiro vazio).
+
+        Returns:
+            bool: True se as colunas c e colunas - 1 - c são equivalentes
+        """
+        return self.chave == self.chave_espelho
+
+    def getVencedor(self):
+        """
+        Retorna o vencedor mantido incrementalmente por addPeca/removePeca.
+
+        Returns:
+            int: identificador do vencedor (0, 1 ou 2)
+        """
+        return self.vencedor
+
+    def getColunasVencedoras(self, jogador):
+        """
+        Lista as colunas em que `jogador` completaria a linha agora.
+
+        As ameaças do jogador (mantidas em `ameacas`) são filtradas pela casa
+        jogável de cada coluna.
+
+        Args:
+            jogador (int): 1 ou 2
+
+        Returns:
+            list[int]: colunas com vitória imediata, em ordem crescente
+        """
+        altura = self.altura_bits
+        r = self.ameacas[jogador]
+        linhas = self.linhas
+        return [c for c, a in enumerate(self.alturas) if a < linhas and (r >> (c * altura + a)) & 1]
+
+    def temSequencia(self, mascara):
+        """
+        Verifica se uma máscara contém `conectar` bits alinhados (ver bitboard.temSequencia).
+
+        Args:
+            mascara (int): máscara de bits de um jogador
+
+        Returns:
+            bool: True se há `conectar` peças consecutivas
+        """
+        return temSequencia(mascara, self.altura_bits, self.conectar)
+
+    def contarPecasColuna(self, coluna, jogador):
+        """
+        Conta as peças de um jogador em uma coluna.
+
+        Args:
+            coluna (int): índice da coluna
+            jogador (int): identificador do jogador (1 ou 2)
+
+        Returns:
+            int: quantidade de peças do jogador na coluna
+        """
+        mascara_coluna = ((1 << self.linhas) - 1) << (coluna * self.altura_bits)
+        return bin(self.posicoes[jogador] & mascara_coluna).count("1")
+
+    def getJogador(self, linha, coluna):
+        """
+        Retorna o dono da célula (linha, coluna) no sistema de coordenadas de Board.
+
+        Args:
+            linha (int): linha no grid (0 = topo)
+            coluna (int): índice da coluna
+
+        Returns:
+            int: 0 se vazia, 1 ou 2 conforme o jogador
+        """
+        bit = 1 << (coluna * self.altura_bits + self.linhas - 1 - linha)
+        if self.posicoes[1] & bit:
+            return 1
+        if self.posicoes[2] & bit:
+            return 2
+        return 0
+
+    @property
+    def grid(self):
+        """
+        Matriz NumPy equivalente a Board.grid, montada sob demanda.
+
+        O resultado fica em cache até a próxima alteração do bitboard, para
+        que as heurísticas baseadas em grid possam ler várias células sem
+        reconstruir a matriz a cada acesso.
+
+        Returns:
+            numpy.ndarray: matriz linhas x colunas (0 = topo)
+        """
+        if self._grid_cache is None:
+            import numpy as np
+            grid = np.zeros((self.linhas, self.colunas), dtype=np.int8)
+            for coluna in range(self.colunas):
+                base = coluna * self.altura_bits
+                for altura in range(self.alturas[coluna]):
+                    bit = 1 << (base + altura)
+                    grid[self.linhas - 1 - altura][coluna] = 1 if self.posicoes[1] & bit else 2
+            self._grid_cache = grid
+        return self._grid_cache
+
+    def getTabuleiro(self):
+        """
+        Retorna uma cópia do estado atual em formato de matriz.
+
+        Returns:
+            numpy.ndarray: matriz representando o estado atual do tabuleiro
+        """
+        return self.grid.copy()
@@ -1,5 +1,10 @@
 import numpy as np
 
+from bitboard import BitBoard
+from janelas import getTabelaJanelas
+from posicao import Posicao
+from zobrist import getChavesZobrist, getChavesZobristEspelhadas
+
 class Board:
     """
     Classe responsável por representar e manipular o tabuleiro do jogo.
@@ -8,28 +13,127 @@ class Board:
         - 0 representa uma célula vazia
         - 1 representa uma peça do jogador
         - 2 representa uma peça da Maquina
+
+    Vence quem alinhar `conectar` peças (4 por padrão); qualquer formato
+    linhas x colunas é aceito.
+
+    O atributo `chave` guarda o hash de Zobrist da posição e `chave_espelho` o
+    da posição refletida, atualizados a cada addPeca/removePeca. A matriz usa int8 (um byte por célula); para guardar
+    posições em massa, use toPosicao(), que cabe em um único inteiro.
     """
 
-    def __init__(self, linhas=6, colunas=7):
+    __slots__ = ("linhas", "colunas", "conectar", "grid", "ultimaJogadaVenceu", "_vencedor",
+                 "_historico", "chave", "chave_espelho", "_zobrist", "_zobrist_espelho")
+
+    def __init__(self, linhas=6, colunas=7, conectar=4):
         """
         Inicializa o tabuleiro com o número especificado de linhas e colunas.
 
         Args:
             linhas (int): número de linhas do tabuleiro (padrão: 6)
             colunas (int): número de colunas do tabuleiro (padrão: 7)
+            conectar (int): peças em linha necessárias para vencer (padrão: 4)
         """
         self.linhas = linhas
         self.colunas = colunas
-        self.grid = np.zeros((linhas, colunas), dtype=int)
+        self.conectar = conectar
+        self.grid = np.zeros((linhas, colunas), dtype=np.int8)
+        self.ultimaJogadaVenceu = False
+        self._vencedor = 0
+        self._historico = []
+        self.chave = 0
+        self.chave_espelho = 0
+        self._zobrist = getChavesZobrist(linhas, colunas)
+        self._zobrist_espelho = getChavesZobristEspelhadas(linhas, colunas)
+
+    @classmethod
+    def fromBitBoard(cls, bitboard):
+        """
+        Cria um tabuleiro a partir de um BitBoard.
+
+        Args:
+            bitboard (BitBoard): posição em representação de bits
+
+        Returns:
+            Board: novo tabuleiro com o mesmo estado
+        """
+        tabuleiro = cls(bitboard.linhas, bitboard.colunas, bitboard.conectar)
+        tabuleiro.grid = bitboard.getTabuleiro()
+        tabuleiro._vencedor = bitboard.getVencedor()
+        tabuleiro.chave = bitboard.chave
+        tabuleiro.chave_espelho = bitboard.chave_espelho
+        return tabuleiro
+
+    @classmethod
+    def fromPosicao(cls, posicao):
+        """
+        Cria um tabuleiro a partir de uma Posicao compacta.
+
+        Args:
+            posicao (Posicao): posição imutável
+
+        Returns:
+            Board: novo tabuleiro com o mesmo estado
+        """
+        tabuleiro = cls(posicao.linhas, posicao.colunas, posicao.conectar)
+        tabuleiro.grid = posicao.getGrid()
+        tabuleiro.invalidarCache()
+        return tabuleiro
+
+    def toPosicao(self):
+        """
+        Converte o tabuleiro para a Posicao compacta (imutável, com hash e igualdade).
+
+        Returns:
+            Posicao: posição equivalente ao estado atual
+        """
+        return Posicao.fromGrid(self.grid, self.conectar)
+
+    def copia(self):
+        """
+        Retorna uma cópia independente do tabuleiro.
+
+        Returns:
+            Board: novo tabuleiro com o mesmo estado
+        """
+        tabuleiro = Board(self.linhas, self.colunas, self.conectar)
+        tabuleiro.grid = self.grid.copy()
+        tabuleiro.ultimaJogadaVenceu = self.ultimaJogadaVenceu
+        tabuleiro._vencedor = self._vencedor
+        tabuleiro._historico = self._historico[:]
+        tabuleiro.chave = self.chave
+        tabuleiro.chave_espelho = self.chave_espelho
+        return tabuleiro
+
+    def toBitBoard(self):
+        """
+        Converte o tabuleiro para a representação em bits usada pela busca.
+
+        Returns:
+            BitBoard: posição equivalente ao estado atual
+        """
+        bitboard = BitBoard(self.linhas, self.colunas, self.conectar)
+        for coluna in range(self.colunas):
+            for linha in range(self.linhas - 1, -1, -1):
+                jogador = self.grid[linha][coluna]
+                if jogador == 0:
+                    break
+                bitboard.addPeca(coluna, int(jogador))
+        return bitboard
 
     def getTabuleiro(self):
         """
-        Retorna uma cópia do estado atual do tabuleiro.
+        Retorna o estado atual do tabuleiro como uma visão somente leitura.
+
+        Não há cópia: a visão acompanha as próximas jogadas. Quem precisar
+        de um retrato fixo deve chamar .copy() no resultado.
 
         Returns:
             numpy.ndarray: matriz representando o estado atual do tabuleiro
         """
-        return self.grid.copy()
+        visao = self.grid.view()
+        visao.flags.writeable = False
+        return visao
 
     def isMovimentoValido(self, coluna):
         """
@@ -47,6 +151,10 @@ class Board:
         """
         Adiciona uma peça do jogador especificado na coluna informada.
 
+        Após colocar a peça, apenas as quatro linhas que passam pela célula
+        são verificadas; o resultado fica em `ultimaJogadaVenceu` e o
+        vencedor em cache é atualizado sem varrer o tabuleiro.
+
         Args:
             coluna (int): índice da coluna onde a peça será colocada
             jogador (int): identificador do jogador (1 = Jogador, 2 = Maquina)
@@ -59,6 +167,13 @@ class Board:
         for linha in range(self.linhas - 1, -1, -1):
             if self.grid[linha][coluna] == 0:
                 self.grid[linha][coluna] = jogador
+                indice = self.getIndiceCelula(linha, coluna)
+                self.chave ^= self._zobrist[jogador][indice]
+                self.chave_espelho ^= self._zobrist_espelho[jogador][indice]
+                self.ultimaJogadaVenceu = self.verificaJogada(linha, coluna, jogador)
+                self._historico.append((coluna, self._vencedor))
+                if self.ultimaJogadaVenceu and self._vencedor is not None and self._vencedor != 1:
+                    self._vencedor = min(jogador, self._vencedor or jogador)
                 return True
         return False
 
@@ -66,14 +181,41 @@ class Board:
         """
         Remove a peça mais alta (primeira de cima para baixo) da coluna especificada.
 
+        Se a remoção desfaz a última jogada, o vencedor anterior é restaurado
+        do histórico; caso contrário o cache é invalidado e o próximo
+        getVencedor volta a varrer o tabuleiro.
+
         Args:
             coluna (int): índice da coluna
         """
         for linha in range(self.linhas):
             if self.grid[linha][coluna] != 0:
+                jogador = int(self.grid[linha][coluna])
+                indice = self.getIndiceCelula(linha, coluna)
+                self.chave ^= self._zobrist[jogador][indice]
+                self.chave_espelho ^= self._zobrist_espelho[jogador][indice]
                 self.grid[linha][coluna] = 0
+                if self._historico and self._historico[-1][0] == coluna:
+                    self._vencedor = self._historico.pop()[1]
+                else:
+                    self._historico.clear()
+                    self._vencedor = None
+                self.ultimaJogadaVenceu = False
                 break
 
+    def getIndiceCelula(self, linha, coluna):
+        """
+        Converte (linha, coluna) do grid para o índice de célula do BitBoard.
+
+        Args:
+            linha (int): linha no grid (0 = topo)
+            coluna (int): índice da coluna
+
+        Returns:
+            int: índice usado pelas máscaras e pelas chaves de Zobrist
+        """
+        return coluna * (self.linhas + 1) + self.linhas - 1 - linha
+
     def getMovimentosValidos(self):
         """
         Retorna uma lista com todas as colunas válidas para jogada.
@@ -83,6 +225,19 @@ class Board:
         """
         return [c for c in range(self.colunas) if self.isMovimentoValido(c)]
 
+    def contarPecasColuna(self, coluna, jogador):
+        """
+        Conta as peças de um jogador em uma coluna.
+
+        Args:
+            coluna (int): índice da coluna
+            jogador (int): identificador do jogador (1 ou 2)
+
+        Returns:
+            int: quantidade de peças do jogador na coluna
+        """
+        return int(np.count_nonzero(self.grid[:, coluna] == jogador))
+
     def isTabuleiroCompleto(self):
         """
         Verifica se o tabuleiro está completamente cheio.
@@ -92,10 +247,29 @@ class Board:
         """
         return len(self.getMovimentosValidos()) == 0
 
+    def getChaveCanonica(self):
+        """
+        Dobra a posição com seu espelho: o menor dos dois hashes de Zobrist.
+
+        Returns:
+            tuple[int, bool]: (chave canônica, True se a chave é a do espelho)
+        """
+        if self.chave_espelho < self.chave:
+            return self.chave_espelho, True
+        return self.chave, False
+
+    def isSimetrico(self):
+        """Verifica se a posição é igual ao próprio espelho."""
+        return self.chave == self.chave_espelho
+
     def getVencedor(self):
         """
         Determina se há um vencedor no tabuleiro.
 
+        O resultado mantido por addPeca/removePeca é usado quando disponível;
+        a varredura completa só acontece quando o cache foi invalidado
+        (por exemplo, após alterar `grid` diretamente e chamar invalidarCache).
+
         Retorna:
             0: se não houver vencedor
             1: se o jogador venceu
@@ -104,33 +278,90 @@ class Board:
         Returns:
             int: identificador do vencedor (0, 1 ou 2)
         """
-        for jogador in [1, 2]:
-            for linha in range(self.linhas):
-                if self.verificaLinha(self.grid[linha], jogador):
-                    return jogador
+        if self._vencedor is None:
+            self._vencedor = self.calcularVencedor()
+        return self._vencedor
+
+    def invalidarCache(self):
+        """
+        Descarta o vencedor em cache após alterações feitas diretamente em `grid`.
+
+        O hash de Zobrist também é recalculado a partir do grid.
+        """
+        self.chave = 0
+        self.chave_espelho = 0
+        for linha in range(self.linhas):
             for coluna in range(self.colunas):
-                if self.verificaLinha(self.grid[:, coluna], jogador):
-                    return jogador
-            for k in range(-self.linhas + 1, self.colunas):
-                diag = self.grid.diagonal(k)
-                if len(diag) >= 4 and self.verificaLinha(diag, jogador):
-                    return jogador
-                anti_diag = np.fliplr(self.grid).diagonal(k)
-                if len(anti_diag) >= 4 and self.verificaLinha(anti_diag, jogador):
-                    return jogador
+                jogador = int(self.grid[linha][coluna])
+                if jogador != 0:
+                    indice = self.getIndiceCelula(linha, coluna)
+                    self.chave ^= self._zobrist[jogador][indice]
+                    self.chave_espelho ^= self._zobrist_espelho[jogador][indice]
+        self._historico.clear()
+        self._vencedor = None
+        self.ultimaJogadaVenceu = False
+
+    def calcularVencedor(self):
+        """
+        Procura um vencedor em todas as linhas, colunas e diagonais.
+
+        Usa a tabela de janelas do formato (ver janelas.py): as células de
+        todas as janelas são lidas de uma vez e basta uma janela inteira de
+        um jogador.
+
+        Returns:
+            int: identificador do vencedor (0, 1 ou 2)
+        """
+        tabela = getTabelaJanelas(self.linhas, self.colunas, self.conectar)
+        if not len(tabela.indices_grid):
+            return 0
+        celulas = self.grid.ravel()[tabela.indices_grid]
+        for jogador in [1, 2]:
+            if (celulas == jogador).all(axis=1).any():
+                return jogador
         return 0
 
+    def verificaJogada(self, linha, coluna, jogador):
+        """
+        Verifica se a peça em (linha, coluna) completa `conectar` peças em linha.
+
+        Apenas as quatro direções que passam pela célula são percorridas,
+        então o custo não depende do tamanho do tabuleiro.
+
+        Args:
+            linha (int): linha da peça recém-colocada
+            coluna (int): coluna da peça recém-colocada
+            jogador (int): identificador do jogador (1 ou 2)
+
+        Returns:
+            bool: True se a peça formou `conectar` peças consecutivas
+        """
+        grid = self.grid
+        for d_linha, d_coluna in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            contador = 1
+            for sentido in (1, -1):
+                l = linha + d_linha * sentido
+                c = coluna + d_coluna * sentido
+                while 0 <= l < self.linhas and 0 <= c < self.colunas and grid[l][c] == jogador:
+                    contador += 1
+                    l += d_linha * sentido
+                    c += d_coluna * sentido
+            if contador >= self.conectar:
+                return True
+        return False
+
     def verificaLinha(self, linha, jogador):
         """
-        Verifica se há uma sequência de quatro peças consecutivas do mesmo jogador.
+        Verifica se há uma sequência de `conectar` peças consecutivas do mesmo jogador.
 
         Args:
             linha (numpy.ndarray): vetor representando uma linha, coluna ou diagonal
             jogador (int): identificador do jogador (1 ou 2)
 
         Returns:
-            bool: True se há quatro peças consecutivas do jogador, False caso contrário
+            bool: True se há `conectar` peças consecutivas do jogador, False caso contrário
         """
-        if len(linha) < 4:
+        n = self.conectar
+        if len(linha) < n:
             return False
-        return np.any(np.convolve((linha == jogador).astype(int), np.ones(4), 'valid') == 4)
+        return np.any(np.convolve((linha == jogador).astype(int), np.ones(n), 'valid') == n)
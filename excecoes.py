@@ -0,0 +1,7 @@
+"""
+Exceções compartilhadas pelos módulos de busca.
+"""
+
+
+class TempoEsgotado(Exception):
+    """Sinaliza que o prazo da jogada terminou no meio da busca."""
@@ -0,0 +1,92 @@
+"""
+Tabelas de janelas (segmentos de N células alinhadas) por formato de tabuleiro.
+
+Uma janela é um trecho de `conectar` células consecutivas na horizontal,
+vertical ou em uma das diagonais. As tabelas são montadas uma única vez por
+(linhas, colunas, conectar) e compartilhadas por todos os tabuleiros desse
+formato: o avaliador vetorizado conta peças por janela e Board procura
+vencedores com elas, sem laços Python sobre o tabuleiro.
+"""
+
+import numpy as np
+
+_tabelas = {}
+
+
+class TabelaJanelas:
+    """
+    Índices das células de todas as janelas de um formato de tabuleiro.
+
+    A ordem das janelas é: horizontais, verticais, diagonais descendentes e
+    diagonais ascendentes.
+
+    Atributos:
+        conectar (int): células por janela (peças em linha para vencer)
+        indices_grid (numpy.ndarray): (janelas, conectar) índices no grid achatado (linha * colunas + coluna)
+        indices_bits (numpy.ndarray): (janelas, conectar) índices de bit no layout do BitBoard
+        num_bytes (int): bytes necessários para serializar uma máscara do BitBoard
+        mascaras_bits (numpy.ndarray | None): (janelas,) máscara uint64 de cada janela no layout
+            do BitBoard, ou None se o tabuleiro não couber em 64 bits
+        mascara_centro (int): máscara da coluna central no layout do BitBoard
+    """
+
+    __slots__ = ("conectar", "indices_grid", "indices_bits", "num_bytes", "mascaras_bits", "mascara_centro")
+
+    def __init__(self, linhas, colunas, conectar=4):
+        """
+        Monta as tabelas de índices para o formato informado.
+
+        Args:
+            linhas (int): número de linhas do tabuleiro
+            colunas (int): número de colunas do tabuleiro
+            conectar (int): peças em linha necessárias para vencer
+        """
+        n = conectar
+        janelas = []
+        for linha in range(linhas):
+            for coluna in range(colunas - n + 1):
+                janelas.append([(linha, coluna + i) for i in range(n)])
+        for linha in range(linhas - n + 1):
+            for coluna in range(colunas):
+                janelas.append([(linha + i, coluna) for i in range(n)])
+        for linha in range(linhas - n + 1):
+            for coluna in range(colunas - n + 1):
+                janelas.append([(linha + i, coluna + i) for i in range(n)])
+                janelas.append([(linha + n - 1 - i, coluna + i) for i in range(n)])
+
+        self.conectar = conectar
+        self.indices_grid = np.array(
+            [[l * colunas + c for l, c in janela] for janela in janelas], dtype=np.intp).reshape(-1, n)
+        self.indices_bits = np.array(
+            [[c * (linhas + 1) + linhas - 1 - l for l, c in janela] for janela in janelas],
+            dtype=np.intp).reshape(-1, n)
+        self.num_bytes = (colunas * (linhas + 1) + 7) // 8
+        self.mascara_centro = ((1 << linhas) - 1) << (colunas // 2 * (linhas + 1))
+        self.mascaras_bits = None
+        if colunas * (linhas + 1) <= 64:
+            self.mascaras_bits = np.array([sum(1 << int(bit) for bit in janela) for janela in self.indices_bits],
+                                          dtype=np.uint64)
+
+
+def getTabelaJanelas(linhas, colunas, conectar=4):
+    """
+    Retorna a tabela de janelas de um formato, criando-a apenas na primeira chamada.
+
+    Args:
+        linhas (int): número de linhas do tabuleiro
+        colunas (int): número de colunas do tabuleiro
+        conectar (int): peças em linha necessárias para vencer
+
+    Returns:
+        TabelaJanelas: tabela compartilhada por todos os tabuleiros do formato
+    """
+    formato = (linhas, colunas, conectar)
+    tabela = _tabelas.get(formato)
+    if tabela is None:
+        tabela = _tabelas[formato] = TabelaJanelas(linhas, colunas, conectar)
+    return tabela
+
+
+# o formato padrão (6x7, 4 em linha) é montado na importação: processos
+# criados por um servidor de fork (ver processos.py) já recebem a tabela pronta
+getTabelaJanelas(6, 7, 4)
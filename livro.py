@@ -0,0 +1,226 @@
+"""
+Livro de aberturas: posições resolvidas offline e consultadas via mmap.
+
+Formato do arquivo (little-endian):
+    cabeçalho (12 bytes): b"C4LV", versão (u8), linhas (u8), colunas (u8),
+                          conectar (u8; 0 em livros antigos significa 4),
+                          quantidade de registros (u32)
+    registros (10 bytes cada), ordenados pela chave:
+        chave canônica (u64), melhor coluna (i8), pontuação exata (i8)
+
+A chave de uma posição é mascara_jogador1 + mascara_total (única no layout
+do BitBoard, pois a soma "empurra" um bit para a casa livre de cada coluna).
+Posições espelhadas compartilham o mesmo registro: a chave canônica é a
+menor entre a da posição e a do seu reflexo, e a coluna guardada está na
+orientação canônica. A pontuação segue a escala do Solver, do ponto de
+vista de quem joga.
+
+Uso para gerar um livro:
+    python livro.py --profundidade 8 --saida livro.bin --tempo 30
+"""
+
+import argparse
+import mmap
+import struct
+import time
+
+from bitboard import BitBoard
+from excecoes import TempoEsgotado
+from solver import Solver
+
+MAGICO = b"C4LV"
+VERSAO = 1
+CABECALHO = struct.Struct("<4sBBBBI")
+REGISTRO = struct.Struct("<Qbb")
+
+
+def espelharMascara(mascara, linhas, colunas):
+    """
+    Reflete uma máscara de bits da esquerda para a direita.
+
+    Args:
+        mascara (int): máscara no layout do BitBoard
+        linhas (int): número de linhas do tabuleiro
+        colunas (int): número de colunas do tabuleiro
+
+    Returns:
+        int: máscara com a coluna c movida para colunas - 1 - c
+    """
+    altura = linhas + 1
+    mascara_coluna = (1 << altura) - 1
+    espelhada = 0
+    for coluna in range(colunas):
+        espelhada |= ((mascara >> (coluna * altura)) & mascara_coluna) << ((colunas - 1 - coluna) * altura)
+    return espelhada
+
+
+def getChaveLivro(tabuleiro):
+    """
+    Calcula a chave exata do livro (jogador + máscara, espelhamento já dobrado).
+
+    Diferente de BitBoard.getChaveCanonica, que devolve o hash Zobrist da
+    tabela de transposição, esta chave identifica a posição sem colisões.
+
+    Args:
+        tabuleiro (BitBoard): posição
+
+    Returns:
+        tuple[int, bool]: (chave canônica, True se a chave veio do reflexo)
+    """
+    jogador = tabuleiro.posicoes[1]
+    mascara = jogador | tabuleiro.posicoes[2]
+    chave = jogador + mascara
+    chave_espelho = (espelharMascara(jogador, tabuleiro.linhas, tabuleiro.colunas) +
+                     espelharMascara(mascara, tabuleiro.linhas, tabuleiro.colunas))
+    if chave_espelho < chave:
+        return chave_espelho, True
+    return chave, False
+
+
+class LivroAberturas:
+    """
+    Consulta a um livro de aberturas sem carregar o arquivo inteiro.
+
+    O arquivo é mapeado em memória (mmap) e cada consulta faz uma busca
+    binária sobre os registros de tamanho fixo: O(log n) leituras de 10 bytes,
+    e o sistema operacional compartilha as páginas entre processos.
+    """
+
+    def __init__(self, caminho):
+        """
+        Abre e valida o livro.
+
+        Args:
+            caminho (str): caminho do arquivo gerado por gerarLivro
+
+        Raises:
+            ValueError: se o arquivo não for um livro válido
+        """
+        self.caminho = caminho
+        self._arquivo = open(caminho, "rb")
+        self._mmap = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        magico, versao, self.linhas, self.colunas, self.conectar, self.num_registros = \
+            CABECALHO.unpack_from(self._mmap, 0)
+        self.conectar = self.conectar or 4
+        if magico != MAGICO or versao != VERSAO:
+            self.fechar()
+            raise ValueError(f"Livro de aberturas inválido: {caminho}")
+        if len(self._mmap) < CABECALHO.size + self.num_registros * REGISTRO.size:
+            self.fechar()
+            raise ValueError(f"Livro de aberturas truncado: {caminho}")
+
+    def consultar(self, tabuleiro):
+        """
+        Procura a posição no livro.
+
+        Args:
+            tabuleiro (BitBoard): posição atual
+
+        Returns:
+            tuple[int, int] | None: (melhor coluna, pontuação para quem joga), ou None
+            se a posição não está no livro ou a variante do tabuleiro é outra
+        """
+        if (tabuleiro.linhas, tabuleiro.colunas, tabuleiro.conectar) != (self.linhas, self.colunas, self.conectar):
+            return None
+        chave, espelhada = getChaveLivro(tabuleiro)
+        inicio, fim = 0, self.num_registros
+        while inicio < fim:
+            meio = (inicio + fim) // 2
+            chave_meio, coluna, pontuacao = REGISTRO.unpack_from(
+                self._mmap, CABECALHO.size + meio * REGISTRO.size)
+            if chave_meio < chave:
+                inicio = meio + 1
+            elif chave_meio > chave:
+                fim = meio
+            else:
+                if espelhada:
+                    coluna = self.colunas - 1 - coluna
+                return coluna, pontuacao
+        return None
+
+    def fechar(self):
+        """
+        Libera o mapeamento e o arquivo.
+        """
+        self._mmap.close()
+        self._arquivo.close()
+
+
+def gerarLivro(caminho, profundidade, linhas=6, colunas=7, tempo_por_posicao=None, tamanho_tabela_mb=64,
+               conectar=4):
+    """
+    Resolve todas as posições até `profundidade` jogadas e grava o livro.
+
+    As posições são enumeradas em largura a partir do tabuleiro vazio
+    (jogador 1 começa), sem repetir posições espelhadas. Posições com
+    vencedor são ignoradas, assim como as que o Solver não resolve dentro
+    de `tempo_por_posicao` segundos (quando informado).
+
+    Args:
+        caminho (str): arquivo de saída
+        profundidade (int): número máximo de peças das posições do livro
+        linhas (int): número de linhas do tabuleiro
+        colunas (int): número de colunas do tabuleiro
+        tempo_por_posicao (float | None): limite do Solver por posição
+        tamanho_tabela_mb (float): memória da tabela de transposição do Solver
+        conectar (int): peças em linha necessárias para vencer
+
+    Returns:
+        int: quantidade de registros gravados
+
+    Raises:
+        ValueError: se o formato do tabuleiro não cabe em chaves de 64 bits
+    """
+    if colunas * (linhas + 1) > 64:
+        raise ValueError("O formato do livro guarda chaves de 64 bits: colunas * (linhas + 1) deve ser no máximo 64")
+    solver = Solver(linhas, colunas, tamanho_tabela_mb=tamanho_tabela_mb, conectar=conectar)
+    registros = []
+    inicial = BitBoard(linhas, colunas, conectar)
+    nivel = {getChaveLivro(inicial)[0]: inicial}
+
+    for jogadas in range(profundidade + 1):
+        jogador = 1 if jogadas % 2 == 0 else 2
+        proximo_nivel = {}
+        for chave, tabuleiro in sorted(nivel.items()):
+            prazo = time.perf_counter() + tempo_por_posicao if tempo_por_posicao else None
+            try:
+                coluna, pontuacao = solver.getMelhorJogada(tabuleiro, jogador, prazo)
+            except TempoEsgotado:
+                coluna = None
+            if coluna is not None:
+                if getChaveLivro(tabuleiro)[1]:
+                    coluna = colunas - 1 - coluna
+                registros.append((chave, coluna, pontuacao))
+
+            if jogadas == profundidade:
+                continue
+            for proxima in tabuleiro.getMovimentosValidos():
+                filho = tabuleiro.copia()
+                filho.addPeca(proxima, jogador)
+                if filho.getVencedor() or filho.isTabuleiroCompleto():
+                    continue
+                proximo_nivel.setdefault(getChaveLivro(filho)[0], filho)
+        nivel = proximo_nivel
+
+    registros.sort()
+    with open(caminho, "wb") as arquivo:
+        arquivo.write(CABECALHO.pack(MAGICO, VERSAO, linhas, colunas, conectar, len(registros)))
+        for registro in registros:
+            arquivo.write(REGISTRO.pack(*registro))
+    return len(registros)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera um livro de aberturas resolvendo posições offline.")
+    parser.add_argument("--profundidade", type=int, default=8, help="número máximo de peças por posição")
+    parser.add_argument("--saida", default="livro.bin", help="arquivo de saída")
+    parser.add_argument("--linhas", type=int, default=6)
+    parser.add_argument("--colunas", type=int, default=7)
+    parser.add_argument("--conectar", type=int, default=4, help="peças em linha para vencer")
+    parser.add_argument("--tempo", type=float, default=None, help="limite do Solver por posição, em segundos")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    total = gerarLivro(args.saida, args.profundidade, args.linhas, args.colunas, args.tempo,
+                       conectar=args.conectar)
+    print(f"{total} posições gravadas em {args.saida} ({time.perf_counter() - inicio:.1f}s)")
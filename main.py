@@ -2,13 +2,16 @@
 # Connect Four Game - TDE2 Implementation
 # Autor: Alexandre Marques Tortoza Canoa
 
+import argparse
+from datetime import datetime
+
 from colors import bcolors
-from board import Board
 from agent import AgenteIA
-from utils import showTabuleiro, getJogada, escolherDificuldade
+from registro import EscritorRegistros, RegistroPartida
+from utils import showTabuleiro, getJogada, escolherDificuldade, getLetrasColunas
 
 
-def main():
+def main(linhas=6, colunas=7, conectar=4, ponderar=True, caminho_registro=None):
     """
     Função principal que executa o jogo Connect Four.
 
@@ -25,17 +28,32 @@ def main():
         - As peças da Maquina são amarelas.
 
     O jogo termina quando:
-        - Um jogador conecta quatro peças seguidas (horizontal, vertical ou diagonal).
+        - Um jogador conecta `conectar` peças seguidas (horizontal, vertical ou diagonal).
         - O tabuleiro é preenchido completamente (empate).
-    
+
+    Com `ponderar`, a Maquina continua pensando enquanto o jogador escolhe
+    a jogada (ver AgenteIA.iniciarPonderacao).
+
+    Args:
+        linhas (int): número de linhas do tabuleiro
+        colunas (int): número de colunas do tabuleiro
+        conectar (int): peças em linha para vencer (4 no Connect Four clássico)
+        ponderar (bool): pensa no tempo do jogador (níveis 2 e 3)
+        caminho_registro (str | None): arquivo de registros (ver registro.py) em
+            que a partida é acrescentada ao terminar
     """
     print(f"{bcolors.BOLD}{bcolors.BLUE}=== CONNECT FOUR - TDE2 ==={bcolors.ENDC}")
     print("Humano vs Maquina")
     print("Pode Começar!\n")
 
     dificuldade = escolherDificuldade()
+    # Board depende de NumPy: importado só aqui, o menu aparece sem esperar por ele
+    from board import Board
     agente_ia = AgenteIA(dificuldade)
-    tabuleiro = Board()
+    tabuleiro = Board(linhas, colunas, conectar)
+    registro = RegistroPartida(linhas, colunas, conectar, {
+        "origem": "main", "nivel": dificuldade, "data": datetime.now().isoformat(timespec="seconds")})
+    colunas_letras = getLetrasColunas(colunas)
     jogador_vencedor = 0
     turno_humano = True
 
@@ -44,10 +62,13 @@ def main():
 
     while jogador_vencedor == 0 and not tabuleiro.isTabuleiroCompleto():
         if turno_humano:
+            if ponderar and not agente_ia.ponderando:
+                agente_ia.iniciarPonderacao(tabuleiro)
             print(f"{bcolors.RED}Vez do jogador:{bcolors.ENDC}")
-            coluna_humano = getJogada()
+            coluna_humano = getJogada(colunas)
             if tabuleiro.isMovimentoValido(coluna_humano):
                 tabuleiro.addPeca(coluna_humano, 1)
+                registro.addJogada(coluna_humano)
                 turno_humano = False
             else:
                 print("Movimento inválido! Coluna cheia.")
@@ -55,9 +76,13 @@ def main():
         else:
             print(f"{bcolors.YELLOW}Vez da Maquina:{bcolors.ENDC}")
             print("Clocks going tick...")
+            acertos = agente_ia.estatisticas_ponderacao["acertos"]
             melhor_coluna, pontuacao_avaliacao, tempo_gasto = agente_ia.getMelhorJogada(tabuleiro)
             tabuleiro.addPeca(melhor_coluna, 2)
-            colunas_letras = ['a', 's', 'd', 'f', 'g', 'h', 'j']
+            registro.addJogada(melhor_coluna, tempo_gasto, agente_ia.nos_avaliados, pontuacao_avaliacao,
+                               agente_ia.profundidade_alcancada)
+            if agente_ia.estatisticas_ponderacao["acertos"] > acertos:
+                print("Jogada já analisada durante a sua vez.")
             print(f"A Maquina jogou na coluna: {bcolors.BOLD}{colunas_letras[melhor_coluna]}{bcolors.ENDC}")
             print(f"gastou: {tempo_gasto:.3f}s")
             print(f"Pontuação: {pontuacao_avaliacao:.2f}")
@@ -67,6 +92,11 @@ def main():
         showTabuleiro(tabuleiro.getTabuleiro())
         jogador_vencedor = tabuleiro.getVencedor()
 
+    agente_ia.fechar()
+    if caminho_registro:
+        registro.vencedor = jogador_vencedor
+        with EscritorRegistros(caminho_registro) as escritor:
+            escritor.escrever(registro)
     print(f"\n{bcolors.BOLD}=== RESULTADO ==={bcolors.ENDC}")
     if jogador_vencedor == 1:
         print(f"{bcolors.RED}{bcolors.BOLD}Você não perdeu !!!{bcolors.ENDC}")
@@ -77,4 +107,12 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Connect Four: Humano vs Maquina.")
+    parser.add_argument("--linhas", type=int, default=6)
+    parser.add_argument("--colunas", type=int, default=7)
+    parser.add_argument("--conectar", type=int, default=4, help="peças em linha para vencer")
+    parser.add_argument("--sem-ponderacao", action="store_true",
+                        help="não pensa durante a vez do jogador")
+    parser.add_argument("--registro", default=None, help="acrescenta a partida a este arquivo .jsonl")
+    args = parser.parse_args()
+    main(args.linhas, args.colunas, args.conectar, not args.sem_ponderacao, args.registro)
@@ -0,0 +1,585 @@
+"""
+Avaliação aprendida: modelos NumPy sobre características de janelas e ameaças.
+
+As avaliações do AgenteIA (avaliacaoIniciante, ...) combinam as mesmas
+grandezas com pesos escolhidos à mão. Este módulo as aprende: as
+características de cada posição (extrairCaracteristicas) vêm das funções
+em lote de avaliador.py e ameacas.py, e um modelo pequeno (ModeloLinear ou
+ModeloMLP, uma camada oculta) prevê o resultado esperado da partida, entre
+-1 (derrota) e 1 (vitória), para N posições de uma vez.
+
+Qualquer objeto com prever() e getIdentificador() (ver ModeloAvaliacao)
+pode ser atribuído a AgenteIA.modelo; com caminho_modelo, o agente carrega
+um arquivo .npz gravado por ModeloAvaliacao.salvar.
+
+O treino é offline, a partir de partidas Maquina x Maquina: `gerar` joga as
+partidas em um pool de processos (torneio.jogarPartida) e as grava no
+formato de registro.py; `treinar` repete as partidas, rotula cada posição
+com o resultado final e ajusta os pesos (Adam, erro quadrático).
+
+Uso:
+    python modelo.py gerar --partidas 200 --nivel 2 --tempo 0.05 --processos 4 --saida autojogo.jsonl
+    python modelo.py treinar autojogo.jsonl --tipo mlp --ocultos 32 --epocas 40 --saida modelo.npz
+"""
+
+import argparse
+import hashlib
+import time
+
+import numpy as np
+
+from ameacas import analisarAmeacas, analisarAmeacasLote, contarBitsLote
+from avaliador import getCaracteristicasLote, getHistogramaJanelas, getMascarasLote
+from bitboard import BitBoard
+
+# pontuação de uma previsão p (entre -1 e 1): p * ESCALA_MODELO, abaixo das
+# partidas decididas no lance seguinte (±50000) e das vitórias (±100000)
+ESCALA_MODELO = 10000.0
+
+
+def getNomesCaracteristicas(conectar=4):
+    """
+    Nomeia as colunas da matriz de extrairCaracteristicas.
+
+    Args:
+        conectar (int): peças em linha necessárias para vencer
+
+    Returns:
+        list[str]: um nome por característica, na ordem das colunas
+    """
+    nomes = []
+    for lado in ("eu", "oponente"):
+        nomes += [f"janelas_{lado}_{tamanho}" for tamanho in range(1, conectar)]
+    nomes += ["centro_eu", "centro_oponente"]
+    for lado in ("eu", "oponente"):
+        nomes += [f"ameacas_{lado}_{tipo}" for tipo in ("vivas", "favoraveis", "empilhadas", "imediatas")]
+    return nomes + ["vez"]
+
+
+def extrairCaracteristicas(posicoes, jogador, linhas=6, colunas=7, conectar=4):
+    """
+    Calcula as características de N posições do ponto de vista de um jogador.
+
+    Por posição: janelas do jogador e do oponente com 1 a conectar - 1 peças
+    e nenhuma do outro (avaliador.getCaracteristicasLote), peças de cada um na
+    coluna central, as quatro classes de ameaças de cada um
+    (ameacas.analisarAmeacasLote) e se é a vez do jogador.
+
+    Args:
+        posicoes (numpy.ndarray): lote no formato de avaliador.contarPecasJanelasLote
+        jogador (int): ponto de vista (1 ou 2)
+        linhas (int): número de linhas do tabuleiro
+        colunas (int): número de colunas do tabuleiro
+        conectar (int): peças em linha necessárias para vencer
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: características (N, 2 * conectar + 9)
+        em float64 (ver getNomesCaracteristicas), vencedores (N,) e vencedores iminentes (N,)
+    """
+    histogramas, centro, vencedores = getCaracteristicasLote(posicoes, linhas, colunas, conectar)
+    mascaras = getMascarasLote(posicoes, linhas, colunas)
+    ameacas, iminentes = analisarAmeacasLote(mascaras, linhas, colunas, conectar)
+    oponente = 3 - jogador
+    vez = 1 + contarBitsLote(mascaras[:, 0] | mascaras[:, 1]) % 2 == jogador
+    caracteristicas = np.concatenate((
+        histogramas[:, jogador, 1:conectar], histogramas[:, oponente, 1:conectar],
+        centro[:, [jogador, oponente]], ameacas[:, jogador], ameacas[:, oponente], vez[:, None],
+    ), axis=1).astype(np.float64)
+    return caracteristicas, vencedores, iminentes
+
+
+def getCaracteristicas(tabuleiro, jogador, histograma=None):
+    """
+    Calcula as características de uma única posição, sem montar um lote.
+
+    O resultado é igual à linha correspondente de extrairCaracteristicas,
+    com uma fração do custo fixo das operações em lote.
+
+    Args:
+        tabuleiro (BitBoard | Board): posição (Board é convertido)
+        jogador (int): ponto de vista (1 ou 2)
+        histograma (numpy.ndarray | None): getHistogramaJanelas da posição, se já calculado
+
+    Returns:
+        numpy.ndarray: (1, 2 * conectar + 9) em float64
+    """
+    if not isinstance(tabuleiro, BitBoard):
+        tabuleiro = tabuleiro.toBitBoard()
+    if histograma is None:
+        histograma = getHistogramaJanelas(tabuleiro)
+    oponente = 3 - jogador
+    n = tabuleiro.conectar
+    centro = tabuleiro.colunas // 2
+    valores = [*histograma[jogador][1:n], *histograma[oponente][1:n],
+               tabuleiro.contarPecasColuna(centro, jogador), tabuleiro.contarPecasColuna(centro, oponente),
+               *analisarAmeacas(tabuleiro, jogador), *analisarAmeacas(tabuleiro, oponente),
+               1 + tabuleiro.movimentos % 2 == jogador]
+    return np.array([valores], dtype=np.float64)
+
+
+# ============================================================
+# MODELOS
+# ============================================================
+
+class ModeloAvaliacao:
+    """
+    Interface dos modelos de avaliação.
+
+    As características são normalizadas por (x - media) / desvio antes de
+    propagar; a saída linear passa por tanh e vira a previsão do resultado.
+    As subclasses definem `tipo`, os parâmetros treináveis e a propagação.
+    """
+
+    tipo = None
+    __slots__ = ("media", "desvio")
+
+    def __init__(self, media, desvio):
+        """
+        Args:
+            media (numpy.ndarray): (F,) média de cada característica
+            desvio (numpy.ndarray): (F,) desvio padrão de cada característica (sem zeros)
+        """
+        self.media = np.asarray(media, dtype=np.float64)
+        self.desvio = np.asarray(desvio, dtype=np.float64)
+
+    def getParametros(self):
+        """
+        Returns:
+            dict[str, numpy.ndarray]: parâmetros treináveis por nome; são os próprios
+            arrays do modelo, alterados no lugar pelo treino
+        """
+        raise NotImplementedError
+
+    def propagar(self, entradas):
+        """
+        Calcula a saída linear (antes de tanh) de entradas já normalizadas.
+
+        Args:
+            entradas (numpy.ndarray): (N, F) características normalizadas
+
+        Returns:
+            tuple[numpy.ndarray, tuple]: saída (N,) e os valores intermediários usados por retropropagar
+        """
+        raise NotImplementedError
+
+    def retropropagar(self, intermediarios, gradiente):
+        """
+        Args:
+            intermediarios (tuple): retorno de propagar
+            gradiente (numpy.ndarray): (N,) derivada da perda em relação à saída linear
+
+        Returns:
+            dict[str, numpy.ndarray]: gradiente de cada parâmetro, com as chaves de getParametros
+        """
+        raise NotImplementedError
+
+    def normalizar(self, caracteristicas):
+        """
+        Raises:
+            ValueError: se o número de características não for o do modelo
+        """
+        if caracteristicas.shape[1] != len(self.media):
+            raise ValueError(f"o modelo espera {len(self.media)} características, "
+                             f"recebeu {caracteristicas.shape[1]}")
+        return (caracteristicas - self.media) / self.desvio
+
+    def prever(self, caracteristicas):
+        """
+        Prevê o resultado de N posições.
+
+        Args:
+            caracteristicas (numpy.ndarray): (N, F) matriz de extrairCaracteristicas
+
+        Returns:
+            numpy.ndarray: (N,) resultado esperado entre -1 (derrota) e 1 (vitória)
+        """
+        saida, _ = self.propagar(self.normalizar(caracteristicas))
+        return np.tanh(saida)
+
+    def getIdentificador(self):
+        """
+        Resume os parâmetros em um identificador curto.
+
+        Usado no perfil do cache persistente, para que pontuações de modelos
+        diferentes não se misturem.
+
+        Returns:
+            str: 12 dígitos hexadecimais
+        """
+        resumo = hashlib.sha1(self.tipo.encode())
+        for nome, valores in sorted(self.getArrays().items()):
+            resumo.update(nome.encode())
+            resumo.update(np.ascontiguousarray(valores, dtype=np.float32).tobytes())
+        return resumo.hexdigest()[:12]
+
+    def getArrays(self):
+        """Retorna todos os arrays gravados no arquivo: parâmetros e normalização."""
+        return {"media": self.media, "desvio": self.desvio, **self.getParametros()}
+
+    def salvar(self, caminho):
+        """
+        Grava o modelo em um .npz comprimido, com os arrays em float32.
+
+        Args:
+            caminho (str): arquivo de saída
+        """
+        np.savez_compressed(caminho, tipo=np.array(self.tipo),
+                            **{nome: valores.astype(np.float32) for nome, valores in self.getArrays().items()})
+
+
+class ModeloLinear(ModeloAvaliacao):
+    """
+    Combinação linear das características: tanh(x · pesos + vies).
+    """
+
+    tipo = "linear"
+    __slots__ = ("pesos", "vies")
+
+    def __init__(self, media, desvio, pesos=None, vies=0.0):
+        """
+        Args:
+            media (numpy.ndarray): (F,) média de cada característica
+            desvio (numpy.ndarray): (F,) desvio padrão de cada característica
+            pesos (numpy.ndarray | None): (F,) pesos (padrão: zeros)
+            vies (float): termo constante
+        """
+        super().__init__(media, desvio)
+        self.pesos = np.zeros(len(self.media)) if pesos is None else np.asarray(pesos, dtype=np.float64)
+        self.vies = np.array(vies, dtype=np.float64)
+
+    def getParametros(self):
+        return {"pesos": self.pesos, "vies": self.vies}
+
+    def propagar(self, entradas):
+        return entradas @ self.pesos + self.vies, (entradas,)
+
+    def retropropagar(self, intermediarios, gradiente):
+        entradas, = intermediarios
+        return {"pesos": entradas.T @ gradiente, "vies": np.array(gradiente.sum())}
+
+
+class ModeloMLP(ModeloAvaliacao):
+    """
+    Uma camada oculta com ReLU: tanh(relu(x · pesos_ocultos + vies_ocultos) · pesos_saida + vies_saida).
+    """
+
+    tipo = "mlp"
+    __slots__ = ("pesos_ocultos", "vies_ocultos", "pesos_saida", "vies_saida")
+
+    def __init__(self, media, desvio, pesos_ocultos=None, vies_ocultos=None, pesos_saida=None, vies_saida=0.0,
+                 ocultos=32, semente=0):
+        """
+        Args:
+            media (numpy.ndarray): (F,) média de cada característica
+            desvio (numpy.ndarray): (F,) desvio padrão de cada característica
+            pesos_ocultos (numpy.ndarray | None): (F, H); padrão: inicialização de He
+            vies_ocultos (numpy.ndarray | None): (H,); padrão: zeros
+            pesos_saida (numpy.ndarray | None): (H,); padrão: inicialização de He
+            vies_saida (float): termo constante da saída
+            ocultos (int): neurônios da camada oculta, quando os pesos não são informados
+            semente (int): semente da inicialização
+        """
+        super().__init__(media, desvio)
+        gerador = np.random.default_rng(semente)
+        entradas = len(self.media)
+        if pesos_ocultos is None:
+            pesos_ocultos = gerador.normal(0.0, np.sqrt(2.0 / entradas), (entradas, ocultos))
+        self.pesos_ocultos = np.asarray(pesos_ocultos, dtype=np.float64)
+        ocultos = self.pesos_ocultos.shape[1]
+        self.vies_ocultos = (np.zeros(ocultos) if vies_ocultos is None
+                             else np.asarray(vies_ocultos, dtype=np.float64))
+        if pesos_saida is None:
+            pesos_saida = gerador.normal(0.0, np.sqrt(2.0 / ocultos), ocultos)
+        self.pesos_saida = np.asarray(pesos_saida, dtype=np.float64)
+        self.vies_saida = np.array(vies_saida, dtype=np.float64)
+
+    def getParametros(self):
+        return {"pesos_ocultos": self.pesos_ocultos, "vies_ocultos": self.vies_ocultos,
+                "pesos_saida": self.pesos_saida, "vies_saida": self.vies_saida}
+
+    def propagar(self, entradas):
+        ativacao = entradas @ self.pesos_ocultos + self.vies_ocultos
+        oculta = np.maximum(ativacao, 0.0)
+        return oculta @ self.pesos_saida + self.vies_saida, (entradas, ativacao, oculta)
+
+    def retropropagar(self, intermediarios, gradiente):
+        entradas, ativacao, oculta = intermediarios
+        gradiente_oculta = np.outer(gradiente, self.pesos_saida) * (ativacao > 0)
+        return {"pesos_ocultos": entradas.T @ gradiente_oculta, "vies_ocultos": gradiente_oculta.sum(axis=0),
+                "pesos_saida": oculta.T @ gradiente, "vies_saida": np.array(gradiente.sum())}
+
+
+MODELOS = {ModeloLinear.tipo: ModeloLinear, ModeloMLP.tipo: ModeloMLP}
+
+
+def carregarModelo(caminho):
+    """
+    Lê um modelo gravado por ModeloAvaliacao.salvar.
+
+    Args:
+        caminho (str): arquivo .npz
+
+    Returns:
+        ModeloAvaliacao: modelo com os parâmetros em float64
+
+    Raises:
+        ValueError: se o tipo do modelo for desconhecido
+    """
+    with np.load(caminho) as dados:
+        tipo = str(dados["tipo"])
+        if tipo not in MODELOS:
+            raise ValueError(f"tipo de modelo desconhecido: {tipo!r}")
+        return MODELOS[tipo](**{nome: dados[nome] for nome in dados.files if nome != "tipo"})
+
+
+def criarModelo(tipo, caracteristicas, ocultos=32, semente=0):
+    """
+    Cria um modelo novo com a normalização calculada sobre os dados de treino.
+
+    Args:
+        tipo (str): "linear" ou "mlp"
+        caracteristicas (numpy.ndarray): (N, F) dados de treino
+        ocultos (int): neurônios da camada oculta (só "mlp")
+        semente (int): semente da inicialização
+
+    Returns:
+        ModeloAvaliacao: modelo não treinado
+    """
+    media = caracteristicas.mean(axis=0)
+    desvio = caracteristicas.std(axis=0)
+    desvio[desvio == 0] = 1.0
+    if tipo == ModeloMLP.tipo:
+        return ModeloMLP(media, desvio, ocultos=ocultos, semente=semente)
+    if tipo == ModeloLinear.tipo:
+        return ModeloLinear(media, desvio)
+    raise ValueError(f"tipo de modelo desconhecido: {tipo!r}")
+
+
+# ============================================================
+# TREINO
+# ============================================================
+
+def getErro(modelo, caracteristicas, alvos):
+    """Retorna o erro quadrático médio das previsões do modelo."""
+    return float(np.mean((modelo.prever(caracteristicas) - alvos) ** 2))
+
+
+def treinarModelo(modelo, caracteristicas, alvos, epocas=30, taxa=0.003, tamanho_lote=256, validacao=0.1,
+                  semente=0, regularizacao=1e-4):
+    """
+    Ajusta os parâmetros do modelo com Adam, minimizando o erro quadrático de tanh(saída).
+
+    Uma fração `validacao` das posições fica fora do treino e mede a
+    generalização a cada época; os parâmetros finais são os da época de
+    menor erro de validação.
+
+    Args:
+        modelo (ModeloAvaliacao): modelo a ajustar (alterado no lugar)
+        caracteristicas (numpy.ndarray): (N, F) características
+        alvos (numpy.ndarray): (N,) resultados entre -1 e 1
+        epocas (int): passadas completas pelos dados de treino
+        taxa (float): taxa de aprendizado
+        tamanho_lote (int): posições por passo
+        validacao (float): fração das posições reservada para validação
+        semente (int): semente do embaralhamento
+        regularizacao (float): penalidade L2 dos pesos (não se aplica aos vieses)
+
+    Returns:
+        list[tuple[int, float, float]]: (época, erro de treino, erro de validação) por época
+    """
+    gerador = np.random.default_rng(semente)
+    ordem = gerador.permutation(len(alvos))
+    corte = int(len(alvos) * (1 - validacao)) if validacao else len(alvos)
+    treino, teste = ordem[:corte], ordem[corte:]
+    entradas = modelo.normalizar(caracteristicas)
+    parametros = modelo.getParametros()
+    momentos = {nome: (np.zeros_like(valores), np.zeros_like(valores)) for nome, valores in parametros.items()}
+    beta_1, beta_2, epsilon = 0.9, 0.999, 1e-8
+
+    historico = []
+    melhor = (np.inf, {nome: valores.copy() for nome, valores in parametros.items()})
+    passo = 0
+    for epoca in range(1, epocas + 1):
+        gerador.shuffle(treino)
+        for inicio in range(0, len(treino), tamanho_lote):
+            lote = treino[inicio:inicio + tamanho_lote]
+            saida, intermediarios = modelo.propagar(entradas[lote])
+            previsao = np.tanh(saida)
+            gradiente = 2 * (previsao - alvos[lote]) * (1 - previsao ** 2) / len(lote)
+            gradientes = modelo.retropropagar(intermediarios, gradiente)
+            passo += 1
+            for nome, valores in parametros.items():
+                derivada = gradientes[nome] + (regularizacao * valores if nome.startswith("pesos") else 0.0)
+                primeiro, segundo = momentos[nome]
+                primeiro[...] = beta_1 * primeiro + (1 - beta_1) * derivada
+                segundo[...] = beta_2 * segundo + (1 - beta_2) * derivada ** 2
+                corrigido_1 = primeiro / (1 - beta_1 ** passo)
+                corrigido_2 = segundo / (1 - beta_2 ** passo)
+                valores[...] -= taxa * corrigido_1 / (np.sqrt(corrigido_2) + epsilon)
+
+        erro_treino = getErro(modelo, caracteristicas[treino], alvos[treino])
+        erro_teste = getErro(modelo, caracteristicas[teste], alvos[teste]) if len(teste) else erro_treino
+        historico.append((epoca, erro_treino, erro_teste))
+        if erro_teste < melhor[0]:
+            melhor = (erro_teste, {nome: valores.copy() for nome, valores in parametros.items()})
+
+    for nome, valores in parametros.items():
+        valores[...] = melhor[1][nome]
+    return historico
+
+
+def gerarPartidas(caminho, partidas=100, nivel=2, tempo_maximo=0.05, jogadas_abertura=4, num_processos=1,
+                  semente=0, tamanho_tabela_mb=4, caminho_modelo=None, linhas=6, colunas=7, conectar=4):
+    """
+    Joga partidas Maquina x Maquina e as acrescenta a um arquivo de registros.
+
+    Cada partida começa de uma abertura aleatória (torneio.gerarAbertura),
+    o que diversifica as posições; com `caminho_modelo`, os dois agentes
+    avaliam com o modelo, para treinar a geração seguinte sobre as partidas
+    da anterior.
+
+    Args:
+        caminho (str): arquivo de registros (.jsonl ou .jsonl.gz)
+        partidas (int): partidas jogadas
+        nivel (int): nível dos dois agentes
+        tempo_maximo (float): tempo máximo por jogada
+        jogadas_abertura (int): jogadas aleatórias antes dos agentes assumirem
+        num_processos (int): processos do pool (1 joga no processo atual)
+        semente (int): semente das aberturas
+        tamanho_tabela_mb (float): tabela de transposição de cada agente
+        caminho_modelo (str | None): modelo usado pelos agentes
+        linhas (int): número de linhas do tabuleiro
+        colunas (int): número de colunas do tabuleiro
+        conectar (int): peças em linha necessárias para vencer
+
+    Returns:
+        int: partidas gravadas
+    """
+    from processos import getContexto
+    from registro import EscritorRegistros, RegistroPartida
+    from torneio import decodificarMovimentos, gerarTarefas, jogarPartida
+
+    tarefas = gerarTarefas((nivel,), partidas, jogadas_abertura, tempo_maximo, tamanho_tabela_mb, semente,
+                           linhas, colunas, conectar)
+    for tarefa in tarefas:
+        tarefa["modelo_1"] = tarefa["modelo_2"] = caminho_modelo
+
+    with EscritorRegistros(caminho) as escritor:
+        def gravar(resultado):
+            registro = RegistroPartida(linhas, colunas, conectar, {"origem": "autojogo", "nivel": nivel})
+            for coluna in decodificarMovimentos(resultado["abertura"] + resultado["movimentos"], colunas):
+                registro.addJogada(coluna)
+            registro.vencedor = resultado["vencedor"]
+            escritor.escrever(registro)
+
+        if num_processos > 1:
+            with getContexto().Pool(num_processos) as pool:
+                for resultado in pool.imap_unordered(jogarPartida, tarefas):
+                    gravar(resultado)
+        else:
+            for tarefa in tarefas:
+                gravar(jogarPartida(tarefa))
+        return escritor.escritos
+
+
+def carregarPosicoes(caminhos, linhas=6, colunas=7, conectar=4):
+    """
+    Repete as partidas terminadas dos arquivos e rotula cada posição com o resultado final.
+
+    Entram as posições depois de cada jogada, exceto a última (a partida já
+    decidida é pontuada pelo próprio AgenteIA). Partidas de outro formato ou
+    interrompidas são ignoradas.
+
+    Args:
+        caminhos (list[str]): arquivos de registros
+        linhas (int): número de linhas do tabuleiro
+        colunas (int): número de colunas do tabuleiro
+        conectar (int): peças em linha necessárias para vencer
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]: lote de posições (máscaras (N, 2) uint64, ou grids
+        (N, linhas, colunas) se o tabuleiro não couber em 64 bits) e o resultado de cada uma
+        para o jogador 1 (1 vitória, 0 empate, -1 derrota)
+    """
+    from bitboard import BitBoard
+    from registro import lerRegistros
+
+    mascaras = colunas * (linhas + 1) <= 64
+    posicoes, resultados = [], []
+    for caminho in caminhos:
+        for registro in lerRegistros(caminho, ignorar_invalidos=True):
+            if (registro.vencedor not in (0, 1, 2) or
+                    (registro.linhas, registro.colunas, registro.conectar) != (linhas, colunas, conectar)):
+                continue
+            resultado = {0: 0.0, 1: 1.0, 2: -1.0}[registro.vencedor]
+            tabuleiro = BitBoard(linhas, colunas, conectar)
+            for indice, coluna in enumerate(registro.movimentos[:-1]):
+                tabuleiro.addPeca(coluna, 1 + indice % 2)
+                posicoes.append(tuple(tabuleiro.posicoes[1:3]) if mascaras else tabuleiro.grid.copy())
+                resultados.append(resultado)
+    if mascaras:
+        lote = np.array(posicoes, dtype=np.uint64).reshape(-1, 2)
+    else:
+        lote = np.array(posicoes, dtype=np.int8).reshape(-1, linhas, colunas)
+    return lote, np.array(resultados)
+
+
+def montarTreino(posicoes, resultados, linhas=6, colunas=7, conectar=4):
+    """
+    Monta as características e os alvos de treino dos dois pontos de vista.
+
+    Cada posição entra duas vezes: com as características do jogador 1 e
+    o resultado dele, e com as do jogador 2 e o resultado oposto.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]: características (2N, F) e alvos (2N,)
+    """
+    caracteristicas_1 = extrairCaracteristicas(posicoes, 1, linhas, colunas, conectar)[0]
+    caracteristicas_2 = extrairCaracteristicas(posicoes, 2, linhas, colunas, conectar)[0]
+    return np.concatenate((caracteristicas_1, caracteristicas_2)), np.concatenate((resultados, -resultados))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Avaliação aprendida: partidas de treino e ajuste dos pesos.")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    gerar = comandos.add_parser("gerar", help="joga partidas Maquina x Maquina e grava os registros")
+    gerar.add_argument("--partidas", type=int, default=100)
+    gerar.add_argument("--nivel", type=int, default=2)
+    gerar.add_argument("--tempo", type=float, default=0.05, help="tempo máximo por jogada")
+    gerar.add_argument("--abertura", type=int, default=4, help="jogadas aleatórias iniciais")
+    gerar.add_argument("--processos", type=int, default=1)
+    gerar.add_argument("--semente", type=int, default=0)
+    gerar.add_argument("--modelo", default=None, help="modelo usado pelos agentes (.npz)")
+    gerar.add_argument("--saida", default="autojogo.jsonl", help="arquivo de registros (acrescenta)")
+    treinar = comandos.add_parser("treinar", help="ajusta um modelo às partidas gravadas")
+    treinar.add_argument("arquivos", nargs="+")
+    treinar.add_argument("--tipo", choices=sorted(MODELOS), default=ModeloMLP.tipo)
+    treinar.add_argument("--ocultos", type=int, default=32, help="neurônios da camada oculta (mlp)")
+    treinar.add_argument("--epocas", type=int, default=30)
+    treinar.add_argument("--taxa", type=float, default=0.003)
+    treinar.add_argument("--semente", type=int, default=0)
+    treinar.add_argument("--saida", default="modelo.npz")
+    for comando in (gerar, treinar):
+        comando.add_argument("--linhas", type=int, default=6)
+        comando.add_argument("--colunas", type=int, default=7)
+        comando.add_argument("--conectar", type=int, default=4, help="peças em linha para vencer")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    if args.comando == "gerar":
+        total = gerarPartidas(args.saida, args.partidas, args.nivel, args.tempo, args.abertura, args.processos,
+                              args.semente, caminho_modelo=args.modelo, linhas=args.linhas,
+                              colunas=args.colunas, conectar=args.conectar)
+        print(f"{total} partidas gravadas em {args.saida} ({time.perf_counter() - inicio:.1f}s)")
+    else:
+        posicoes, resultados = carregarPosicoes(args.arquivos, args.linhas, args.colunas, args.conectar)
+        if not len(resultados):
+            parser.error("nenhuma partida terminada no formato informado")
+        caracteristicas, alvos = montarTreino(posicoes, resultados, args.linhas, args.colunas, args.conectar)
+        modelo = criarModelo(args.tipo, caracteristicas, args.ocultos, args.semente)
+        for epoca, erro_treino, erro_teste in treinarModelo(modelo, caracteristicas, alvos, args.epocas,
+                                                            args.taxa, semente=args.semente):
+            print(f"época {epoca:3d}  erro de treino {erro_treino:.4f}  erro de validação {erro_teste:.4f}")
+        modelo.salvar(args.saida)
+        print(f"{len(resultados)} posições, modelo {modelo.tipo} gravado em {args.saida} "
+              f"({time.perf_counter() - inicio:.1f}s)")
@@ -0,0 +1,188 @@
+"""
+Cache persistente de posições buscadas, compartilhado entre partidas e processos.
+
+A tabela de transposição vive só na memória de um AgenteIA; este módulo
+guarda em SQLite (modo WAL: vários processos leem ao mesmo tempo enquanto
+um grava) os resultados das buscas perto da raiz, para que partidas futuras,
+em qualquer processo, comecem com a tabela aquecida.
+
+Cada registro é (perfil, chave) -> (profundidade, pontuação, tipo de limite,
+melhor coluna, último acesso). O perfil separa resultados que não se
+misturam (formato do tabuleiro, nível de avaliação e lado da Maquina); a
+chave é a de livro.getChaveLivro, exata e já com o
+espelhamento dobrado. Entre duas gravações da mesma posição vale a de maior
+profundidade.
+
+O tamanho é limitado por `max_entradas` (remoção dos menos acessados, LRU) e,
+opcionalmente, por `idade_maxima` (remoção dos não acessados há mais tempo
+que isso).
+"""
+
+import sqlite3
+import time
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS posicoes (
+    perfil TEXT NOT NULL,
+    chave BLOB NOT NULL,
+    profundidade INTEGER NOT NULL,
+    pontuacao REAL NOT NULL,
+    tipo INTEGER NOT NULL,
+    coluna INTEGER NOT NULL,
+    acesso REAL NOT NULL,
+    PRIMARY KEY (perfil, chave)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS posicoes_acesso ON posicoes (acesso);
+"""
+
+GRAVAR = """
+INSERT INTO posicoes (perfil, chave, profundidade, pontuacao, tipo, coluna, acesso)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (perfil, chave) DO UPDATE SET
+    profundidade = excluded.profundidade, pontuacao = excluded.pontuacao,
+    tipo = excluded.tipo, coluna = excluded.coluna, acesso = excluded.acesso
+WHERE excluded.profundidade >= posicoes.profundidade
+"""
+
+
+def codificarChave(chave):
+    """
+    Converte uma chave inteira (de qualquer tamanho) na forma gravada no banco.
+
+    Args:
+        chave (int): chave canônica não negativa
+
+    Returns:
+        bytes: menor representação little-endian da chave
+    """
+    return chave.to_bytes((chave.bit_length() + 7) // 8 or 1, "little")
+
+
+class CachePersistente:
+    """
+    Posições buscadas gravadas em um arquivo SQLite.
+
+    As consultas são feitas em lote (uma por jogada, com todas as posições
+    de interesse), e os acessos só são marcados na gravação seguinte, dentro
+    da mesma transação, para que leitores não disputem o bloqueio de escrita.
+    """
+
+    def __init__(self, caminho, max_entradas=1_000_000, idade_maxima=None, intervalo_poda=10_000,
+                 espera=5.0):
+        """
+        Abre (ou cria) o banco.
+
+        Args:
+            caminho (str): arquivo SQLite
+            max_entradas (int): registros mantidos depois de cada poda
+            idade_maxima (float | None): segundos sem acesso após os quais o registro é removido
+            intervalo_poda (int): gravações entre duas podas automáticas
+            espera (float): segundos aguardando o bloqueio de escrita de outro processo
+        """
+        self.caminho = caminho
+        self.max_entradas = max_entradas
+        self.idade_maxima = idade_maxima
+        self.intervalo_poda = intervalo_poda
+        self._conexao = sqlite3.connect(caminho, timeout=espera, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.executescript(ESQUEMA)
+        self._acessados = set()
+        self._gravacoes_desde_poda = 0
+        self.consultas = 0
+        self.acertos = 0
+        self.gravacoes = 0
+        self.remocoes = 0
+
+    def consultar(self, perfil, chaves):
+        """
+        Busca várias posições de uma vez.
+
+        Args:
+            perfil (str): perfil dos registros (ver AgenteIA.getPerfilCache)
+            chaves (list[int]): chaves canônicas
+
+        Returns:
+            dict[int, tuple[int, float, int, int]]: chave -> (profundidade, pontuação, tipo, coluna)
+            para as posições encontradas
+        """
+        codificadas = {codificarChave(chave): chave for chave in chaves}
+        self.consultas += len(codificadas)
+        if not codificadas:
+            return {}
+        marcadores = ",".join("?" * len(codificadas))
+        linhas = self._conexao.execute(
+            f"SELECT chave, profundidade, pontuacao, tipo, coluna FROM posicoes "
+            f"WHERE perfil = ? AND chave IN ({marcadores})", (perfil, *codificadas)).fetchall()
+        encontradas = {}
+        for chave, profundidade, pontuacao, tipo, coluna in linhas:
+            encontradas[codificadas[chave]] = (profundidade, pontuacao, tipo, coluna)
+            self._acessados.add((perfil, chave))
+        self.acertos += len(encontradas)
+        return encontradas
+
+    def gravar(self, perfil, registros):
+        """
+        Grava registros em uma única transação e marca os acessos pendentes.
+
+        Args:
+            perfil (str): perfil dos registros
+            registros (list[tuple[int, int, float, int, int]]):
+                (chave, profundidade, pontuação, tipo, coluna)
+        """
+        agora = time.time()
+        with self._conexao:
+            self._conexao.executemany(GRAVAR, [
+                (perfil, codificarChave(chave), profundidade, float(pontuacao), tipo, coluna, agora)
+                for chave, profundidade, pontuacao, tipo, coluna in registros])
+            if self._acessados:
+                self._conexao.executemany("UPDATE posicoes SET acesso = ? WHERE perfil = ? AND chave = ?",
+                                          [(agora, perfil_acesso, chave)
+                                           for perfil_acesso, chave in self._acessados])
+        self._acessados.clear()
+        self.gravacoes += len(registros)
+        self._gravacoes_desde_poda += len(registros)
+        if self._gravacoes_desde_poda >= self.intervalo_poda:
+            self.podar()
+
+    def podar(self):
+        """
+        Aplica os limites de idade e de tamanho.
+
+        Returns:
+            int: registros removidos
+        """
+        self._gravacoes_desde_poda = 0
+        removidos = 0
+        with self._conexao:
+            if self.idade_maxima is not None:
+                removidos += self._conexao.execute("DELETE FROM posicoes WHERE acesso < ?",
+                                                   (time.time() - self.idade_maxima,)).rowcount
+            excesso = self.getTamanho() - self.max_entradas
+            if excesso > 0:
+                removidos += self._conexao.execute(
+                    "DELETE FROM posicoes WHERE (perfil, chave) IN "
+                    "(SELECT perfil, chave FROM posicoes ORDER BY acesso LIMIT ?)", (excesso,)).rowcount
+        self.remocoes += removidos
+        return removidos
+
+    def getTamanho(self):
+        """Retorna a quantidade de registros no banco."""
+        return self._conexao.execute("SELECT COUNT(*) FROM posicoes").fetchone()[0]
+
+    def getEstatisticas(self):
+        """
+        Returns:
+            dict: consultas, acertos, gravações e remoções feitas por esta conexão
+        """
+        return {"consultas": self.consultas, "acertos": self.acertos,
+                "gravacoes": self.gravacoes, "remocoes": self.remocoes}
+
+    def fechar(self):
+        """Grava os acessos pendentes e fecha o banco."""
+        if self._conexao is None:
+            return
+        if self._acessados:
+            self.gravar("", [])
+        self._conexao.close()
+        self._conexao = None
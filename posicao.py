@@ -0,0 +1,201 @@
+class Posicao:
+    """
+    Posição imutável e compacta do tabuleiro, própria para guardar aos milhões.
+
+    As peças ficam em um único inteiro `dados`, no layout do BitBoard
+    (coluna c nos bits c*(linhas+1) ... c*(linhas+1)+linhas-1, de baixo para
+    cima): a máscara do jogador 1 nos bits baixos e a do jogador 2 deslocada
+    de colunas*(linhas+1) bits. Com `__slots__` não há __dict__ por instância,
+    e a igualdade/hash dependem só de (linhas, colunas, conectar, dados), então
+    posições iguais se comportam como a mesma chave em dicionários e
+    conjuntos (caches, livros, registros de partidas).
+
+    Como é imutável, copia() devolve a própria instância e jogar() devolve
+    uma nova posição.
+    """
+
+    __slots__ = ("linhas", "colunas", "dados", "conectar")
+
+    def __init__(self, linhas=6, colunas=7, dados=0, conectar=4):
+        """
+        Args:
+            linhas (int): número de linhas do tabuleiro
+            colunas (int): número de colunas do tabuleiro
+            dados (int): máscaras empacotadas (padrão: tabuleiro vazio)
+            conectar (int): peças em linha necessárias para vencer
+        """
+        self.linhas = linhas
+        self.colunas = colunas
+        self.dados = dados
+        self.conectar = conectar
+
+    @classmethod
+    def fromMascaras(cls, linhas, colunas, mascara_jogador, mascara_maquina, conectar=4):
+        """
+        Cria a posição a partir das máscaras dos dois jogadores (formato de BitBoard.getMascaras).
+
+        Returns:
+            Posicao: posição equivalente
+        """
+        return cls(linhas, colunas, mascara_jogador | (mascara_maquina << (colunas * (linhas + 1))),
+                   conectar)
+
+    @classmethod
+    def fromGrid(cls, grid, conectar=4):
+        """
+        Cria a posição a partir de uma matriz no formato de Board.grid (linha 0 = topo).
+
+        Args:
+            grid (numpy.ndarray): matriz linhas x colunas com 0, 1 ou 2
+            conectar (int): peças em linha necessárias para vencer
+
+        Returns:
+            Posicao: posição equivalente
+        """
+        linhas, colunas = grid.shape
+        altura_bits = linhas + 1
+        mascaras = [0, 0, 0]
+        for coluna in range(colunas):
+            for linha in range(linhas - 1, -1, -1):
+                jogador = grid[linha, coluna]
+                if jogador == 0:
+                    break
+                mascaras[jogador] |= 1 << (coluna * altura_bits + linhas - 1 - linha)
+        return cls.fromMascaras(linhas, colunas, mascaras[1], mascaras[2], conectar)
+
+    @classmethod
+    def fromBytes(cls, linhas, colunas, buffer, conectar=4):
+        """
+        Reconstrói a posição gravada com toBytes.
+
+        Como linhas e colunas, `conectar` não vai nos bytes: é do formato.
+
+        Returns:
+            Posicao: posição equivalente
+        """
+        return cls(linhas, colunas, int.from_bytes(buffer, "little"), conectar)
+
+    def toBytes(self):
+        """
+        Serializa as peças em tamanho fixo para o formato (13 bytes no 6x7).
+
+        Returns:
+            bytes: `dados` em little-endian
+        """
+        return self.dados.to_bytes((2 * self.colunas * (self.linhas + 1) + 7) // 8, "little")
+
+    def getMascaras(self):
+        """
+        Retorna a posição no formato aceito por BitBoard.fromMascaras.
+
+        Returns:
+            tuple[int, int, int, int]: (linhas, colunas, máscara do jogador 1, máscara do jogador 2)
+        """
+        deslocamento = self.colunas * (self.linhas + 1)
+        return (self.linhas, self.colunas, self.dados & ((1 << deslocamento) - 1),
+                self.dados >> deslocamento)
+
+    def getMascaraTotal(self):
+        """Retorna a máscara com as peças dos dois jogadores."""
+        _, _, mascara_jogador, mascara_maquina = self.getMascaras()
+        return mascara_jogador | mascara_maquina
+
+    def getAltura(self, coluna):
+        """
+        Retorna quantas peças há na coluna.
+
+        Args:
+            coluna (int): índice da coluna
+
+        Returns:
+            int: altura da coluna (0 a linhas)
+        """
+        altura_bits = self.linhas + 1
+        return ((self.getMascaraTotal() >> (coluna * altura_bits)) & ((1 << altura_bits) - 1)).bit_length()
+
+    def getMovimentos(self):
+        """Retorna o número de peças no tabuleiro."""
+        return bin(self.dados).count("1")
+
+    def isMovimentoValido(self, coluna):
+        """Verifica se a coluna existe e ainda tem espaço."""
+        return 0 <= coluna < self.colunas and self.getAltura(coluna) < self.linhas
+
+    def jogar(self, coluna, jogador):
+        """
+        Retorna a posição resultante de uma jogada válida.
+
+        Args:
+            coluna (int): índice da coluna
+            jogador (int): 1 ou 2
+
+        Returns:
+            Posicao: nova posição
+        """
+        bit = 1 << (coluna * (self.linhas + 1) + self.getAltura(coluna))
+        if jogador == 2:
+            bit <<= self.colunas * (self.linhas + 1)
+        return Posicao(self.linhas, self.colunas, self.dados | bit, self.conectar)
+
+    def getJogador(self, linha, coluna):
+        """
+        Retorna o jogador que ocupa uma célula (0 se estiver vazia).
+
+        Args:
+            linha (int): índice da linha (0 = topo, como em Board.grid)
+            coluna (int): índice da coluna
+
+        Returns:
+            int: 0, 1 ou 2
+        """
+        bit = 1 << (coluna * (self.linhas + 1) + self.linhas - 1 - linha)
+        if self.dados & bit:
+            return 1
+        if self.dados & (bit << (self.colunas * (self.linhas + 1))):
+            return 2
+        return 0
+
+    def getGrid(self):
+        """
+        Monta a matriz no formato de Board.grid.
+
+        Returns:
+            numpy.ndarray: matriz linhas x colunas (int8)
+        """
+        import numpy as np
+        grid = np.zeros((self.linhas, self.colunas), dtype=np.int8)
+        _, _, mascara_jogador, mascara_maquina = self.getMascaras()
+        altura_bits = self.linhas + 1
+        for coluna in range(self.colunas):
+            base = coluna * altura_bits
+            for altura in range(self.linhas):
+                bit = 1 << (base + altura)
+                if mascara_jogador & bit:
+                    grid[self.linhas - 1 - altura, coluna] = 1
+                elif mascara_maquina & bit:
+                    grid[self.linhas - 1 - altura, coluna] = 2
+                else:
+                    break
+        return grid
+
+    def copia(self):
+        """Posições são imutáveis: a cópia é a própria instância."""
+        return self
+
+    def __eq__(self, outra):
+        if not isinstance(outra, Posicao):
+            return NotImplemented
+        return (self.dados == outra.dados and self.linhas == outra.linhas
+                and self.colunas == outra.colunas and self.conectar == outra.conectar)
+
+    def __hash__(self):
+        return hash((self.dados, self.linhas, self.colunas, self.conectar))
+
+    def __getstate__(self):
+        return self.linhas, self.colunas, self.dados, self.conectar
+
+    def __setstate__(self, estado):
+        self.linhas, self.colunas, self.dados, self.conectar = estado
+
+    def __repr__(self):
+        return f"Posicao({self.linhas}, {self.colunas}, {self.dados:#x}, {self.conectar})"
@@ -0,0 +1,41 @@
+"""
+Contexto de multiprocessing compartilhado pelos pools de processos.
+
+A busca paralela (AgenteIA.getPool), o torneio, a análise de registros e o
+servidor criam processos auxiliares por este contexto. Onde existe, ele usa
+o método "forkserver": um processo servidor é iniciado uma única vez,
+importa MODULOS_PRECARREGADOS (NumPy e o núcleo do motor, cujas tabelas do
+formato padrão são montadas na importação) e cada processo auxiliar é um
+fork desse servidor, que já nasce com tudo carregado, em vez de repetir as
+importações como no "spawn" ou de herdar o estado (threads, pools, arquivos
+abertos) do processo principal como no "fork".
+
+Como no "spawn", o script principal é importado de novo (uma vez, no
+servidor de fork), então quem cria pools deve fazê-lo dentro de
+`if __name__ == "__main__":`.
+"""
+
+MODULOS_PRECARREGADOS = ["__main__", "concurrent.futures.process", "multiprocessing.pool",
+                         "multiprocessing.synchronize", "numpy", "zobrist", "janelas", "ameacas", "avaliador",
+                         "bitboard", "board", "solver", "agent", "modelo", "processos"]
+
+_contexto = None
+
+
+def getContexto():
+    """
+    Retorna o contexto dos pools de processos, criando-o na primeira chamada.
+
+    Returns:
+        multiprocessing.context.BaseContext: contexto "forkserver" com os módulos
+        pré-carregados, ou o contexto padrão da plataforma se não houver forkserver
+    """
+    global _contexto
+    if _contexto is None:
+        import multiprocessing
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            _contexto = multiprocessing.get_context("forkserver")
+            _contexto.set_forkserver_preload(MODULOS_PRECARREGADOS)
+        else:
+            _contexto = multiprocessing.get_context()
+    return _contexto
@@ -0,0 +1,445 @@
+"""
+Registro de partidas e análise em lote.
+
+Formato: uma partida por linha, em JSON compacto (JSONL; comprimido com
+gzip se o caminho terminar em .gz), por exemplo:
+
+    {"formato":"6x7c4","movimentos":"4453...","vencedor":2,
+     "meta":{"origem":"main","nivel":3},"motor":[null,[0.31,5376,-80.0,8],...]}
+
+    formato     linhas x colunas e peças em linha ("c")
+    movimentos  colunas jogadas a partir do jogador 1 (ver torneio.codificarMovimentos)
+    vencedor    1, 2, 0 (empate) ou null (partida interrompida)
+    meta        metadados livres (origem, nível, data, sessão...)
+    motor       por jogada: null (humano) ou [tempo, nós, pontuação, profundidade]
+
+Leitura e escrita são em fluxo, linha a linha, com memória constante
+independente do tamanho do arquivo. A análise repete cada partida com o
+AgenteIA em um pool de processos e aponta, jogada a jogada, a perda de
+pontuação em relação à melhor jogada do motor (erros graves e oscilações).
+
+Uso:
+    python registro.py resumo partidas.jsonl
+    python registro.py analisar partidas.jsonl --nivel 3 --tempo 0.2 --processos 4 --saida analise.jsonl
+"""
+
+import argparse
+import gzip
+import heapq
+import json
+import os
+import time
+from collections import deque
+
+from processos import getContexto
+from torneio import codificarMovimentos, decodificarMovimentos, getAgente
+
+CAMPOS_MOTOR = ("tempo", "nos", "pontuacao", "profundidade")
+
+# pontuação da posição logo após uma vitória, do ponto de vista de quem venceu
+# (acima de qualquer pontuação de AgenteIA.pontuacaoSolver)
+PONTUACAO_VITORIA = 200000.0
+
+
+def abrirArquivo(caminho, modo):
+    """
+    Abre um arquivo de registros em modo texto, com gzip se a extensão for .gz.
+
+    Args:
+        caminho (str): arquivo
+        modo (str): "r", "w" ou "a"
+
+    Returns:
+        io.TextIOBase: arquivo aberto
+    """
+    if caminho.endswith(".gz"):
+        return gzip.open(caminho, modo + "t", encoding="utf-8")
+    return open(caminho, modo, encoding="utf-8")
+
+
+class RegistroPartida:
+    """
+    Uma partida: formato do tabuleiro, jogadas, vencedor, metadados e estatísticas do motor.
+    """
+
+    __slots__ = ("linhas", "colunas", "conectar", "movimentos", "motor", "vencedor", "metadados")
+
+    def __init__(self, linhas=6, colunas=7, conectar=4, metadados=None):
+        """
+        Args:
+            linhas (int): número de linhas do tabuleiro
+            colunas (int): número de colunas do tabuleiro
+            conectar (int): peças em linha necessárias para vencer
+            metadados (dict | None): informações livres sobre a partida
+        """
+        self.linhas = linhas
+        self.colunas = colunas
+        self.conectar = conectar
+        self.movimentos = []
+        self.motor = []
+        self.vencedor = None
+        self.metadados = metadados or {}
+
+    def addJogada(self, coluna, tempo=None, nos=None, pontuacao=None, profundidade=None):
+        """
+        Acrescenta uma jogada; as estatísticas só são informadas nas jogadas da Maquina.
+
+        Args:
+            coluna (int): coluna jogada (0-based)
+            tempo (float | None): tempo gasto pelo motor, em segundos
+            nos (int | None): nós avaliados
+            pontuacao (float | None): pontuação da jogada para quem jogou
+            profundidade (int | None): profundidade alcançada
+        """
+        self.movimentos.append(coluna)
+        if tempo is None:
+            self.motor.append(None)
+        else:
+            self.motor.append([round(float(tempo), 6), int(nos or 0), float(pontuacao or 0.0),
+                               int(profundidade or 0)])
+
+    def getEstatisticasMotor(self, indice):
+        """
+        Returns:
+            dict | None: estatísticas da jogada `indice` por nome (ver CAMPOS_MOTOR), ou None se foi humana
+        """
+        valores = self.motor[indice]
+        return None if valores is None else dict(zip(CAMPOS_MOTOR, valores))
+
+    def paraDict(self):
+        """
+        Converte o registro para o dicionário gravado em cada linha do arquivo.
+
+        Returns:
+            dict: registro serializável em JSON
+        """
+        dados = {"formato": f"{self.linhas}x{self.colunas}c{self.conectar}",
+                 "movimentos": codificarMovimentos(self.movimentos, self.colunas),
+                 "vencedor": self.vencedor}
+        if self.metadados:
+            dados["meta"] = self.metadados
+        if any(valores is not None for valores in self.motor):
+            dados["motor"] = self.motor
+        return dados
+
+    @classmethod
+    def fromDict(cls, dados):
+        """
+        Reconstrói um registro gravado por paraDict.
+
+        Raises:
+            ValueError: se o formato ou as jogadas forem inválidos
+        """
+        try:
+            linhas, resto = dados.get("formato", "6x7c4").split("x")
+            colunas, conectar = resto.split("c")
+            registro = cls(int(linhas), int(colunas), int(conectar), dados.get("meta"))
+        except ValueError:
+            raise ValueError(f"formato de tabuleiro inválido: {dados.get('formato')!r}") from None
+        registro.movimentos = decodificarMovimentos(dados.get("movimentos", ""), registro.colunas)
+        motor = dados.get("motor")
+        registro.motor = list(motor) if motor else [None] * len(registro.movimentos)
+        if len(registro.motor) != len(registro.movimentos):
+            raise ValueError("estatísticas do motor não correspondem às jogadas")
+        registro.vencedor = dados.get("vencedor")
+        return registro
+
+    def getTabuleiros(self):
+        """
+        Repete a partida.
+
+        Yields:
+            tuple[Board, int, int]: (posição antes da jogada, jogador da vez, coluna jogada);
+            o tabuleiro é o mesmo objeto a cada passo, atualizado depois do yield
+
+        Raises:
+            ValueError: se alguma jogada for inválida na posição
+        """
+        from board import Board
+        tabuleiro = Board(self.linhas, self.colunas, self.conectar)
+        for indice, coluna in enumerate(self.movimentos):
+            jogador = 1 if indice % 2 == 0 else 2
+            if not tabuleiro.isMovimentoValido(coluna) or tabuleiro.getVencedor() != 0:
+                raise ValueError(f"jogada {indice + 1} inválida: coluna {coluna + 1}")
+            yield tabuleiro, jogador, coluna
+            tabuleiro.addPeca(coluna, jogador)
+
+
+class EscritorRegistros:
+    """
+    Grava registros em fluxo (uma linha por partida); use como gerenciador de contexto.
+    """
+
+    def __init__(self, caminho, anexar=True, descarregar=True):
+        """
+        Args:
+            caminho (str): arquivo .jsonl (ou .jsonl.gz)
+            anexar (bool): acrescenta ao fim do arquivo em vez de sobrescrevê-lo
+            descarregar (bool): descarrega o buffer a cada registro; desligue
+                em gravações em lote, em que só o arquivo completo importa
+        """
+        self.caminho = caminho
+        self.descarregar = descarregar
+        self.escritos = 0
+        self._arquivo = abrirArquivo(caminho, "a" if anexar else "w")
+
+    def escrever(self, registro):
+        """
+        Grava um registro; com `descarregar`, nenhuma partida se perde se o processo cair.
+
+        Args:
+            registro (RegistroPartida): partida a gravar
+        """
+        self._arquivo.write(json.dumps(registro.paraDict(), ensure_ascii=False, separators=(",", ":")) + "\n")
+        if self.descarregar:
+            self._arquivo.flush()
+        self.escritos += 1
+
+    def fechar(self):
+        """Fecha o arquivo."""
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+
+def lerRegistros(caminho, ignorar_invalidos=False):
+    """
+    Lê os registros em fluxo, um por vez.
+
+    Args:
+        caminho (str): arquivo .jsonl (ou .jsonl.gz)
+        ignorar_invalidos (bool): pula linhas corrompidas (por exemplo, a última
+            linha de um arquivo interrompido) em vez de lançar ValueError
+
+    Yields:
+        RegistroPartida: próxima partida do arquivo
+
+    Raises:
+        ValueError: em uma linha inválida, se ignorar_invalidos for False
+    """
+    with abrirArquivo(caminho, "r") as arquivo:
+        for numero, linha in enumerate(arquivo, 1):
+            if not linha.strip():
+                continue
+            try:
+                yield RegistroPartida.fromDict(json.loads(linha))
+            except (ValueError, AttributeError) as erro:
+                if not ignorar_invalidos:
+                    raise ValueError(f"{caminho}:{numero}: registro inválido ({erro})") from None
+
+
+# ============================================================
+# ANÁLISE
+# ============================================================
+
+def analisarPartida(registro, nivel=3, tempo_maximo=0.2, tamanho_tabela_mb=16, limiar=50.0):
+    """
+    Reavalia todas as posições de uma partida e mede a perda de cada jogada.
+
+    Cada posição é avaliada pelo AgenteIA do jogador da vez. A pontuação
+    antes da jogada é a da melhor jogada do motor; a de depois é a
+    avaliação da posição seguinte pelo oponente, com o sinal trocado (ou
+    PONTUACAO_VITORIA / 0 se a jogada venceu / empatou). A perda é a
+    diferença; é um erro grave quando passa de `limiar` e a coluna jogada
+    não é a recomendada.
+
+    Args:
+        registro (RegistroPartida): partida
+        nivel (int): nível do AgenteIA usado na análise
+        tempo_maximo (float): tempo por posição
+        tamanho_tabela_mb (float): tabela de transposição de cada agente
+        limiar (float): perda mínima para apontar um erro grave
+
+    Returns:
+        dict: movimentos, meta, jogadas (lista por jogada com jogador, coluna,
+        melhor_coluna, antes, depois, perda e erro), erros por jogador e nós avaliados
+    """
+    avaliacoes = []
+    nos = 0
+    tabuleiro = None
+    for tabuleiro, jogador, coluna in registro.getTabuleiros():
+        agente = getAgente(nivel, jogador, tempo_maximo, tamanho_tabela_mb)
+        melhor_coluna, pontuacao, _ = agente.getMelhorJogada(tabuleiro)
+        nos += agente.nos_avaliados
+        avaliacoes.append((jogador, coluna, melhor_coluna, float(pontuacao)))
+
+    final = None
+    if tabuleiro is not None:
+        vencedor = tabuleiro.getVencedor()
+        if vencedor != 0:
+            final = -PONTUACAO_VITORIA
+        elif tabuleiro.isTabuleiroCompleto():
+            final = 0.0
+        else:
+            jogador = 3 - avaliacoes[-1][0]
+            agente = getAgente(nivel, jogador, tempo_maximo, tamanho_tabela_mb)
+            final = float(agente.getMelhorJogada(tabuleiro)[1])
+            nos += agente.nos_avaliados
+
+    jogadas = []
+    erros = {1: 0, 2: 0}
+    for indice, (jogador, coluna, melhor_coluna, antes) in enumerate(avaliacoes):
+        seguinte = avaliacoes[indice + 1][3] if indice + 1 < len(avaliacoes) else final
+        depois = -seguinte
+        perda = antes - depois
+        erro = coluna != melhor_coluna and perda >= limiar
+        erros[jogador] += erro
+        jogadas.append({"jogada": indice + 1, "jogador": jogador, "coluna": coluna,
+                        "melhor_coluna": melhor_coluna, "antes": antes, "depois": depois,
+                        "perda": perda, "erro": erro})
+
+    return {"movimentos": codificarMovimentos(registro.movimentos, registro.colunas),
+            "meta": registro.metadados, "vencedor": registro.vencedor, "jogadas": jogadas,
+            "erros": erros, "nos": nos}
+
+
+def analisarRegistros(caminho, nivel=3, tempo_maximo=0.2, processos=None, tamanho_tabela_mb=16,
+                      limiar=50.0, ignorar_invalidos=False):
+    """
+    Analisa todas as partidas de um arquivo em paralelo, mantendo a ordem do arquivo.
+
+    No máximo 2 * processos partidas ficam em andamento; a memória não
+    depende do tamanho do arquivo.
+
+    Args:
+        caminho (str): arquivo de registros
+        nivel (int): nível do AgenteIA usado na análise
+        tempo_maximo (float): tempo por posição
+        processos (int | None): processos do pool (padrão: os núcleos da máquina)
+        tamanho_tabela_mb (float): tabela de transposição de cada agente
+        limiar (float): perda mínima para apontar um erro grave
+        ignorar_invalidos (bool): pula linhas corrompidas
+
+    Yields:
+        dict: resultado de analisarPartida para cada partida
+    """
+    processos = processos or os.cpu_count() or 1
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(processos, mp_context=getContexto()) as pool:
+        limite = 2 * processos
+        pendentes = deque()
+        for registro in lerRegistros(caminho, ignorar_invalidos):
+            pendentes.append(pool.submit(analisarPartida, registro, nivel, tempo_maximo,
+                                         tamanho_tabela_mb, limiar))
+            if len(pendentes) >= limite:
+                yield pendentes.popleft().result()
+        while pendentes:
+            yield pendentes.popleft().result()
+
+
+class ResumoAnalise:
+    """
+    Acumula os resultados de analisarPartida em memória constante.
+    """
+
+    def __init__(self, maiores=10):
+        """
+        Args:
+            maiores (int): quantidade de maiores perdas guardadas
+        """
+        self.maiores = maiores
+        self.partidas = 0
+        self.jogadas = 0
+        self.erros = {1: 0, 2: 0}
+        self.nos = 0
+        self._maiores_perdas = []
+
+    def adicionar(self, analise, indice):
+        """
+        Inclui a análise de uma partida.
+
+        Args:
+            analise (dict): resultado de analisarPartida
+            indice (int): posição da partida no arquivo (1 = primeira)
+        """
+        self.partidas += 1
+        self.jogadas += len(analise["jogadas"])
+        self.nos += analise["nos"]
+        for jogador, quantidade in analise["erros"].items():
+            self.erros[int(jogador)] += quantidade
+        for jogada in analise["jogadas"]:
+            item = (jogada["perda"], indice, jogada["jogada"], jogada["coluna"], jogada["melhor_coluna"])
+            if len(self._maiores_perdas) < self.maiores:
+                heapq.heappush(self._maiores_perdas, item)
+            elif item > self._maiores_perdas[0]:
+                heapq.heapreplace(self._maiores_perdas, item)
+
+    def paraDict(self):
+        """
+        Returns:
+            dict: totais, erros por jogador e maiores perdas (partida, jogada, coluna e melhor coluna 1-based)
+        """
+        return {"partidas": self.partidas, "jogadas": self.jogadas, "nos": self.nos,
+                "erros": dict(self.erros),
+                "maiores_perdas": [{"perda": perda, "partida": partida, "jogada": jogada,
+                                    "coluna": coluna + 1, "melhor_coluna": melhor + 1}
+                                   for perda, partida, jogada, coluna, melhor
+                                   in sorted(self._maiores_perdas, reverse=True)]}
+
+
+def resumirRegistros(caminho, ignorar_invalidos=False):
+    """
+    Estatísticas simples de um arquivo, sem reavaliar posições.
+
+    Returns:
+        dict: partidas, jogadas, vitórias por jogador, empates, interrompidas e tempo médio do motor
+    """
+    resumo = {"partidas": 0, "jogadas": 0, "vitorias_1": 0, "vitorias_2": 0, "empates": 0,
+              "interrompidas": 0}
+    tempo_motor, jogadas_motor = 0.0, 0
+    for registro in lerRegistros(caminho, ignorar_invalidos):
+        resumo["partidas"] += 1
+        resumo["jogadas"] += len(registro.movimentos)
+        chave = {1: "vitorias_1", 2: "vitorias_2", 0: "empates"}.get(registro.vencedor, "interrompidas")
+        resumo[chave] += 1
+        for valores in registro.motor:
+            if valores is not None:
+                tempo_motor += valores[0]
+                jogadas_motor += 1
+    resumo["tempo_medio_motor"] = tempo_motor / jogadas_motor if jogadas_motor else 0.0
+    return resumo
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Registros de partidas: resumo e análise em lote.")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    resumo = comandos.add_parser("resumo", help="contagens do arquivo, sem reavaliar")
+    resumo.add_argument("arquivo")
+    analisar = comandos.add_parser("analisar", help="reavalia as partidas e aponta erros graves")
+    analisar.add_argument("arquivo")
+    analisar.add_argument("--nivel", type=int, default=3)
+    analisar.add_argument("--tempo", type=float, default=0.2, help="tempo por posição")
+    analisar.add_argument("--processos", type=int, default=None)
+    analisar.add_argument("--tabela-mb", type=float, default=16)
+    analisar.add_argument("--limiar", type=float, default=50.0, help="perda mínima de um erro grave")
+    analisar.add_argument("--maiores", type=int, default=10, help="maiores perdas listadas")
+    analisar.add_argument("--saida", default=None, help="grava a análise de cada partida (.jsonl)")
+    for subcomando in (resumo, analisar):
+        subcomando.add_argument("--ignorar-invalidos", action="store_true")
+    args = parser.parse_args()
+
+    if args.comando == "resumo":
+        print(json.dumps(resumirRegistros(args.arquivo, args.ignorar_invalidos), indent=2))
+    else:
+        inicio = time.perf_counter()
+        total = ResumoAnalise(args.maiores)
+        saida = abrirArquivo(args.saida, "w") if args.saida else None
+        try:
+            for indice, analise in enumerate(analisarRegistros(args.arquivo, args.nivel, args.tempo, args.processos,
+                                                               args.tabela_mb, args.limiar,
+                                                               args.ignorar_invalidos), 1):
+                total.adicionar(analise, indice)
+                if saida is not None:
+                    saida.write(json.dumps(analise, ensure_ascii=False, separators=(",", ":")) + "\n")
+        finally:
+            if saida is not None:
+                saida.close()
+        relatorio = total.paraDict()
+        relatorio["tempo_total"] = time.perf_counter() - inicio
+        print(json.dumps(relatorio, indent=2))
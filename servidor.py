@@ -0,0 +1,632 @@
+"""
+Servidor assíncrono de partidas Humano x Maquina.
+
+Cada conexão (TCP ou socket Unix) conversa com o servidor por linhas JSON,
+uma requisição por linha e uma resposta por linha:
+
+    {"cmd": "novo", "nivel": 2, "humano_primeiro": true}
+        -> {"ok": true, "sessao": "3", "coluna_ia": null, "vencedor": 0}
+    {"cmd": "jogar", "sessao": "3", "coluna": 3}
+        -> {"ok": true, "coluna_ia": 2, "vencedor": 0, "tempo": 0.41, "fallback": false}
+    {"cmd": "estado", "sessao": "3"}
+        -> {"ok": true, "movimentos": "43", "vencedor": 0, "vez": "humano"}
+    {"cmd": "encerrar", "sessao": "3"}
+    {"cmd": "metricas"}
+
+Colunas vão de 0 a colunas - 1. Erros são respondidos como
+{"ok": false, "erro": "..."} sem derrubar a conexão.
+
+O estado de cada partida (Board) fica no processo do servidor; a jogada da
+Maquina é calculada em um pool limitado de processos, então o laço de
+eventos nunca bloqueia. Controle de carga:
+    - cada conexão processa uma requisição por vez e só lê a próxima linha
+      depois de responder (o TCP segura o cliente apressado);
+    - no máximo `max_pendentes` jogadas da Maquina ficam na fila; acima
+      disso a requisição é recusada com "servidor ocupado". O padrão é o
+      que o pool consegue atender dentro do limite rígido
+      (num_processos * (limite_rigido / tempo_maximo - 1)), com uma busca de
+      folga para o custo de cada jogada além da busca;
+    - cada processo recebe uma jogada por vez, e a espera na fila fica no
+      servidor. A espera por um processo livre e a execução têm, cada uma,
+      o limite rígido; se um deles estourar (processos presos em buscas
+      abandonadas) ou o processo falhar, uma jogada de emergência (coluna
+      válida mais central) é usada. A vaga de uma busca abandonada só volta
+      quando o processo termina, e um pool quebrado é recriado;
+    - o humano tem `tempo_jogada` segundos para jogar; depois disso a
+      sessão é encerrada por abandono.
+
+Com --registro, cada sessão é gravada no formato de registro.py quando é
+descartada (encerrar, desconexão ou expiração), com as estatísticas do
+motor nas jogadas da Maquina.
+
+Uso:
+    python servidor.py --porta 8765 --processos 4
+    python servidor.py --unix /tmp/connect4.sock
+    python servidor.py --simular 200 --partidas 2   # servidor + clientes locais de teste
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from bitboard import BitBoard
+from board import Board
+from processos import getContexto
+from registro import EscritorRegistros, RegistroPartida
+from torneio import getAgente
+
+
+def _calcularJogada(nivel, jogador, tempo_maximo, tamanho_tabela_mb, mascaras, caminho_cache=None):
+    """
+    Calcula a jogada da Maquina em um processo do pool.
+
+    Args:
+        nivel (int): nível de dificuldade
+        jogador (int): jogador da Maquina (1 ou 2)
+        tempo_maximo (float): orçamento de tempo da busca
+        tamanho_tabela_mb (float): tabela de transposição do agente do processo
+        mascaras (tuple): posição no formato de BitBoard.getMascaras()
+        caminho_cache (str | None): cache persistente compartilhado pelos processos
+
+    Returns:
+        tuple[int, float, float, int, int]: (coluna, pontuação, tempo gasto, nós avaliados,
+        profundidade alcançada)
+    """
+    agente = getAgente(nivel, jogador, tempo_maximo, tamanho_tabela_mb, caminho_cache)
+    tabuleiro = Board.fromBitBoard(BitBoard.fromMascaras(*mascaras))
+    coluna, pontuacao, tempo_gasto = agente.getMelhorJogada(tabuleiro)
+    return coluna, float(pontuacao), tempo_gasto, agente.nos_avaliados, agente.profundidade_alcancada
+
+
+class ErroProtocolo(Exception):
+    """Requisição inválida; a mensagem é enviada ao cliente."""
+
+
+class Sessao:
+    """
+    Estado de uma partida hospedada no servidor.
+    """
+
+    def __init__(self, identificador, nivel, humano_primeiro, linhas=6, colunas=7):
+        """
+        Args:
+            identificador (str): id da sessão
+            nivel (int): nível de dificuldade da Maquina
+            humano_primeiro (bool): se o humano é o jogador 1
+            linhas (int): número de linhas do tabuleiro
+            colunas (int): número de colunas do tabuleiro
+        """
+        self.identificador = identificador
+        self.nivel = nivel
+        self.tabuleiro = Board(linhas, colunas)
+        self.humano = 1 if humano_primeiro else 2
+        self.maquina = 3 - self.humano
+        self.registro = RegistroPartida(linhas, colunas, metadados={
+            "origem": "servidor", "sessao": identificador, "nivel": nivel, "humano": self.humano})
+        self.movimentos = self.registro.movimentos
+        self.ocupada = False
+        self.prazo_humano = None
+
+    def getVencedor(self):
+        """Retorna o vencedor (0 se ninguém venceu ainda)."""
+        return self.tabuleiro.getVencedor()
+
+    def isEncerrada(self):
+        """Retorna True se a partida terminou por vitória ou empate."""
+        return self.getVencedor() != 0 or self.tabuleiro.isTabuleiroCompleto()
+
+    def jogar(self, coluna, jogador, *estatisticas):
+        """
+        Aplica uma jogada já validada.
+
+        Args:
+            coluna (int): coluna jogada
+            jogador (int): 1 ou 2
+            *estatisticas: tempo, nós, pontuação e profundidade do motor, nas jogadas da Maquina
+        """
+        self.tabuleiro.addPeca(coluna, jogador)
+        self.registro.addJogada(coluna, *estatisticas)
+
+
+class MetricasServidor:
+    """
+    Contadores do servidor: sessões, fila de jogadas da Maquina e latências.
+    """
+
+    def __init__(self, janela=10000):
+        """
+        Args:
+            janela (int): quantidade de latências recentes mantidas para os percentis
+        """
+        self.sessoes_criadas = 0
+        self.sessoes_expiradas = 0
+        self.jogadas_ia = 0
+        self.recusadas = 0
+        self.timeouts = 0
+        self.falhas = 0
+        self.fila = 0
+        self.fila_max = 0
+        self.latencias = deque(maxlen=janela)
+        self.esperas = deque(maxlen=janela)
+
+    def entrarFila(self):
+        """Registra uma jogada da Maquina entrando na fila."""
+        self.fila += 1
+        self.fila_max = max(self.fila_max, self.fila)
+
+    def sairFila(self, latencia, tempo_busca):
+        """
+        Registra uma jogada da Maquina concluída.
+
+        Args:
+            latencia (float): tempo total visto pelo servidor, em segundos
+            tempo_busca (float): tempo gasto na busca dentro do processo
+        """
+        self.fila -= 1
+        self.jogadas_ia += 1
+        self.latencias.append(latencia)
+        self.esperas.append(max(latencia - tempo_busca, 0.0))
+
+    def paraDict(self, sessoes_ativas):
+        """
+        Args:
+            sessoes_ativas (int): sessões abertas no momento
+
+        Returns:
+            dict: contadores e percentis (p50/p90/p99) de latência e de espera na fila
+        """
+        dados = {
+            "sessoes_ativas": sessoes_ativas,
+            "sessoes_criadas": self.sessoes_criadas,
+            "sessoes_expiradas": self.sessoes_expiradas,
+            "jogadas_ia": self.jogadas_ia,
+            "recusadas": self.recusadas,
+            "timeouts": self.timeouts,
+            "falhas": self.falhas,
+            "fila": self.fila,
+            "fila_max": self.fila_max,
+        }
+        for nome, valores in (("latencia", self.latencias), ("espera_fila", self.esperas)):
+            if valores:
+                p50, p90, p99 = np.percentile(valores, (50, 90, 99)).tolist()
+                dados[nome] = {"p50": p50, "p90": p90, "p99": p99, "max": max(valores)}
+            else:
+                dados[nome] = None
+        return dados
+
+
+class ServidorJogos:
+    """
+    Servidor asyncio que hospeda muitas sessões simultâneas.
+    """
+
+    def __init__(self, num_processos=2, max_pendentes=None, tempo_maximo=1.0, tempo_jogada=300.0,
+                 tamanho_tabela_mb=4, executor=None, caminho_cache=None, caminho_registro=None):
+        """
+        Args:
+            num_processos (int): processos do pool que calculam as jogadas da Maquina
+            max_pendentes (int | None): jogadas da Maquina aceitas na fila antes de recusar
+                novas (padrão: as que o pool termina dentro de `limite_rigido`, com uma busca de folga)
+            tempo_maximo (float): orçamento de busca por jogada da Maquina
+            tempo_jogada (float): tempo que o humano tem para jogar antes da sessão expirar
+            tamanho_tabela_mb (float): tabela de transposição de cada agente no pool
+            executor (Executor | None): pool já criado, com `num_processos` processos
+                (padrão: ProcessPoolExecutor próprio)
+            caminho_cache (str | None): banco SQLite do cache persistente de posições,
+                lido e gravado por todos os processos do pool
+            caminho_registro (str | None): arquivo em que as partidas descartadas são acrescentadas
+        """
+        self.num_processos = num_processos
+        self.tempo_maximo = tempo_maximo
+        self.tempo_jogada = tempo_jogada
+        self.tamanho_tabela_mb = tamanho_tabela_mb
+        self.caminho_cache = caminho_cache
+        self.caminho_registro = caminho_registro
+        self._registros = None
+        self.limite_rigido = 2 * tempo_maximo + 1.0
+        if max_pendentes is None:
+            max_pendentes = max(num_processos, round(num_processos * (self.limite_rigido / tempo_maximo - 1)))
+        self.max_pendentes = max_pendentes
+        self._vagas = asyncio.Semaphore(num_processos)
+        self.sessoes = {}
+        self.metricas = MetricasServidor()
+        self._executor = executor
+        self._proprio_executor = executor is None
+        self._proximo_id = 0
+        self._servidor = None
+        self._limpeza = None
+        self._conexoes = {}
+
+    async def iniciar(self, host="127.0.0.1", porta=8765, caminho_unix=None):
+        """
+        Abre o socket de escuta e a tarefa que expira sessões abandonadas.
+
+        Args:
+            host (str): endereço TCP
+            porta (int): porta TCP (0 escolhe uma livre)
+            caminho_unix (str | None): se informado, escuta em um socket Unix em vez de TCP
+
+        Returns:
+            asyncio.AbstractServer: servidor em execução
+        """
+        if self._executor is None:
+            self._executor = self.criarExecutor()
+        if self.caminho_registro and self._registros is None:
+            self._registros = EscritorRegistros(self.caminho_registro)
+        if caminho_unix:
+            self._servidor = await asyncio.start_unix_server(self.atenderConexao, caminho_unix)
+        else:
+            self._servidor = await asyncio.start_server(self.atenderConexao, host, porta)
+        self._limpeza = asyncio.create_task(self.expirarSessoes())
+        return self._servidor
+
+    async def fechar(self):
+        """
+        Para de aceitar conexões, fecha as abertas e libera o pool.
+
+        As conexões são fechadas pelo socket, não canceladas: cada uma
+        termina a requisição em andamento e sai do laço de leitura.
+        """
+        if self._limpeza is not None:
+            self._limpeza.cancel()
+        if self._servidor is not None:
+            self._servidor.close()
+            for escritor in list(self._conexoes.values()):
+                escritor.close()
+            await asyncio.gather(*self._conexoes, return_exceptions=True)
+            await self._servidor.wait_closed()
+        if self._proprio_executor and self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        for identificador in list(self.sessoes):
+            self.removerSessao(identificador)
+        if self._registros is not None:
+            self._registros.fechar()
+            self._registros = None
+
+    def criarExecutor(self):
+        """Cria o pool de processos próprio do servidor."""
+        return ProcessPoolExecutor(self.num_processos, mp_context=getContexto())
+
+    def getEndereco(self):
+        """Retorna o endereço em que o servidor escuta (host, porta) ou o caminho do socket Unix."""
+        return self._servidor.sockets[0].getsockname()
+
+    async def atenderConexao(self, leitor, escritor):
+        """
+        Atende uma conexão até o cliente desconectar; as sessões criadas nela são descartadas no fim.
+        """
+        sessoes_conexao = set()
+        tarefa = asyncio.current_task()
+        self._conexoes[tarefa] = escritor
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                try:
+                    requisicao = json.loads(linha)
+                    if not isinstance(requisicao, dict):
+                        raise ErroProtocolo("requisição deve ser um objeto JSON")
+                    resposta = await self.processar(requisicao, sessoes_conexao)
+                except (ErroProtocolo, ValueError) as erro:
+                    resposta = {"ok": False, "erro": str(erro)}
+                escritor.write(json.dumps(resposta).encode() + b"\n")
+                await escritor.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._conexoes.pop(tarefa, None)
+            for identificador in sessoes_conexao:
+                self.removerSessao(identificador)
+            escritor.close()
+
+    async def processar(self, requisicao, sessoes_conexao):
+        """
+        Executa uma requisição do protocolo.
+
+        Args:
+            requisicao (dict): requisição decodificada
+            sessoes_conexao (set[str]): sessões abertas pela conexão atual
+
+        Returns:
+            dict: resposta a ser enviada
+
+        Raises:
+            ErroProtocolo: se a requisição for inválida
+        """
+        comando = requisicao.get("cmd")
+        if comando == "metricas":
+            return {"ok": True, **self.metricas.paraDict(len(self.sessoes))}
+        if comando == "novo":
+            return await self.novaSessao(requisicao, sessoes_conexao)
+
+        sessao = self.sessoes.get(str(requisicao.get("sessao")))
+        if sessao is None:
+            raise ErroProtocolo("sessão inexistente ou expirada")
+        if comando == "jogar":
+            return await self.jogarHumano(sessao, requisicao.get("coluna"))
+        if comando == "estado":
+            return {"ok": True, "movimentos": "".join(str(c + 1) for c in sessao.movimentos),
+                    "vencedor": sessao.getVencedor(),
+                    "vez": "humano" if not sessao.isEncerrada() and not sessao.ocupada else None}
+        if comando == "encerrar":
+            self.removerSessao(sessao.identificador)
+            sessoes_conexao.discard(sessao.identificador)
+            return {"ok": True}
+        raise ErroProtocolo(f"comando desconhecido: {comando}")
+
+    def removerSessao(self, identificador):
+        """
+        Descarta uma sessão, gravando a partida se houver arquivo de registros.
+
+        Args:
+            identificador (str): id da sessão (ignorado se já foi removida)
+        """
+        sessao = self.sessoes.pop(identificador, None)
+        if sessao is None or self._registros is None or not sessao.movimentos:
+            return
+        if sessao.isEncerrada():
+            sessao.registro.vencedor = sessao.getVencedor()
+        self._registros.escrever(sessao.registro)
+
+    async def novaSessao(self, requisicao, sessoes_conexao):
+        """Cria uma sessão; se a Maquina começa, já responde com a primeira jogada dela."""
+        nivel = requisicao.get("nivel", 2)
+        if nivel not in (1, 2, 3):
+            raise ErroProtocolo("nível deve ser 1, 2 ou 3")
+        humano_primeiro = bool(requisicao.get("humano_primeiro", True))
+        if not humano_primeiro:
+            self.verificarCapacidade()
+        self._proximo_id += 1
+        sessao = Sessao(str(self._proximo_id), nivel, humano_primeiro)
+        self.sessoes[sessao.identificador] = sessao
+        sessoes_conexao.add(sessao.identificador)
+        self.metricas.sessoes_criadas += 1
+
+        resposta = {"ok": True, "sessao": sessao.identificador, "coluna_ia": None, "vencedor": 0}
+        if sessao.maquina == 1:
+            resposta.update(await self.jogarMaquina(sessao))
+        sessao.prazo_humano = time.monotonic() + self.tempo_jogada
+        return resposta
+
+    async def jogarHumano(self, sessao, coluna):
+        """Aplica a jogada do humano e, se a partida continuar, a resposta da Maquina."""
+        if sessao.ocupada:
+            raise ErroProtocolo("aguarde a jogada da Maquina")
+        if sessao.isEncerrada():
+            raise ErroProtocolo("partida encerrada")
+        if not isinstance(coluna, int) or not 0 <= coluna < sessao.tabuleiro.colunas \
+                or not sessao.tabuleiro.isMovimentoValido(coluna):
+            raise ErroProtocolo("coluna inválida")
+        self.verificarCapacidade()
+
+        sessao.jogar(coluna, sessao.humano)
+        resposta = {"ok": True, "coluna_ia": None, "vencedor": sessao.getVencedor()}
+        if not sessao.isEncerrada():
+            resposta.update(await self.jogarMaquina(sessao))
+        sessao.prazo_humano = time.monotonic() + self.tempo_jogada
+        return resposta
+
+    def verificarCapacidade(self):
+        """
+        Recusa a requisição se a fila de jogadas da Maquina está cheia.
+
+        Raises:
+            ErroProtocolo: com "servidor ocupado", para o cliente tentar de novo
+        """
+        if self.metricas.fila >= self.max_pendentes:
+            self.metricas.recusadas += 1
+            raise ErroProtocolo("servidor ocupado, tente novamente")
+
+    async def jogarMaquina(self, sessao):
+        """
+        Envia a posição ao pool e aplica a jogada da Maquina.
+
+        A jogada espera uma vaga (um processo livre) antes de ser enviada, e
+        a espera e a execução têm, cada uma, `limite_rigido`. Com o
+        `max_pendentes` padrão, uma fila que anda se esvazia dentro dele; o
+        limite da espera só estoura com processos presos em buscas
+        abandonadas, cuja vaga continua ocupada até o processo terminar.
+
+        Se o limite estourar ou o processo falhar, a resposta é a jogada de
+        emergência, com `fallback`. Um pool próprio quebrado
+        (BrokenProcessPool) é substituído por um novo.
+
+        Returns:
+            dict: coluna_ia, vencedor, tempo (latência vista pelo servidor) e fallback
+        """
+        sessao.ocupada = True
+        sessao.prazo_humano = None
+        mascaras = sessao.tabuleiro.toBitBoard().getMascaras()
+        inicio = time.perf_counter()
+        self.metricas.entrarFila()
+        tempo_busca, fallback, estatisticas = 0.0, False, ()
+        executor = self._executor
+        try:
+            await asyncio.wait_for(self._vagas.acquire(), self.limite_rigido)
+            try:
+                futuro = asyncio.get_running_loop().run_in_executor(
+                    executor, _calcularJogada, sessao.nivel, sessao.maquina, self.tempo_maximo,
+                    self.tamanho_tabela_mb, mascaras, self.caminho_cache)
+            except BaseException:
+                self._vagas.release()
+                raise
+            futuro.add_done_callback(lambda _: self._vagas.release())
+            coluna, pontuacao, tempo_busca, nos, profundidade = await asyncio.wait_for(
+                asyncio.shield(futuro), self.limite_rigido)
+            estatisticas = (tempo_busca, nos, pontuacao, profundidade)
+        except asyncio.TimeoutError:
+            self.metricas.timeouts += 1
+            coluna, fallback = self.getJogadaEmergencia(sessao.tabuleiro), True
+        except Exception as erro:
+            self.metricas.falhas += 1
+            if isinstance(erro, BrokenProcessPool):
+                self.substituirExecutor(executor)
+            coluna, fallback = self.getJogadaEmergencia(sessao.tabuleiro), True
+        finally:
+            latencia = time.perf_counter() - inicio
+            self.metricas.sairFila(latencia, tempo_busca)
+            sessao.ocupada = False
+
+        sessao.jogar(coluna, sessao.maquina, *estatisticas)
+        return {"coluna_ia": coluna, "vencedor": sessao.getVencedor(), "tempo": round(latencia, 6),
+                "fallback": fallback}
+
+    def substituirExecutor(self, quebrado):
+        """
+        Troca o pool próprio quebrado por um novo.
+
+        Só a primeira jogada que encontra o pool quebrado o substitui; um
+        executor recebido de fora não é recriado.
+
+        Args:
+            quebrado (Executor): pool em que a jogada falhou
+        """
+        if not self._proprio_executor or self._executor is not quebrado:
+            return
+        quebrado.shutdown(wait=False, cancel_futures=True)
+        self._executor = self.criarExecutor()
+
+    def getJogadaEmergencia(self, tabuleiro):
+        """Retorna a coluna válida mais próxima do centro."""
+        centro = tabuleiro.colunas // 2
+        return min(tabuleiro.getMovimentosValidos(), key=lambda c: (abs(c - centro), c))
+
+    async def expirarSessoes(self, intervalo=1.0):
+        """Encerra periodicamente as sessões em que o humano passou do tempo de jogada."""
+        while True:
+            await asyncio.sleep(intervalo)
+            agora = time.monotonic()
+            expiradas = [s.identificador for s in self.sessoes.values()
+                         if s.prazo_humano is not None and s.prazo_humano < agora]
+            for identificador in expiradas:
+                self.removerSessao(identificador)
+            self.metricas.sessoes_expiradas += len(expiradas)
+
+
+async def clienteAleatorio(endereco, partidas=1, nivel=1, semente=0):
+    """
+    Cliente de teste: joga partidas com jogadas aleatórias válidas.
+
+    Args:
+        endereco (tuple | str): (host, porta) TCP ou caminho do socket Unix
+        partidas (int): partidas jogadas em sequência na mesma conexão
+        nivel (int): nível da Maquina
+        semente (int): semente das jogadas
+
+    Returns:
+        list[int]: vencedor de cada partida
+    """
+    if isinstance(endereco, str):
+        leitor, escritor = await asyncio.open_unix_connection(endereco)
+    else:
+        leitor, escritor = await asyncio.open_connection(*endereco)
+    gerador = random.Random(semente)
+
+    async def enviar(requisicao):
+        while True:
+            escritor.write(json.dumps(requisicao).encode() + b"\n")
+            await escritor.drain()
+            resposta = json.loads(await leitor.readline())
+            if resposta.get("erro", "").startswith("servidor ocupado"):
+                await asyncio.sleep(0.05)
+                continue
+            return resposta
+
+    vencedores = []
+    try:
+        for _ in range(partidas):
+            humano_primeiro = gerador.random() < 0.5
+            resposta = await enviar({"cmd": "novo", "nivel": nivel, "humano_primeiro": humano_primeiro})
+            sessao = resposta["sessao"]
+            tabuleiro = Board()
+            humano = 1 if humano_primeiro else 2
+            if resposta["coluna_ia"] is not None:
+                tabuleiro.addPeca(resposta["coluna_ia"], 3 - humano)
+            while resposta["vencedor"] == 0 and not tabuleiro.isTabuleiroCompleto():
+                coluna = gerador.choice(tabuleiro.getMovimentosValidos())
+                tabuleiro.addPeca(coluna, humano)
+                resposta = await enviar({"cmd": "jogar", "sessao": sessao, "coluna": coluna})
+                if not resposta["ok"]:
+                    raise RuntimeError(resposta["erro"])
+                if resposta["coluna_ia"] is not None:
+                    tabuleiro.addPeca(resposta["coluna_ia"], 3 - humano)
+            vencedores.append(resposta["vencedor"])
+            await enviar({"cmd": "encerrar", "sessao": sessao})
+    finally:
+        escritor.close()
+        await escritor.wait_closed()
+    return vencedores
+
+
+async def simularCarga(clientes, partidas, nivel, num_processos, max_pendentes, tempo_maximo, caminho_unix=None,
+                       caminho_registro=None):
+    """
+    Sobe um servidor local e conecta `clientes` clientes aleatórios simultâneos.
+
+    Com `caminho_registro`, as partidas simuladas são gravadas (ver registro.py).
+
+    Returns:
+        dict: métricas do servidor ao fim da simulação, com duração e partidas por segundo
+    """
+    servidor = ServidorJogos(num_processos, max_pendentes, tempo_maximo, caminho_registro=caminho_registro)
+    await servidor.iniciar("127.0.0.1", 0, caminho_unix)
+    inicio = time.perf_counter()
+    try:
+        resultados = await asyncio.gather(*(clienteAleatorio(servidor.getEndereco(), partidas, nivel, semente)
+                                             for semente in range(clientes)))
+    finally:
+        await servidor.fechar()
+    duracao = time.perf_counter() - inicio
+    metricas = servidor.metricas.paraDict(len(servidor.sessoes))
+    metricas["duracao"] = duracao
+    metricas["partidas_por_segundo"] = sum(len(r) for r in resultados) / duracao
+    return metricas
+
+
+async def _executarServidor(args):
+    servidor = ServidorJogos(args.processos, args.max_pendentes, args.tempo, args.tempo_jogada, args.tabela_mb,
+                             caminho_cache=args.cache, caminho_registro=args.registro)
+    await servidor.iniciar(args.host, args.porta, args.unix)
+    print(f"Escutando em {servidor.getEndereco()}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await servidor.fechar()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor assíncrono de partidas contra o AgenteIA.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="caminho de socket Unix (em vez de TCP)")
+    parser.add_argument("--processos", type=int, default=2)
+    parser.add_argument("--max-pendentes", type=int, default=None,
+                        help="jogadas da Maquina na fila (padrão: as que o pool atende dentro do limite rígido)")
+    parser.add_argument("--tempo", type=float, default=1.0, help="tempo máximo por jogada da Maquina")
+    parser.add_argument("--tempo-jogada", type=float, default=300.0, help="tempo do humano antes de expirar")
+    parser.add_argument("--tabela-mb", type=float, default=4)
+    parser.add_argument("--cache", default=None, help="banco SQLite do cache persistente de posições")
+    parser.add_argument("--registro", default=None, help="arquivo .jsonl em que as partidas são gravadas")
+    parser.add_argument("--simular", type=int, default=0, help="clientes de teste simultâneos")
+    parser.add_argument("--partidas", type=int, default=1, help="partidas por cliente de teste")
+    parser.add_argument("--nivel", type=int, default=1, help="nível da Maquina na simulação")
+    args = parser.parse_args()
+
+    try:
+        if args.simular:
+            print(json.dumps(asyncio.run(simularCarga(args.simular, args.partidas, args.nivel, args.processos,
+                                                      args.max_pendentes, args.tempo, args.unix,
+                                                      args.registro)), indent=2))
+        else:
+            asyncio.run(_executarServidor(args))
+    except KeyboardInterrupt:
+        pass
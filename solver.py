@@ -0,0 +1,357 @@
+import time
+
+from bitboard import getCasasAlinhadas, temSequencia
+from excecoes import TempoEsgotado
+from transposicao import TabelaTransposicao, LIMITE_INFERIOR, LIMITE_SUPERIOR
+
+
+class Solver:
+    """
+    Resolvedor exato (jogo perfeito) de posições de Connect Four.
+
+    Usa negamax com poda alfa-beta sobre máscaras de bits no layout do
+    BitBoard, com:
+        - busca por janela nula (MTD por bisseção) em torno do valor exato;
+        - poda de jogadas perdedoras: só são expandidas as colunas que não
+          entregam uma vitória imediata ao oponente, e um bloqueio
+          obrigatório é jogado sem considerar as outras colunas;
+        - ordenação por ameaças: as jogadas que criam mais casas vencedoras
+          vêm primeiro, desempatadas pela ordem de colunas recebida
+          (por padrão, do centro para as bordas);
+        - tabela de transposição com limites superior e inferior.
+
+    Pontuação (sempre do ponto de vista de quem joga):
+        0 para empate; positiva se quem joga vence, e tanto maior quanto
+        mais cedo a vitória acontece: (casas + 1 - jogadas_ate_vitoria) // 2.
+        Negativa, com o mesmo módulo, se quem joga perde.
+
+    Internamente uma posição é o par (atual, mascara): as peças de quem
+    joga e todas as peças do tabuleiro.
+    """
+
+    def __init__(self, linhas=6, colunas=7, ordem_colunas=None, tamanho_tabela_mb=16, conectar=4):
+        """
+        Prepara as máscaras do formato e a tabela de transposição.
+
+        Args:
+            linhas (int): número de linhas do tabuleiro
+            colunas (int): número de colunas do tabuleiro
+            ordem_colunas (list[int] | None): ordem de exploração das colunas
+                (padrão: do centro para as bordas)
+            tamanho_tabela_mb (float): teto de memória da tabela de transposição
+            conectar (int): peças em linha necessárias para vencer
+        """
+        self.linhas = linhas
+        self.colunas = colunas
+        self.conectar = conectar
+        self.altura_bits = linhas + 1
+        self.total_casas = linhas * colunas
+        self.mascaras_coluna = [((1 << linhas) - 1) << (c * self.altura_bits) for c in range(colunas)]
+        self.mascara_base = sum(1 << (c * self.altura_bits) for c in range(colunas))
+        self.mascara_tabuleiro = self.mascara_base * ((1 << linhas) - 1)
+        # linhas ímpares (1a, 3a, ... a partir da base) favorecem quem começa;
+        # as pares, o segundo jogador
+        self.linhas_impares = self.mascara_base * sum(1 << altura for altura in range(0, linhas, 2))
+        self.linhas_pares = self.mascara_tabuleiro ^ self.linhas_impares
+        if ordem_colunas is None:
+            centro = colunas // 2
+            ordem_colunas = sorted(range(colunas), key=lambda c: (abs(c - centro), c))
+        self.ordem_colunas = list(ordem_colunas)
+        self.tabela = TabelaTransposicao(tamanho_tabela_mb)
+        self.nos_avaliados = 0
+        self.prazo = None
+        self.cancelamento = None
+
+    # ============================================================
+    # OPERAÇÕES SOBRE MÁSCARAS
+    # ============================================================
+
+    def getCasasVencedoras(self, atual, mascara):
+        """
+        Calcula as casas vazias que completariam a linha para as peças em `atual`.
+
+        Args:
+            atual (int): peças do jogador analisado
+            mascara (int): todas as peças do tabuleiro
+
+        Returns:
+            int: máscara das casas vazias vencedoras (jogáveis ou não)
+        """
+        r = getCasasAlinhadas(atual, self.altura_bits, self.conectar)
+        return r & (self.mascara_tabuleiro ^ mascara)
+
+    def getJogaveis(self, mascara):
+        """
+        Retorna a máscara das casas onde uma peça pode ser colocada agora.
+
+        Args:
+            mascara (int): todas as peças do tabuleiro
+
+        Returns:
+            int: uma casa (a mais baixa livre) por coluna não cheia
+        """
+        return (mascara + self.mascara_base) & self.mascara_tabuleiro
+
+    def podeVencerAgora(self, atual, mascara):
+        """
+        Verifica se quem joga tem uma vitória imediata.
+
+        Returns:
+            bool: True se alguma casa jogável completa a linha
+        """
+        return bool(self.getCasasVencedoras(atual, mascara) & self.getJogaveis(mascara))
+
+    def getJogadasNaoPerdedoras(self, atual, mascara):
+        """
+        Filtra as jogadas que não entregam uma vitória imediata ao oponente.
+
+        Se o oponente tem uma casa vencedora jogável, a única jogada útil é
+        bloqueá-la; com duas ou mais, todas as jogadas perdem.
+
+        Returns:
+            int: máscara das casas jogáveis que não perdem no lance seguinte
+        """
+        jogaveis = self.getJogaveis(mascara)
+        vitorias_oponente = self.getCasasVencedoras(atual ^ mascara, mascara)
+        obrigatorias = jogaveis & vitorias_oponente
+        if obrigatorias:
+            if obrigatorias & (obrigatorias - 1):
+                return 0
+            jogaveis = obrigatorias
+        return jogaveis & ~(vitorias_oponente >> 1)
+
+    def pontuarJogada(self, atual, mascara, jogada, linhas_favoraveis):
+        """
+        Pontua uma jogada pelas casas vencedoras que ela cria (ameaças), com peso dobrado
+        para as ameaças em linhas de paridade favorável a quem joga.
+
+        No fim da partida, quem começa tende a conseguir ocupar as casas das
+        linhas ímpares e o segundo jogador as das pares (zugzwang), então só
+        as ameaças da paridade certa costumam decidir a partida.
+
+        Args:
+            atual (int): peças de quem joga
+            mascara (int): todas as peças do tabuleiro
+            jogada (int): casa da jogada
+            linhas_favoraveis (int): linhas_impares ou linhas_pares, conforme quem joga
+
+        Returns:
+            int: quantidade de casas vencedoras após a jogada, mais as de paridade favorável
+        """
+        ameacas = self.getCasasVencedoras(atual | jogada, mascara | jogada)
+        return bin(ameacas).count("1") + bin(ameacas & linhas_favoraveis).count("1")
+
+    # ============================================================
+    # BUSCA
+    # ============================================================
+
+    def negamax(self, atual, mascara, movimentos, alfa, beta):
+        """
+        Negamax com poda alfa-beta sobre uma posição sem vitória imediata para quem joga.
+
+        Args:
+            atual (int): peças de quem joga
+            mascara (int): todas as peças do tabuleiro
+            movimentos (int): quantidade de peças no tabuleiro
+            alfa (int): limite inferior da janela
+            beta (int): limite superior da janela
+
+        Returns:
+            int: pontuação exata se estiver dentro de (alfa, beta); caso contrário, um limite
+
+        Raises:
+            TempoEsgotado: se o prazo definido em `prazo` expirar ou se
+                `cancelamento` (threading.Event opcional) for sinalizado
+        """
+        self.nos_avaliados += 1
+        if (self.prazo is not None and self.nos_avaliados & 1023 == 0
+                and (time.perf_counter() > self.prazo
+                     or (self.cancelamento is not None and self.cancelamento.is_set()))):
+            raise TempoEsgotado()
+
+        proximas = self.getJogadasNaoPerdedoras(atual, mascara)
+        if not proximas:
+            return -((self.total_casas - movimentos) // 2)
+        if movimentos >= self.total_casas - 2:
+            return 0
+
+        minimo = -((self.total_casas - 2 - movimentos) // 2)
+        if alfa < minimo:
+            alfa = minimo
+            if alfa >= beta:
+                return alfa
+        maximo = (self.total_casas - 1 - movimentos) // 2
+        if beta > maximo:
+            beta = maximo
+            if alfa >= beta:
+                return beta
+
+        vazias = self.mascara_tabuleiro ^ mascara
+        if beta > 0 and not temSequencia(atual | vazias, self.altura_bits, self.conectar):
+            beta = 0
+            if alfa >= beta:
+                return beta
+        if alfa < 0 and not temSequencia((atual ^ mascara) | vazias, self.altura_bits, self.conectar):
+            alfa = 0
+            if alfa >= beta:
+                return alfa
+
+        chave = atual + mascara
+        entrada = self.tabela.consultar(chave)
+        if entrada is not None:
+            _, valor, tipo, _ = entrada
+            valor = int(valor)
+            if tipo == LIMITE_SUPERIOR:
+                if beta > valor:
+                    beta = valor
+                    if alfa >= beta:
+                        return beta
+            elif alfa < valor:
+                alfa = valor
+                if alfa >= beta:
+                    return alfa
+
+        restantes = min(self.total_casas - movimentos, 127)
+        for coluna, jogada in self.ordenarJogadas(atual, mascara, proximas, movimentos):
+            pontuacao = -self.negamax(atual ^ mascara, mascara | jogada, movimentos + 1, -beta, -alfa)
+            if pontuacao >= beta:
+                self.tabela.gravar(chave, restantes, pontuacao, LIMITE_INFERIOR, coluna)
+                return pontuacao
+            if pontuacao > alfa:
+                alfa = pontuacao
+
+        self.tabela.gravar(chave, restantes, alfa, LIMITE_SUPERIOR, -1)
+        return alfa
+
+    def ordenarJogadas(self, atual, mascara, proximas, movimentos):
+        """
+        Ordena as jogadas candidatas pelas ameaças criadas (ver pontuarJogada), desempatando pela ordem de colunas.
+
+        Returns:
+            list[tuple[int, int]]: pares (coluna, máscara da jogada)
+        """
+        favoraveis = self.linhas_impares if movimentos % 2 == 0 else self.linhas_pares
+        candidatas = []
+        for indice, coluna in enumerate(self.ordem_colunas):
+            jogada = proximas & self.mascaras_coluna[coluna]
+            if jogada:
+                candidatas.append((-self.pontuarJogada(atual, mascara, jogada, favoraveis),
+                                   indice, coluna, jogada))
+        candidatas.sort()
+        return [(coluna, jogada) for _, _, coluna, jogada in candidatas]
+
+    def resolverMascaras(self, atual, mascara, movimentos):
+        """
+        Calcula o valor exato da posição com buscas por janela nula.
+
+        A janela [minimo, maximo] é reduzida por bisseção; cada passo é uma
+        busca negamax com janela (med, med + 1), que apenas responde se o valor
+        está acima ou abaixo de med. Os pontos de teste são puxados para perto
+        de zero, onde buscas estreitas são mais baratas.
+
+        Returns:
+            int: pontuação exata para quem joga
+        """
+        if self.podeVencerAgora(atual, mascara):
+            return (self.total_casas + 1 - movimentos) // 2
+        minimo = -((self.total_casas - movimentos) // 2)
+        maximo = (self.total_casas + 1 - movimentos) // 2
+        while minimo < maximo:
+            med = minimo + (maximo - minimo) // 2
+            if med <= 0 and int(minimo / 2) < med:
+                med = int(minimo / 2)
+            elif med >= 0 and int(maximo / 2) > med:
+                med = int(maximo / 2)
+            r = self.negamax(atual, mascara, movimentos, med, med + 1)
+            if r <= med:
+                maximo = r
+            else:
+                minimo = r
+        return minimo
+
+    def getMascarasPosicao(self, tabuleiro, jogador):
+        """
+        Converte um BitBoard para o par (atual, mascara) do ponto de vista de `jogador`.
+
+        Returns:
+            tuple[int, int, int]: (atual, mascara, movimentos)
+        """
+        mascara = tabuleiro.posicoes[1] | tabuleiro.posicoes[2]
+        return tabuleiro.posicoes[jogador], mascara, tabuleiro.movimentos
+
+    def resolver(self, tabuleiro, jogador, prazo=None):
+        """
+        Calcula o valor exato de uma posição para o jogador da vez.
+
+        Args:
+            tabuleiro (BitBoard): posição sem vencedor
+            jogador (int): jogador da vez (1 ou 2)
+            prazo (float | None): limite em time.perf_counter()
+
+        Returns:
+            int: pontuação exata para `jogador`
+
+        Raises:
+            TempoEsgotado: se o prazo expirar antes do fim
+        """
+        self.prazo = prazo
+        try:
+            return self.resolverMascaras(*self.getMascarasPosicao(tabuleiro, jogador))
+        finally:
+            self.prazo = None
+
+    def getMelhorJogada(self, tabuleiro, jogador, prazo=None):
+        """
+        Encontra uma jogada ótima para o jogador da vez.
+
+        Primeiro o valor exato da posição é calculado; em seguida, com a
+        tabela já preenchida, cada coluna não perdedora é testada com uma
+        janela nula até encontrar uma que atinja esse valor.
+
+        Args:
+            tabuleiro (BitBoard): posição sem vencedor e com jogadas disponíveis
+            jogador (int): jogador da vez (1 ou 2)
+            prazo (float | None): limite em time.perf_counter()
+
+        Returns:
+            tuple[int, int]: (coluna, pontuação exata para `jogador`)
+
+        Raises:
+            TempoEsgotado: se o prazo expirar antes do fim
+        """
+        self.prazo = prazo
+        try:
+            atual, mascara, movimentos = self.getMascarasPosicao(tabuleiro, jogador)
+            jogaveis = self.getJogaveis(mascara)
+            vitorias = self.getCasasVencedoras(atual, mascara) & jogaveis
+            if vitorias:
+                return self.getColuna(vitorias), (self.total_casas + 1 - movimentos) // 2
+
+            valor = self.resolverMascaras(atual, mascara, movimentos)
+            proximas = self.getJogadasNaoPerdedoras(atual, mascara)
+            if not proximas:
+                ameacas = self.getCasasVencedoras(atual ^ mascara, mascara) & jogaveis
+                return self.getColuna(ameacas or jogaveis), valor
+
+            for coluna, jogada in self.ordenarJogadas(atual, mascara, proximas, movimentos):
+                r = self.negamax(atual ^ mascara, mascara | jogada, movimentos + 1, -valor, -valor + 1)
+                if -r >= valor:
+                    return coluna, valor
+            return self.getColuna(proximas), valor
+        finally:
+            self.prazo = None
+
+    def getColuna(self, casas):
+        """
+        Retorna a primeira coluna, na ordem de exploração, que contém alguma das casas.
+
+        Args:
+            casas (int): máscara de casas
+
+        Returns:
+            int: índice da coluna
+        """
+        for coluna in self.ordem_colunas:
+            if casas & self.mascaras_coluna[coluna]:
+                return coluna
+        return -1
@@ -0,0 +1,222 @@
+"""
+Telemetria da busca do AgenteIA.
+
+EstatisticasBusca reúne os contadores de uma chamada a getMelhorJogada:
+nós por profundidade, cortes beta, avaliações, uso das caches, tempo de
+cada iteração do aprofundamento iterativo e a variação principal.
+AmostradorPerfil é um perfilador por amostragem de baixo custo, alternativa
+ao cProfile para medir em produção.
+"""
+
+import sys
+import threading
+from collections import Counter
+
+
+class EstatisticasBusca:
+    """
+    Estatísticas estruturadas de uma busca.
+
+    Atributos:
+        nos_por_profundidade (list[int]): nós visitados em cada distância (ply) da raiz
+        nos_expandidos (int): nós internos cujos filhos foram gerados
+        cortes_beta (int): nós expandidos interrompidos por poda alfa-beta
+        cortes_primeiro_movimento (int): cortes que aconteceram já no primeiro filho
+        buscas_raiz (int): chamadas de busca feitas na raiz (uma por iteração)
+        avaliacoes (int): chamadas a avaliarPosicao
+        calculos_janelas (int): histogramas de janelas calculados
+        acertos_cache_janelas (int): histogramas reaproveitados da cache
+        tabela (dict): variação dos contadores da tabela de transposição nesta busca
+        iteracoes (list[dict]): profundidade, tempo, nós, coluna e pontuação de cada iteração completa
+        variacao_principal (list[int]): sequência de colunas esperada a partir da raiz
+        tempo_total (float): duração da busca, em segundos
+        perfil (str | None): relatório do perfilador, se ativado
+    """
+
+    def __init__(self):
+        """Inicializa todos os contadores zerados."""
+        self.nos_por_profundidade = []
+        self.nos_expandidos = 0
+        self.cortes_beta = 0
+        self.cortes_primeiro_movimento = 0
+        self.buscas_raiz = 0
+        self.avaliacoes = 0
+        self.calculos_janelas = 0
+        self.acertos_cache_janelas = 0
+        self.tabela = {}
+        self.iteracoes = []
+        self.variacao_principal = []
+        self.tempo_total = 0.0
+        self.perfil = None
+
+    def registrarNo(self, ply):
+        """
+        Conta um nó visitado a `ply` jogadas da raiz.
+
+        Args:
+            ply (int): distância da raiz
+        """
+        contagens = self.nos_por_profundidade
+        while len(contagens) <= ply:
+            contagens.append(0)
+        contagens[ply] += 1
+
+    def registrarCorte(self, indice_filho):
+        """
+        Conta um corte beta.
+
+        Args:
+            indice_filho (int): posição, na ordem de busca, do filho que causou o corte
+        """
+        self.cortes_beta += 1
+        if indice_filho == 0:
+            self.cortes_primeiro_movimento += 1
+
+    def registrarIteracao(self, profundidade, tempo, nos, coluna, pontuacao):
+        """
+        Registra uma iteração completa do aprofundamento iterativo.
+
+        Args:
+            profundidade (int): profundidade da iteração
+            tempo (float): duração da iteração, em segundos
+            nos (int): nós visitados na iteração
+            coluna (int): melhor coluna encontrada
+            pontuacao (float): pontuação da melhor coluna
+        """
+        self.iteracoes.append({"profundidade": profundidade, "tempo": tempo, "nos": nos,
+                               "coluna": coluna, "pontuacao": pontuacao})
+
+    @property
+    def total_nos(self):
+        """int: total de nós visitados."""
+        return sum(self.nos_por_profundidade)
+
+    def getTaxaCorteBeta(self):
+        """
+        Returns:
+            float: fração dos nós expandidos que sofreram corte beta
+        """
+        return self.cortes_beta / self.nos_expandidos if self.nos_expandidos else 0.0
+
+    def getTaxaCortePrimeiroMovimento(self):
+        """
+        Fração dos cortes obtidos no primeiro filho; mede a qualidade da ordenação.
+
+        Returns:
+            float: entre 0 e 1
+        """
+        return self.cortes_primeiro_movimento / self.cortes_beta if self.cortes_beta else 0.0
+
+    def getFatorRamificacao(self):
+        """
+        Fator de ramificação efetivo: filhos visitados por nó expandido.
+
+        Todo nó que não é raiz é filho de um nó expandido, então
+        filhos = total de nós - buscas na raiz.
+
+        Returns:
+            float: média de filhos visitados por nó expandido
+        """
+        if not self.nos_expandidos:
+            return 0.0
+        return (self.total_nos - self.buscas_raiz) / self.nos_expandidos
+
+    def paraDict(self):
+        """
+        Converte as estatísticas em um dicionário serializável (JSON).
+
+        Returns:
+            dict: contadores brutos e taxas derivadas
+        """
+        return {
+            "total_nos": self.total_nos,
+            "nos_por_profundidade": list(self.nos_por_profundidade),
+            "nos_expandidos": self.nos_expandidos,
+            "cortes_beta": self.cortes_beta,
+            "taxa_corte_beta": self.getTaxaCorteBeta(),
+            "taxa_corte_primeiro_movimento": self.getTaxaCortePrimeiroMovimento(),
+            "fator_ramificacao": self.getFatorRamificacao(),
+            "avaliacoes": self.avaliacoes,
+            "calculos_janelas": self.calculos_janelas,
+            "acertos_cache_janelas": self.acertos_cache_janelas,
+            "tabela": dict(self.tabela),
+            "iteracoes": list(self.iteracoes),
+            "variacao_principal": list(self.variacao_principal),
+            "tempo_total": self.tempo_total,
+            "perfil": self.perfil,
+        }
+
+
+class AmostradorPerfil:
+    """
+    Perfilador por amostragem: uma thread lê periodicamente a pilha da thread alvo.
+
+    Ao contrário do cProfile, o custo não depende do número de chamadas de
+    função, apenas do intervalo de amostragem.
+    """
+
+    def __init__(self, intervalo=0.001, profundidade_pilha=8):
+        """
+        Args:
+            intervalo (float): segundos entre amostras
+            profundidade_pilha (int): quadros da pilha considerados em cada amostra
+        """
+        self.intervalo = intervalo
+        self.profundidade_pilha = profundidade_pilha
+        self.amostras = 0
+        self.proprias = Counter()
+        self.acumuladas = Counter()
+        self._parar = threading.Event()
+        self._thread = None
+        self._alvo = None
+
+    def iniciar(self):
+        """Começa a amostrar a thread que chamou este método."""
+        self._alvo = threading.get_ident()
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._amostrar, daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        """Interrompe a amostragem."""
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _amostrar(self):
+        while not self._parar.wait(self.intervalo):
+            quadro = sys._current_frames().get(self._alvo)
+            if quadro is None:
+                continue
+            self.amostras += 1
+            vistas = set()
+            nivel = 0
+            while quadro is not None and nivel < self.profundidade_pilha:
+                codigo = quadro.f_code
+                funcao = f"{codigo.co_filename.rsplit('/', 1)[-1]}:{codigo.co_name}"
+                if nivel == 0:
+                    self.proprias[funcao] += 1
+                if funcao not in vistas:
+                    self.acumuladas[funcao] += 1
+                    vistas.add(funcao)
+                quadro = quadro.f_back
+                nivel += 1
+
+    def getRelatorio(self, limite=15):
+        """
+        Resume as funções mais amostradas.
+
+        Args:
+            limite (int): quantidade de funções listadas
+
+        Returns:
+            str: tabela com percentuais de tempo próprio e acumulado
+        """
+        if not self.amostras:
+            return "nenhuma amostra coletada"
+        linhas = [f"{self.amostras} amostras a cada {self.intervalo * 1000:.1f} ms",
+                  "  próprio  acumulado  função"]
+        for funcao, contagem in self.acumuladas.most_common(limite):
+            linhas.append(f"{self.proprias[funcao] / self.amostras:>8.1%} {contagem / self.amostras:>10.1%}  {funcao}")
+        return "\n".join(linhas)
@@ -0,0 +1,86 @@
+import pytest
+
+from bitboard import BitBoard
+from livro import LivroAberturas, gerarLivro, getChaveLivro
+from solver import Solver
+
+FORMATO = (4, 4, 3)
+PROFUNDIDADE = 3
+
+
+@pytest.fixture(scope="module")
+def livro(tmp_path_factory):
+    caminho = tmp_path_factory.mktemp("livro") / "livro.bin"
+    total = gerarLivro(str(caminho), PROFUNDIDADE, FORMATO[0], FORMATO[1], tamanho_tabela_mb=1,
+                       conectar=FORMATO[2])
+    assert total > 0
+    livro = LivroAberturas(str(caminho))
+    yield livro
+    livro.fechar()
+
+
+def getPosicoes():
+    """Posições sem vencedor com até PROFUNDIDADE peças, com o jogador da vez."""
+    nivel = [BitBoard(*FORMATO)]
+    for jogadas in range(PROFUNDIDADE + 1):
+        jogador = 1 if jogadas % 2 == 0 else 2
+        for tabuleiro in nivel:
+            yield tabuleiro, jogador
+        proximo = []
+        for tabuleiro in nivel:
+            for coluna in tabuleiro.getMovimentosValidos():
+                filho = tabuleiro.copia()
+                filho.addPeca(coluna, jogador)
+                if not filho.getVencedor():
+                    proximo.append(filho)
+        nivel = proximo
+
+
+def test_cabecalho(livro):
+    assert (livro.linhas, livro.colunas, livro.conectar) == FORMATO
+
+
+def test_consulta_igual_ao_solver(livro):
+    solver = Solver(FORMATO[0], FORMATO[1], tamanho_tabela_mb=1, conectar=FORMATO[2])
+    for tabuleiro, jogador in getPosicoes():
+        coluna, pontuacao = livro.consultar(tabuleiro)
+        assert pontuacao == solver.getMelhorJogada(tabuleiro, jogador)[1]
+
+        filho = tabuleiro.copia()
+        filho.addPeca(coluna, jogador)
+        if not filho.getVencedor():
+            assert -solver.getMelhorJogada(filho, 3 - jogador)[1] == pontuacao
+
+
+def test_posicao_espelhada_devolve_coluna_espelhada(livro):
+    tabuleiro = BitBoard(*FORMATO)
+    tabuleiro.addPeca(0, 1)
+    espelho = BitBoard(*FORMATO)
+    espelho.addPeca(FORMATO[1] - 1, 1)
+    assert getChaveLivro(tabuleiro)[0] == getChaveLivro(espelho)[0]
+    coluna, pontuacao = livro.consultar(tabuleiro)
+    assert livro.consultar(espelho) == (FORMATO[1] - 1 - coluna, pontuacao)
+
+
+def test_fora_do_livro_ou_de_outro_formato(livro):
+    tabuleiro = BitBoard(*FORMATO)
+    for coluna in (0, 1, 2, 3, 0):
+        tabuleiro.addPeca(coluna, 1 + tabuleiro.movimentos % 2)
+    assert livro.consultar(tabuleiro) is None
+    assert livro.consultar(BitBoard(4, 4, 4)) is None
+
+
+def test_arquivo_invalido(tmp_path):
+    caminho = tmp_path / "invalido.bin"
+    caminho.write_bytes(b"XXXX" + bytes(8))
+    with pytest.raises(ValueError):
+        LivroAberturas(str(caminho))
+
+
+def test_arquivo_truncado(livro, tmp_path):
+    with open(livro.caminho, "rb") as arquivo:
+        dados = arquivo.read()
+    caminho = tmp_path / "truncado.bin"
+    caminho.write_bytes(dados[:-1])
+    with pytest.raises(ValueError):
+        LivroAberturas(str(caminho))
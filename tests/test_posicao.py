@@ -0,0 +1,68 @@
+import pickle
+
+from bitboard import BitBoard
+from board import Board
+from posicao import Posicao
+
+JOGADAS = [3, 3, 2, 4, 4, 2, 0, 6, 6, 6]
+
+
+def jogarSequencia(tabuleiro, jogadas):
+    for i, coluna in enumerate(jogadas):
+        tabuleiro.addPeca(coluna, 1 + i % 2)
+    return tabuleiro
+
+
+def test_bytes_ida_e_volta():
+    posicao = jogarSequencia(BitBoard(), JOGADAS).toPosicao()
+    dados = posicao.toBytes()
+    assert len(dados) == 13
+    assert Posicao.fromBytes(6, 7, dados) == posicao
+
+
+def test_bytes_em_outro_formato_mantem_conectar():
+    posicao = jogarSequencia(BitBoard(5, 8, 5), [0, 7, 0, 7, 1]).toPosicao()
+    dados = posicao.toBytes()
+    assert len(dados) == (2 * 8 * 6 + 7) // 8
+    copia = Posicao.fromBytes(5, 8, dados, 5)
+    assert copia == posicao and copia.conectar == 5
+    assert Posicao.fromBytes(5, 8, dados) != posicao
+
+
+def test_tabuleiro_cheio_cabe_nos_bytes():
+    tabuleiro = BitBoard(2, 2, 3)
+    jogarSequencia(tabuleiro, [0, 0, 1, 1])
+    posicao = tabuleiro.toPosicao()
+    assert Posicao.fromBytes(2, 2, posicao.toBytes(), 3) == posicao
+
+
+def test_conversoes_preservam_conectar():
+    bitboard = jogarSequencia(BitBoard(5, 6, 3), [2, 3, 2])
+    posicao = bitboard.toPosicao()
+    assert posicao.conectar == 3
+    assert BitBoard.fromPosicao(posicao).conectar == 3
+    assert BitBoard.fromPosicao(posicao).getMascaras() == bitboard.getMascaras()
+
+    board = Board.fromPosicao(posicao)
+    assert board.conectar == 3
+    assert board.toPosicao() == posicao
+    assert (board.grid == posicao.getGrid()).all()
+
+
+def test_jogar_igual_ao_bitboard():
+    bitboard = BitBoard()
+    posicao = Posicao()
+    for i, coluna in enumerate(JOGADAS):
+        bitboard.addPeca(coluna, 1 + i % 2)
+        posicao = posicao.jogar(coluna, 1 + i % 2)
+    assert posicao == bitboard.toPosicao()
+    assert posicao.getMovimentos() == len(JOGADAS)
+    assert posicao.getAltura(6) == 3
+
+
+def test_igualdade_hash_e_pickle():
+    a = jogarSequencia(BitBoard(), JOGADAS).toPosicao()
+    b = Posicao.fromMascaras(*jogarSequencia(BitBoard(), JOGADAS).getMascaras())
+    assert a == b and hash(a) == hash(b)
+    assert len({a, b}) == 1
+    assert pickle.loads(pickle.dumps(a)) == a
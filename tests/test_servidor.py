@@ -0,0 +1,159 @@
+import asyncio
+import json
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+
+from servidor import ServidorJogos
+
+CENTRO = 3
+
+
+class ExecutorFixo(Executor):
+    """Responde toda jogada da Maquina com a mesma coluna, sem calcular nada."""
+
+    def __init__(self, coluna=0):
+        self.coluna = coluna
+
+    def submit(self, funcao, *args, **kwargs):
+        futuro = Future()
+        futuro.set_result((self.coluna, 0, 0.0, 1, 1))
+        return futuro
+
+
+class ExecutorPreso(Executor):
+    """Nunca termina as jogadas recebidas, como um processo preso em uma busca."""
+
+    def submit(self, funcao, *args, **kwargs):
+        return Future()
+
+
+class ExecutorFalho(Executor):
+    """Falha toda jogada, como um processo que morreu no meio da busca."""
+
+    def submit(self, funcao, *args, **kwargs):
+        futuro = Future()
+        futuro.set_exception(RuntimeError("processo morreu"))
+        return futuro
+
+
+class Cliente:
+    """Conexão de teste que envia uma requisição por linha e lê a resposta."""
+
+    async def conectar(self, servidor):
+        self.leitor, self.escritor = await asyncio.open_connection(*servidor.getEndereco())
+        return self
+
+    async def enviar(self, **requisicao):
+        self.escritor.write(json.dumps(requisicao).encode() + b"\n")
+        await self.escritor.drain()
+        return json.loads(await self.leitor.readline())
+
+    async def fechar(self):
+        self.escritor.close()
+        await self.escritor.wait_closed()
+
+
+def executar(executor, teste, **opcoes):
+    """Sobe um servidor com o executor injetado, roda `teste(servidor)` e o encerra."""
+    async def principal():
+        servidor = ServidorJogos(num_processos=1, executor=executor, **opcoes)
+        await servidor.iniciar("127.0.0.1", 0)
+        try:
+            return await teste(servidor)
+        finally:
+            await servidor.fechar()
+    return asyncio.run(principal())
+
+
+def test_partida_com_jogada_do_pool():
+    async def teste(servidor):
+        cliente = await Cliente().conectar(servidor)
+        nova = await cliente.enviar(cmd="novo", nivel=1)
+        resposta = await cliente.enviar(cmd="jogar", sessao=nova["sessao"], coluna=CENTRO)
+        estado = await cliente.enviar(cmd="estado", sessao=nova["sessao"])
+        await cliente.fechar()
+        return resposta, estado
+
+    with ThreadPoolExecutor(1) as executor:
+        resposta, estado = executar(executor, teste, tempo_maximo=0.05)
+    assert resposta["ok"] and not resposta["fallback"]
+    assert 0 <= resposta["coluna_ia"] < 7
+    assert estado == {"ok": True, "movimentos": f"{CENTRO + 1}{resposta['coluna_ia'] + 1}",
+                      "vencedor": 0, "vez": "humano"}
+
+
+def test_coluna_invalida():
+    async def teste(servidor):
+        cliente = await Cliente().conectar(servidor)
+        sessao = (await cliente.enviar(cmd="novo", nivel=1))["sessao"]
+        respostas = [await cliente.enviar(cmd="jogar", sessao=sessao, coluna=coluna)
+                     for coluna in (7, -1, "3", None)]
+        # o ExecutorFixo sempre responde na coluna 0: três rodadas a enchem
+        for _ in range(3):
+            await cliente.enviar(cmd="jogar", sessao=sessao, coluna=0)
+        respostas.append(await cliente.enviar(cmd="jogar", sessao=sessao, coluna=0))
+        estado = await cliente.enviar(cmd="estado", sessao=sessao)
+        await cliente.fechar()
+        return respostas, estado
+
+    respostas, estado = executar(ExecutorFixo(0), teste)
+    assert all(r == {"ok": False, "erro": "coluna inválida"} for r in respostas)
+    assert estado["movimentos"] == "111111"
+
+
+def test_servidor_ocupado():
+    async def teste(servidor):
+        servidor.limite_rigido = 0.5
+        primeiro = await Cliente().conectar(servidor)
+        segundo = await Cliente().conectar(servidor)
+        sessao = (await segundo.enviar(cmd="novo", nivel=1))["sessao"]
+
+        pendente = asyncio.create_task(primeiro.enviar(cmd="novo", nivel=1, humano_primeiro=False))
+        while servidor.metricas.fila < 1:
+            await asyncio.sleep(0.01)
+        recusas = [await segundo.enviar(cmd="novo", nivel=1, humano_primeiro=False),
+                   await segundo.enviar(cmd="jogar", sessao=sessao, coluna=CENTRO)]
+        estado = await segundo.enviar(cmd="estado", sessao=sessao)
+        await pendente
+        await primeiro.fechar()
+        await segundo.fechar()
+        return recusas, estado, servidor.metricas.recusadas
+
+    recusas, estado, recusadas = executar(ExecutorPreso(), teste, max_pendentes=1)
+    assert all(r == {"ok": False, "erro": "servidor ocupado, tente novamente"} for r in recusas)
+    assert estado["movimentos"] == ""
+    assert recusadas == 2
+
+
+def test_jogada_de_emergencia_no_limite_de_tempo():
+    async def teste(servidor):
+        servidor.limite_rigido = 0.1
+        cliente = await Cliente().conectar(servidor)
+        sessao = (await cliente.enviar(cmd="novo", nivel=1))["sessao"]
+        resposta = await cliente.enviar(cmd="jogar", sessao=sessao, coluna=0)
+        # a vaga continua presa na busca abandonada: a próxima estoura na espera
+        segunda = await cliente.enviar(cmd="jogar", sessao=sessao, coluna=0)
+        await cliente.fechar()
+        return resposta, segunda, servidor.metricas.timeouts
+
+    resposta, segunda, timeouts = executar(ExecutorPreso(), teste)
+    assert resposta["ok"] and resposta["fallback"] and resposta["coluna_ia"] == CENTRO
+    assert segunda["ok"] and segunda["fallback"] and segunda["coluna_ia"] == CENTRO
+    assert timeouts == 2
+
+
+def test_jogada_de_emergencia_quando_o_processo_falha():
+    executor = ExecutorFalho()
+
+    async def teste(servidor):
+        cliente = await Cliente().conectar(servidor)
+        nova = await cliente.enviar(cmd="novo", nivel=1, humano_primeiro=False)
+        resposta = await cliente.enviar(cmd="jogar", sessao=nova["sessao"], coluna=0)
+        await cliente.fechar()
+        return nova, resposta, servidor.metricas.falhas, servidor._executor
+
+    nova, resposta, falhas, atual = executar(executor, teste)
+    assert nova["ok"] and nova["fallback"] and nova["coluna_ia"] == CENTRO
+    assert resposta["ok"] and resposta["fallback"] and resposta["coluna_ia"] == CENTRO
+    assert falhas == 2
+    # um executor recebido de fora não é recriado
+    assert atual is executor
@@ -0,0 +1,81 @@
+from functools import lru_cache
+
+import pytest
+
+from bitboard import BitBoard
+from solver import Solver
+
+# tabuleiros pequenos o bastante para a força bruta: (linhas, colunas, conectar)
+FORMATOS = [(4, 5, 4), (4, 4, 3), (5, 4, 4)]
+
+
+def criarForcaBruta(linhas, colunas, conectar):
+    """
+    Negamax exaustivo com memória, na mesma escala de pontuação do Solver.
+
+    Returns:
+        callable: pontuacao(atual, mascara, movimentos) para quem joga
+    """
+    altura_bits = linhas + 1
+    total_casas = linhas * colunas
+    topo = [1 << (c * altura_bits + linhas - 1) for c in range(colunas)]
+    base = [1 << (c * altura_bits) for c in range(colunas)]
+    coluna_cheia = [((1 << linhas) - 1) << (c * altura_bits) for c in range(colunas)]
+
+    def venceu(pecas):
+        for direcao in (1, altura_bits, altura_bits - 1, altura_bits + 1):
+            m = pecas
+            for k in range(1, conectar):
+                m &= pecas >> (k * direcao)
+            if m:
+                return True
+        return False
+
+    @lru_cache(maxsize=None)
+    def pontuacao(atual, mascara, movimentos):
+        if movimentos == total_casas:
+            return 0
+        jogadas = [(mascara + base[c]) & coluna_cheia[c] for c in range(colunas) if not mascara & topo[c]]
+        if any(venceu(atual | jogada) for jogada in jogadas):
+            return (total_casas + 1 - movimentos) // 2
+        return max(-pontuacao(atual ^ mascara, mascara | jogada, movimentos + 1) for jogada in jogadas)
+
+    return pontuacao
+
+
+def getPosicoes(linhas, colunas, conectar, jogadas):
+    """Todas as sequências de `jogadas` colunas a partir do tabuleiro vazio, sem vencedor."""
+    posicoes = [((), BitBoard(linhas, colunas, conectar))]
+    for n in range(jogadas):
+        proximas = []
+        for sequencia, tabuleiro in posicoes:
+            for coluna in tabuleiro.getMovimentosValidos():
+                filho = tabuleiro.copia()
+                filho.addPeca(coluna, 1 if n % 2 == 0 else 2)
+                if not filho.getVencedor():
+                    proximas.append((sequencia + (coluna,), filho))
+        posicoes = proximas
+    return posicoes
+
+
+@pytest.mark.parametrize("linhas,colunas,conectar", FORMATOS)
+def test_pontuacao_e_jogada_igual_a_forca_bruta(linhas, colunas, conectar):
+    forca_bruta = criarForcaBruta(linhas, colunas, conectar)
+    solver = Solver(linhas, colunas, tamanho_tabela_mb=1, conectar=conectar)
+    for jogadas in (0, 1, 2):
+        for sequencia, tabuleiro in getPosicoes(linhas, colunas, conectar, jogadas):
+            jogador = 1 if jogadas % 2 == 0 else 2
+            atual = tabuleiro.posicoes[jogador]
+            mascara = tabuleiro.posicoes[1] | tabuleiro.posicoes[2]
+            esperado = forca_bruta(atual, mascara, jogadas)
+
+            coluna, valor = solver.getMelhorJogada(tabuleiro, jogador)
+            assert valor == esperado, sequencia
+
+            filho = tabuleiro.copia()
+            filho.addPeca(coluna, jogador)
+            if filho.getVencedor():
+                assert valor == (linhas * colunas + 1 - jogadas) // 2, sequencia
+            else:
+                resposta = filho.posicoes[3 - jogador]
+                assert -forca_bruta(resposta, mascara | filho.posicoes[jogador], jogadas + 1) == esperado, sequencia
@@ -0,0 +1,76 @@
+from transposicao import EXATO, LIMITE_INFERIOR, LIMITE_SUPERIOR, TabelaTransposicao
+
+
+def criarTabela():
+    tabela = TabelaTransposicao(0.01)
+    # chave e chave + num_entradas caem no mesmo slot
+    return tabela, 12345, 12345 + tabela.num_entradas
+
+
+def test_tamanho_fixo_e_numero_impar_de_entradas():
+    tabela = TabelaTransposicao(0.5)
+    assert tabela.num_entradas % 2 == 1
+    assert tabela.memoria_bytes <= 0.5 * 1024 * 1024
+
+
+def test_consulta_devolve_o_que_foi_gravado():
+    tabela, chave, _ = criarTabela()
+    assert tabela.consultar(chave) is None
+    tabela.gravar(chave, 5, 3.0, LIMITE_INFERIOR, 2)
+    assert tabela.consultar(chave) == (5, 3.0, LIMITE_INFERIOR, 2)
+
+
+def test_chave_diferente_no_mesmo_slot_nao_e_confundida():
+    tabela, chave, outra = criarTabela()
+    tabela.gravar(chave, 5, 3.0, EXATO, 2)
+    assert tabela.consultar(outra) is None
+
+
+def test_chave_acima_de_64_bits_e_identificada_pelo_slot():
+    tabela = TabelaTransposicao(0.01)
+    chave = (1 << 70) + 99
+    tabela.gravar(chave, 1, 0.0, EXATO, 0)
+    assert tabela.consultar(chave) is not None
+    assert tabela.consultar(chave + (1 << 64)) is None
+
+
+def test_mesma_chave_sempre_substitui():
+    tabela, chave, _ = criarTabela()
+    tabela.gravar(chave, 8, 1.0, EXATO, 1)
+    tabela.gravar(chave, 2, -1.0, LIMITE_SUPERIOR, 4)
+    assert tabela.consultar(chave) == (2, -1.0, LIMITE_SUPERIOR, 4)
+    assert tabela.substituicoes == 0 and tabela.descartes == 0
+
+
+def test_mesma_busca_prefere_profundidade():
+    tabela, chave, outra = criarTabela()
+    tabela.gravar(chave, 6, 1.0, EXATO, 1)
+
+    tabela.gravar(outra, 5, 2.0, EXATO, 3)
+    assert tabela.consultar(outra) is None
+    assert tabela.consultar(chave) == (6, 1.0, EXATO, 1)
+    assert tabela.descartes == 1
+
+    tabela.gravar(outra, 6, 2.0, EXATO, 3)
+    assert tabela.consultar(outra) == (6, 2.0, EXATO, 3)
+    assert tabela.consultar(chave) is None
+    assert tabela.substituicoes == 1
+
+
+def test_entrada_de_busca_anterior_e_substituivel():
+    tabela, chave, outra = criarTabela()
+    tabela.gravar(chave, 9, 1.0, EXATO, 1)
+    tabela.novaBusca()
+    tabela.gravar(outra, 1, 2.0, EXATO, 3)
+    assert tabela.consultar(outra) == (1, 2.0, EXATO, 3)
+    assert tabela.descartes == 0 and tabela.substituicoes == 1
+
+
+def test_limpar_esvazia_a_tabela():
+    tabela, chave, _ = criarTabela()
+    tabela.gravar(chave, 3, 0.0, EXATO, 0)
+    tabela.consultar(chave)
+    tabela.limpar()
+    assert tabela.consultar(chave) is None
+    estatisticas = tabela.getEstatisticas()
+    assert estatisticas["gravacoes"] == 0 and estatisticas["ocupacao"] == 0
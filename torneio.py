@@ -0,0 +1,356 @@
+"""
+Torneio headless Maquina x Maquina.
+
+Joga partidas entre todos os pares de níveis informados (cada nível como
+primeiro e como segundo jogador), a partir de aberturas aleatórias, em um
+pool de processos. Cada partida é gravada assim que termina (JSONL ou CSV,
+conforme a extensão do arquivo de saída) e, no fim, é exibido um relatório
+com vazão (partidas/s, jogadas/s), taxas de vitória por pareamento e a
+distribuição da latência por jogada de cada nível.
+
+Outras variantes (formato do tabuleiro e peças em linha) são escolhidas
+com --linhas, --colunas e --conectar.
+
+Uso:
+    python torneio.py --niveis 1 2 3 --partidas 20 --processos 4 --saida resultados.jsonl
+    python torneio.py --niveis 2 --linhas 7 --colunas 9 --conectar 5
+"""
+
+import argparse
+import csv
+import json
+import random
+import time
+from itertools import product
+
+from agent import AgenteIA
+from processos import getContexto
+
+CAMPOS_CSV = ["id", "nivel_1", "nivel_2", "abertura", "jogadas_abertura", "movimentos", "vencedor",
+              "jogadas", "tempo_total", "latencias", "nos"]
+
+_agentes = {}
+
+
+def getAgente(nivel, jogador, tempo_maximo, tamanho_tabela_mb, caminho_cache=None, caminho_modelo=None):
+    """
+    Retorna o agente do processo atual para um nível e lado, criando-o uma única vez.
+
+    Reaproveitar o agente evita realocar a tabela de transposição a cada
+    partida (as entradas continuam válidas, pois a chave é a posição).
+    Com `caminho_cache`, o agente também usa o cache persistente
+    compartilhado pelos processos (ver persistencia.py); com `caminho_modelo`,
+    avalia com o modelo aprendido (ver modelo.py).
+
+    Returns:
+        AgenteIA: agente configurado
+    """
+    chave = (nivel, jogador, tempo_maximo, tamanho_tabela_mb, caminho_cache, caminho_modelo)
+    agente = _agentes.get(chave)
+    if agente is None:
+        agente = _agentes[chave] = AgenteIA(nivel, tamanho_tabela_mb, jogador=jogador,
+                                            caminho_cache=caminho_cache, caminho_modelo=caminho_modelo)
+        agente.tempo_maximo = tempo_maximo
+    return agente
+
+
+def gerarAbertura(gerador, jogadas, linhas=6, colunas=7, conectar=4):
+    """
+    Sorteia uma sequência de jogadas válidas que não termina a partida.
+
+    Args:
+        gerador (random.Random): gerador de números aleatórios
+        jogadas (int): quantidade de jogadas da abertura
+        linhas (int): número de linhas do tabuleiro
+        colunas (int): número de colunas do tabuleiro
+        conectar (int): peças em linha necessárias para vencer
+
+    Returns:
+        list[int]: colunas jogadas, alternando jogador 1 e jogador 2
+    """
+    from board import Board
+    while True:
+        tabuleiro = Board(linhas, colunas, conectar)
+        abertura = []
+        for i in range(jogadas):
+            coluna = gerador.choice(tabuleiro.getMovimentosValidos())
+            tabuleiro.addPeca(coluna, 1 + i % 2)
+            abertura.append(coluna)
+            if tabuleiro.getVencedor() != 0:
+                break
+        else:
+            return abertura
+
+
+def codificarMovimentos(movimentos, colunas):
+    """
+    Converte colunas (0-based) em texto: dígitos de 1 a 9 (ex.: "4453"), ou
+    números separados por vírgula em tabuleiros com mais de 9 colunas.
+    """
+    if colunas <= 9:
+        return "".join(str(c + 1) for c in movimentos)
+    return ",".join(str(c + 1) for c in movimentos)
+
+
+def decodificarMovimentos(texto, colunas):
+    """
+    Inverso de codificarMovimentos: converte o texto em colunas (0-based).
+
+    Raises:
+        ValueError: se o texto tiver caracteres inválidos ou colunas fora do tabuleiro
+    """
+    if not texto:
+        return []
+    movimentos = [int(c) - 1 for c in (texto.split(",") if colunas > 9 else texto)]
+    if any(not 0 <= c < colunas for c in movimentos):
+        raise ValueError(f"coluna fora do tabuleiro em {texto!r}")
+    return movimentos
+
+
+def jogarPartida(tarefa):
+    """
+    Joga uma partida completa entre dois agentes.
+
+    Os agentes do processo (ver getAgente) começam a partida com novoJogo:
+    o estado de busca da partida anterior é descartado, a tabela de
+    transposição é mantida.
+
+    Args:
+        tarefa (dict): id, nivel_1, nivel_2, abertura, tempo_maximo, tamanho_tabela_mb
+            e, opcionalmente, linhas, colunas e conectar (padrão 6, 7 e 4) e
+            modelo_1, modelo_2 (modelo aprendido de cada jogador; ver modelo.py)
+
+    Returns:
+        dict: resultado da partida; movimentos no formato de codificarMovimentos
+    """
+    from board import Board
+    colunas = tarefa.get("colunas", 7)
+    tabuleiro = Board(tarefa.get("linhas", 6), colunas, tarefa.get("conectar", 4))
+    for i, coluna in enumerate(tarefa["abertura"]):
+        tabuleiro.addPeca(coluna, 1 + i % 2)
+
+    niveis = {1: tarefa["nivel_1"], 2: tarefa["nivel_2"]}
+    for lado in (1, 2):
+        getAgente(niveis[lado], lado, tarefa["tempo_maximo"], tarefa["tamanho_tabela_mb"],
+                  caminho_modelo=tarefa.get(f"modelo_{lado}")).novoJogo(limpar_tabela=False)
+    jogador = 1 + len(tarefa["abertura"]) % 2
+    movimentos, latencias, nos = [], [], []
+    inicio = time.perf_counter()
+
+    while tabuleiro.getVencedor() == 0 and not tabuleiro.isTabuleiroCompleto():
+        agente = getAgente(niveis[jogador], jogador, tarefa["tempo_maximo"], tarefa["tamanho_tabela_mb"],
+                           caminho_modelo=tarefa.get(f"modelo_{jogador}"))
+        coluna, _, tempo_gasto = agente.getMelhorJogada(tabuleiro)
+        tabuleiro.addPeca(coluna, jogador)
+        movimentos.append(coluna)
+        latencias.append(round(tempo_gasto, 6))
+        nos.append(agente.nos_avaliados)
+        jogador = 3 - jogador
+
+    return {
+        "id": tarefa["id"],
+        "nivel_1": tarefa["nivel_1"],
+        "nivel_2": tarefa["nivel_2"],
+        "abertura": codificarMovimentos(tarefa["abertura"], colunas),
+        "jogadas_abertura": len(tarefa["abertura"]),
+        "movimentos": codificarMovimentos(movimentos, colunas),
+        "vencedor": tabuleiro.getVencedor(),
+        "jogadas": len(movimentos),
+        "tempo_total": round(time.perf_counter() - inicio, 6),
+        "latencias": latencias,
+        "nos": nos,
+    }
+
+
+class EscritorResultados:
+    """
+    Grava os resultados em fluxo, uma linha por partida, em JSONL ou CSV.
+    """
+
+    def __init__(self, caminho):
+        """
+        Args:
+            caminho (str | None): arquivo de saída; CSV se terminar em .csv, JSONL caso contrário
+        """
+        self._arquivo = open(caminho, "w", newline="") if caminho else None
+        self._csv = None
+        if self._arquivo is not None and caminho.endswith(".csv"):
+            self._csv = csv.DictWriter(self._arquivo, fieldnames=CAMPOS_CSV)
+            self._csv.writeheader()
+
+    def gravar(self, resultado):
+        """
+        Grava uma partida e descarrega o buffer para o arquivo.
+
+        Args:
+            resultado (dict): retorno de jogarPartida
+        """
+        if self._arquivo is None:
+            return
+        if self._csv is not None:
+            linha = dict(resultado)
+            linha["latencias"] = ";".join(str(t) for t in resultado["latencias"])
+            linha["nos"] = ";".join(str(n) for n in resultado["nos"])
+            self._csv.writerow(linha)
+        else:
+            self._arquivo.write(json.dumps(resultado) + "\n")
+        self._arquivo.flush()
+
+    def fechar(self):
+        """Fecha o arquivo de saída."""
+        if self._arquivo is not None:
+            self._arquivo.close()
+
+
+def gerarTarefas(niveis, partidas, jogadas_abertura, tempo_maximo, tamanho_tabela_mb, semente,
+                 linhas=6, colunas=7, conectar=4):
+    """
+    Monta as partidas de todos os pareamentos (nível do jogador 1, nível do jogador 2).
+
+    Returns:
+        list[dict]: tarefas para jogarPartida
+    """
+    gerador = random.Random(semente)
+    tarefas = []
+    for nivel_1, nivel_2 in product(niveis, repeat=2):
+        for _ in range(partidas):
+            tarefas.append({
+                "id": len(tarefas),
+                "nivel_1": nivel_1,
+                "nivel_2": nivel_2,
+                "abertura": gerarAbertura(gerador, jogadas_abertura, linhas, colunas, conectar),
+                "tempo_maximo": tempo_maximo,
+                "tamanho_tabela_mb": tamanho_tabela_mb,
+                "linhas": linhas,
+                "colunas": colunas,
+                "conectar": conectar,
+            })
+    return tarefas
+
+
+def executarTorneio(niveis=(1, 2, 3), partidas=10, jogadas_abertura=2, num_processos=1, saida=None,
+                    tempo_maximo=0.5, tamanho_tabela_mb=4, semente=0, linhas=6, colunas=7, conectar=4):
+    """
+    Executa o torneio e gera o relatório.
+
+    Args:
+        niveis (tuple[int]): níveis de dificuldade participantes
+        partidas (int): partidas por pareamento ordenado
+        jogadas_abertura (int): jogadas aleatórias antes dos agentes assumirem
+        num_processos (int): processos do pool (1 joga no processo atual)
+        saida (str | None): arquivo JSONL/CSV para os resultados
+        tempo_maximo (float): tempo máximo por jogada dos agentes
+        tamanho_tabela_mb (float): tabela de transposição de cada agente
+        semente (int): semente das aberturas
+        linhas (int): número de linhas do tabuleiro
+        colunas (int): número de colunas do tabuleiro
+        conectar (int): peças em linha necessárias para vencer
+
+    Returns:
+        dict: relatório (ver gerarRelatorio)
+    """
+    tarefas = gerarTarefas(niveis, partidas, jogadas_abertura, tempo_maximo, tamanho_tabela_mb, semente,
+                           linhas, colunas, conectar)
+    escritor = EscritorResultados(saida)
+    resultados = []
+    inicio = time.perf_counter()
+    try:
+        if num_processos > 1:
+            with getContexto().Pool(num_processos) as pool:
+                for resultado in pool.imap_unordered(jogarPartida, tarefas):
+                    escritor.gravar(resultado)
+                    resultados.append(resultado)
+        else:
+            for tarefa in tarefas:
+                resultado = jogarPartida(tarefa)
+                escritor.gravar(resultado)
+                resultados.append(resultado)
+    finally:
+        escritor.fechar()
+    return gerarRelatorio(resultados, time.perf_counter() - inicio)
+
+
+def gerarRelatorio(resultados, duracao):
+    """
+    Agrega vazão, taxas de vitória e latências.
+
+    Args:
+        resultados (list[dict]): partidas jogadas
+        duracao (float): tempo total do torneio, em segundos
+
+    Returns:
+        dict: partidas, jogadas, partidas_por_segundo, jogadas_por_segundo,
+        pareamentos ("n1xn2" -> vitórias/empates e taxas) e latencias
+        (nível -> percentis p50/p90/p99/max em segundos)
+    """
+    jogadas = sum(r["jogadas"] for r in resultados)
+    pareamentos = {}
+    latencias_nivel = {}
+    for r in resultados:
+        chave = f'{r["nivel_1"]}x{r["nivel_2"]}'
+        placar = pareamentos.setdefault(chave, {"partidas": 0, "vitorias_1": 0, "vitorias_2": 0, "empates": 0})
+        placar["partidas"] += 1
+        if r["vencedor"] == 0:
+            placar["empates"] += 1
+        else:
+            placar[f'vitorias_{r["vencedor"]}'] += 1
+
+        jogador = 1 + r["jogadas_abertura"] % 2
+        for latencia in r["latencias"]:
+            latencias_nivel.setdefault(r[f"nivel_{jogador}"], []).append(latencia)
+            jogador = 3 - jogador
+
+    for placar in pareamentos.values():
+        for campo in ("vitorias_1", "vitorias_2", "empates"):
+            placar["taxa_" + campo] = placar[campo] / placar["partidas"]
+
+    import numpy as np
+    latencias = {}
+    for nivel, valores in sorted(latencias_nivel.items()):
+        p50, p90, p99 = np.percentile(valores, (50, 90, 99)).tolist()
+        latencias[nivel] = {"p50": p50, "p90": p90, "p99": p99, "max": max(valores), "jogadas": len(valores)}
+
+    return {
+        "partidas": len(resultados),
+        "jogadas": jogadas,
+        "duracao": duracao,
+        "partidas_por_segundo": len(resultados) / duracao if duracao else 0.0,
+        "jogadas_por_segundo": jogadas / duracao if duracao else 0.0,
+        "pareamentos": pareamentos,
+        "latencias": latencias,
+    }
+
+
+def imprimirRelatorio(relatorio):
+    """Exibe o relatório do torneio no terminal."""
+    print(f'Partidas: {relatorio["partidas"]}  Jogadas: {relatorio["jogadas"]}  '
+          f'Duração: {relatorio["duracao"]:.1f}s')
+    print(f'Vazão: {relatorio["partidas_por_segundo"]:.2f} partidas/s, '
+          f'{relatorio["jogadas_por_segundo"]:.1f} jogadas/s')
+    print("\nPareamento (J1xJ2)   vitórias J1   vitórias J2   empates")
+    for chave, placar in sorted(relatorio["pareamentos"].items()):
+        print(f'{chave:<20} {placar["taxa_vitorias_1"]:>11.1%} {placar["taxa_vitorias_2"]:>13.1%} '
+              f'{placar["taxa_empates"]:>9.1%}')
+    print("\nNível   p50 (s)   p90 (s)   p99 (s)   max (s)")
+    for nivel, dados in relatorio["latencias"].items():
+        print(f'{nivel:<7} {dados["p50"]:>7.3f} {dados["p90"]:>9.3f} {dados["p99"]:>9.3f} {dados["max"]:>9.3f}')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Torneio headless Maquina x Maquina.")
+    parser.add_argument("--niveis", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--partidas", type=int, default=10, help="partidas por pareamento")
+    parser.add_argument("--abertura", type=int, default=2, help="jogadas aleatórias iniciais")
+    parser.add_argument("--processos", type=int, default=1)
+    parser.add_argument("--saida", default=None, help="arquivo .jsonl ou .csv")
+    parser.add_argument("--tempo", type=float, default=0.5, help="tempo máximo por jogada")
+    parser.add_argument("--tabela-mb", type=float, default=4)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--linhas", type=int, default=6)
+    parser.add_argument("--colunas", type=int, default=7)
+    parser.add_argument("--conectar", type=int, default=4, help="peças em linha para vencer")
+    args = parser.parse_args()
+
+    imprimirRelatorio(executarTorneio(args.niveis, args.partidas, args.abertura, args.processos,
+                                      args.saida, args.tempo, args.tabela_mb, args.semente,
+                                      args.linhas, args.colunas, args.conectar))
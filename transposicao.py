@@ -0,0 +1,164 @@
+from array import array
+
+EXATO = 0
+LIMITE_INFERIOR = 1
+LIMITE_SUPERIOR = 2
+
+MASCARA_64 = (1 << 64) - 1
+
+
+class TabelaTransposicao:
+    """
+    Tabela de transposição com memória limitada para a busca Minimax.
+
+    As entradas ficam em vetores tipados pré-alocados do módulo `array` (um
+    por campo), sem depender de NumPy, e cada acesso já devolve int/float
+    Python. O consumo de memória é fixo e definido no construtor: a tabela
+    nunca cresce além de `tamanho_mb`. Cada chave é mapeada para um único slot
+    (chave % número de entradas) e só os 64 bits baixos são guardados. Como
+    o número de entradas é ímpar, o par (slot, 64 bits baixos) identifica a
+    chave sem ambiguidade até cerca de 64 + log2(entradas) bits, o que cobre
+    as chaves exatas do Solver em tabuleiros maiores que 6x7.
+
+    Política de substituição:
+        - slot vazio, mesma chave ou entrada de uma busca anterior: substitui
+        - caso contrário, substitui apenas se a nova profundidade for maior
+          ou igual à armazenada (preferência por profundidade)
+
+    Cada entrada guarda: chave, profundidade, pontuação, tipo de limite
+    (EXATO, LIMITE_INFERIOR, LIMITE_SUPERIOR), melhor coluna e a geração
+    (busca) em que foi gravada.
+    """
+
+    BYTES_POR_ENTRADA = 8 + 1 + 8 + 1 + 1 + 1
+
+    def __init__(self, tamanho_mb=16):
+        """
+        Aloca a tabela com o tamanho máximo informado.
+
+        Args:
+            tamanho_mb (float): teto de memória da tabela, em megabytes
+        """
+        entradas = max(1, int(tamanho_mb * 1024 * 1024) // self.BYTES_POR_ENTRADA)
+        self.num_entradas = entradas - 1 if entradas % 2 == 0 else entradas
+        self.chaves = array("Q", bytes(8 * self.num_entradas))
+        self.profundidades = array("b", b"\xff" * self.num_entradas)
+        self.pontuacoes = array("d", bytes(8 * self.num_entradas))
+        self.tipos = array("b", bytes(self.num_entradas))
+        self.colunas = array("b", bytes(self.num_entradas))
+        self.geracoes = array("B", bytes(self.num_entradas))
+        self.geracao = 0
+        self.zerarEstatisticas()
+
+    @property
+    def memoria_bytes(self):
+        """
+        Memória efetivamente ocupada pelos vetores da tabela.
+
+        Returns:
+            int: total de bytes alocados
+        """
+        return sum(len(vetor) * vetor.itemsize for vetor in (self.chaves, self.profundidades, self.pontuacoes,
+                                                             self.tipos, self.colunas, self.geracoes))
+
+    def consultar(self, chave):
+        """
+        Procura uma posição na tabela.
+
+        Args:
+            chave (int): hash de Zobrist da posição
+
+        Returns:
+            tuple[int, float, int, int] | None: (profundidade, pontuação, tipo, coluna),
+            ou None se a posição não estiver armazenada
+        """
+        self.consultas += 1
+        indice = chave % self.num_entradas
+        if self.profundidades[indice] < 0 or self.chaves[indice] != chave & MASCARA_64:
+            return None
+        self.acertos += 1
+        return (self.profundidades[indice], self.pontuacoes[indice], self.tipos[indice],
+                self.colunas[indice])
+
+    def gravar(self, chave, profundidade, pontuacao, tipo, coluna):
+        """
+        Armazena o resultado da busca de uma posição, respeitando a política de substituição.
+
+        Args:
+            chave (int): hash de Zobrist da posição
+            profundidade (int): profundidade restante com que a posição foi buscada
+            pontuacao (float): pontuação encontrada
+            tipo (int): EXATO, LIMITE_INFERIOR ou LIMITE_SUPERIOR
+            coluna (int): melhor coluna encontrada
+        """
+        indice = chave % self.num_entradas
+        profundidade_atual = self.profundidades[indice]
+        if profundidade_atual >= 0:
+            mesma_chave = self.chaves[indice] == chave & MASCARA_64
+            antiga = self.geracoes[indice] != self.geracao
+            if not mesma_chave and not antiga and profundidade < profundidade_atual:
+                self.descartes += 1
+                return
+            if not mesma_chave:
+                self.substituicoes += 1
+        self.gravacoes += 1
+        self.chaves[indice] = chave & MASCARA_64
+        self.profundidades[indice] = profundidade
+        self.pontuacoes[indice] = pontuacao
+        self.tipos[indice] = tipo
+        self.colunas[indice] = coluna
+        self.geracoes[indice] = self.geracao
+
+    def novaBusca(self):
+        """
+        Marca o início de uma nova busca; entradas antigas passam a ser substituíveis.
+        """
+        self.geracao = (self.geracao + 1) % 256
+
+    def limpar(self):
+        """
+        Esvazia a tabela e zera as estatísticas.
+        """
+        self.profundidades = array("b", b"\xff" * self.num_entradas)
+        self.geracao = 0
+        self.zerarEstatisticas()
+
+    def zerarEstatisticas(self):
+        """
+        Zera os contadores de uso da tabela.
+        """
+        self.consultas = 0
+        self.acertos = 0
+        self.cortes = 0
+        self.gravacoes = 0
+        self.substituicoes = 0
+        self.descartes = 0
+
+    def getTaxaAcerto(self):
+        """
+        Fração das consultas que encontraram a posição na tabela.
+
+        Returns:
+            float: taxa de acerto entre 0 e 1
+        """
+        return self.acertos / self.consultas if self.consultas else 0.0
+
+    def getEstatisticas(self):
+        """
+        Resume o uso da tabela.
+
+        Returns:
+            dict: contadores, taxa de acerto, ocupação e memória utilizada
+        """
+        return {
+            "consultas": self.consultas,
+            "acertos": self.acertos,
+            "taxa_acerto": self.getTaxaAcerto(),
+            "cortes": self.cortes,
+            "gravacoes": self.gravacoes,
+            "substituicoes": self.substituicoes,
+            "descartes": self.descartes,
+            "ocupacao": (self.num_entradas - self.profundidades.count(-1)) / self.num_entradas,
+            "num_entradas": self.num_entradas,
+            "memoria_bytes": self.memoria_bytes,
+        }
@@ -1,5 +1,26 @@
 from colors import bcolors
 
+TECLAS_COLUNAS = "asdfghjkl"
+
+
+def getLetrasColunas(colunas):
+    """
+    Retorna o rótulo de cada coluna, usado na tela e na entrada do jogador.
+
+    Até 9 colunas são usadas as teclas da linha central do teclado
+    (a, s, d, f, g, h, j, k, l); tabuleiros mais largos usam números.
+
+    Args:
+        colunas (int): número de colunas do tabuleiro
+
+    Returns:
+        list[str]: rótulos das colunas, da esquerda para a direita
+    """
+    if colunas <= len(TECLAS_COLUNAS):
+        return list(TECLAS_COLUNAS[:colunas])
+    return [str(coluna + 1) for coluna in range(colunas)]
+
+
 def showTabuleiro(tabuleiro):
     """
     Exibe o tabuleiro atual do jogo no terminal, com cores e símbolos para cada jogador.
@@ -20,9 +41,11 @@ def showTabuleiro(tabuleiro):
     print("\n" * 2)
     linhas = len(tabuleiro)
     colunas = len(tabuleiro[0])
-    print(f"{bcolors.BLUE}==========================={bcolors.ENDC}")
-    print(f"{bcolors.CYAN}[a] [s] [d] [f] [g] [h] [j]{bcolors.ENDC}")
-    print(f"{bcolors.BLUE}==========================={bcolors.ENDC}\n")
+    separador = "=" * (4 * colunas - 1)
+    cabecalho = " ".join(f"[{letra}]" for letra in getLetrasColunas(colunas))
+    print(f"{bcolors.BLUE}{separador}{bcolors.ENDC}")
+    print(f"{bcolors.CYAN}{cabecalho}{bcolors.ENDC}")
+    print(f"{bcolors.BLUE}{separador}{bcolors.ENDC}\n")
 
     for i in range(linhas):
         linha_str = ""
@@ -35,25 +58,29 @@ def showTabuleiro(tabuleiro):
                 linha_str += f"[{bcolors.YELLOW}{bcolors.BOLD}⬤{bcolors.ENDC}] "
         print(linha_str)
 
-    print(f"{bcolors.BLUE}==========================={bcolors.ENDC}")
+    print(f"{bcolors.BLUE}{separador}{bcolors.ENDC}")
 
 
-def getJogada():
+def getJogada(colunas=7):
     """
     Solicita e valida a jogada do jogador via entrada no terminal.
 
     O jogador pode digitar:
-        - Uma letra entre 'a' e 'j' (mapeada para colunas 0 a 6)
-        - Um número de 1 a 7 (convertido internamente para 0 a 6)
+        - A letra da coluna (ver getLetrasColunas; 'a' a 'j' no tabuleiro padrão)
+        - Um número de 1 a colunas (convertido internamente para 0 a colunas - 1)
+
+    Args:
+        colunas (int): número de colunas do tabuleiro (padrão: 7)
 
     Returns:
-        int: índice da coluna escolhida (entre 0 e 6)
+        int: índice da coluna escolhida (entre 0 e colunas - 1)
 
     Exemplo:
         Entrada: 'd' -> Retorna 2
         Entrada: '4' -> Retorna 3
     """
-    letras_para_numeros = {'a': 0, 's': 1, 'd': 2, 'f': 3, 'g': 4, 'h': 5, 'j': 6}
+    letras_para_numeros = {letra: coluna for coluna, letra in enumerate(getLetrasColunas(colunas))
+                           if not letra.isdigit()}
     while True:
         posicao = input("Qual posição deseja jogar? ").strip().lower()
         if posicao in letras_para_numeros:
@@ -64,7 +91,7 @@ def getJogada():
             except ValueError:
                 print("Entrada inválida...")
                 continue
-        if 0 <= posicao <= 6:
+        if 0 <= posicao < colunas:
             return posicao
         print("Posição inválida...")
 
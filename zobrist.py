@@ -0,0 +1,81 @@
+"""
+Chaves de Zobrist para o hash incremental das posições.
+
+Cada célula (coluna, altura) de cada jogador recebe um número aleatório de
+64 bits; o hash de uma posição é o XOR das chaves de todas as peças. Colocar
+ou remover uma peça é um único XOR, então Board e BitBoard mantêm o hash
+atualizado em addPeca/removePeca sem recalcular nada.
+
+As chaves espelhadas dão, com o mesmo XOR incremental, o hash da posição
+refletida da esquerda para a direita; o menor dos dois hashes é a chave
+canônica, igual para uma posição e seu espelho.
+"""
+
+import random
+
+SEMENTE_ZOBRIST = 0x5EED_C4
+
+_tabelas = {}
+
+
+def getChavesZobrist(linhas, colunas):
+    """
+    Retorna as chaves de Zobrist para um formato de tabuleiro.
+
+    As chaves são geradas uma única vez por formato, com semente fixa, e
+    compartilhadas por todos os tabuleiros desse formato (o mesmo hash em
+    todos os processos).
+
+    O índice de cada célula segue o layout do BitBoard:
+    coluna * (linhas + 1) + altura, com altura 0 na base.
+
+    Args:
+        linhas (int): número de linhas do tabuleiro
+        colunas (int): número de colunas do tabuleiro
+
+    Returns:
+        list[list[int]]: chaves[jogador][indice], com jogador em {1, 2}
+    """
+    formato = (linhas, colunas)
+    chaves = _tabelas.get(formato)
+    if chaves is None:
+        gerador = random.Random(SEMENTE_ZOBRIST ^ (linhas << 8) ^ colunas)
+        total = colunas * (linhas + 1)
+        chaves = [[0] * total] + [[gerador.getrandbits(64) for _ in range(total)] for _ in (1, 2)]
+        _tabelas[formato] = chaves
+    return chaves
+
+
+_espelhadas = {}
+
+
+def getChavesZobristEspelhadas(linhas, colunas):
+    """
+    Retorna as chaves de Zobrist da célula espelhada de cada célula.
+
+    espelhadas[jogador][indice] é a chave da célula na mesma altura da
+    coluna `colunas - 1 - coluna`, então o XOR delas sobre as peças de uma
+    posição é o hash de Zobrist do seu espelho.
+
+    Args:
+        linhas (int): número de linhas do tabuleiro
+        colunas (int): número de colunas do tabuleiro
+
+    Returns:
+        list[list[int]]: chaves[jogador][indice], com jogador em {1, 2}
+    """
+    formato = (linhas, colunas)
+    espelhadas = _espelhadas.get(formato)
+    if espelhadas is None:
+        chaves = getChavesZobrist(linhas, colunas)
+        altura_bits = linhas + 1
+        ordem = [(colunas - 1 - indice // altura_bits) * altura_bits + indice % altura_bits
+                 for indice in range(colunas * altura_bits)]
+        espelhadas = [[chaves[jogador][espelho] for espelho in ordem] for jogador in (0, 1, 2)]
+        _espelhadas[formato] = espelhadas
+    return espelhadas
+
+
+# o formato padrão (6x7) é montado na importação: processos criados por um
+# servidor de fork (ver processos.py) já recebem as chaves prontas
+getChavesZobristEspelhadas(6, 7)